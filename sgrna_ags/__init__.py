@@ -0,0 +1,58 @@
+"""Algoritmos genéticos para el diseño de arrays de sgRNA.
+
+Versión importable y vectorizada (NumPy) de los scripts de ``Pruebas AGs``.
+Los nombres públicos se importan al usarse por primera vez, de modo que
+importar el paquete (por ejemplo desde la línea de comandos) no carga NumPy.
+"""
+import importlib
+
+__version__ = "0.1.0"
+
+# Módulo donde se define cada nombre público
+_EXPORTACIONES = {
+    "AlmacenFitness": "almacen",
+    "ConfiguracionAG": "configuracion",
+    "ControladorAdaptativo": "adaptacion",
+    "CreditoOperadores": "adaptacion",
+    "EstadoGeneracion": "algoritmo",
+    "Evaluador": "evaluacion",
+    "EvaluadorCompartido": "memoria_compartida",
+    "EvaluadorIncremental": "incremental",
+    "IndiceReferencia": "lotes",
+    "LectorPoblaciones": "registro_poblaciones",
+    "Instrumentacion": "instrumentacion",
+    "ModeloSustituto": "sustituto",
+    "ObjetivoLocus": "lotes",
+    "PreseleccionSustituta": "sustituto",
+    "PuntajeEnBlanco": "en_blanco",
+    "RegistroPoblaciones": "registro_poblaciones",
+    "ReglaUnQuinto": "adaptacion",
+    "ResultadoAG": "algoritmo",
+    "ResultadoNSGA2": "multiobjetivo",
+    "Restricciones": "restricciones",
+    "SalonDeLaFama": "salon_de_la_fama",
+    "ServicioDiseno": "servicio",
+    "SrinivasPatnaik": "adaptacion",
+    "disenar_lote": "lotes",
+    "crear_servidor": "servicio",
+    "ejecutar_algoritmo_genetico": "algoritmo",
+    "ejecutar_asincrono": "asincrono",
+    "ejecutar_estado_estacionario": "estado_estacionario",
+    "ejecutar_nsga2": "multiobjetivo",
+    "iterar_algoritmo_genetico": "algoritmo",
+    "objetivo_cuadratico": "evaluacion",
+}
+
+__all__ = list(_EXPORTACIONES)
+
+
+def __getattr__(nombre):
+    if nombre not in _EXPORTACIONES:
+        raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
+    valor = getattr(importlib.import_module(f".{_EXPORTACIONES[nombre]}", __name__), nombre)
+    globals()[nombre] = valor
+    return valor
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,6 @@
+"""Permite ejecutar la línea de comandos con ``python -m sgrna_ags``."""
+import sys
+
+from .cli import main
+
+sys.exit(main())
@@ -0,0 +1,265 @@
+"""Control adaptativo de las tasas de crossover y mutación.
+
+En lugar de mantener ``probabilidad_crossover`` y ``probabilidad_mutacion``
+fijas durante toda la corrida, un controlador decide en cada generación
+las tasas (y, opcionalmente, el tipo de crossover de cada pareja) a partir
+de estadísticas de la población, y después observa cuánto mejoraron los
+hijos respecto de sus padres. Cada decisión queda en ``registro``, junto
+con la diversidad genética de la población y el éxito observado.
+
+Controladores disponibles:
+
+- ``ReglaUnQuinto``: regla del 1/5 de éxito de Rechenberg aplicada a la
+  probabilidad de mutación.
+- ``SrinivasPatnaik``: AG adaptativo de Srinivas y Patnaik, con tasas por
+  pareja y por individuo según su fitness relativo.
+- ``CreditoOperadores``: asignación de crédito entre varios tipos de
+  crossover por emparejamiento de probabilidades.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+from .evaluacion import orientar_objetivo
+from .instrumentacion import escribir_registros_csv
+from .operadores import OPERADORES_CROSSOVER
+
+
+@dataclass
+class DecisionOperadores:
+    """Tasas a usar en una generación.
+
+    Attributes:
+        crossover: Probabilidad de crossover en porcentaje (un valor o uno por pareja)
+        mutacion: Probabilidad de mutación en porcentaje (un valor o uno por hijo)
+        operadores: Índice en ``OPERADORES_CROSSOVER`` del crossover de cada
+            pareja (None para usar siempre un punto)
+    """
+
+    crossover: object
+    mutacion: object
+    operadores: np.ndarray = None
+
+
+def diversidad_genetica(poblacion):
+    """Devuelve la heterocigosis media por gen (0 si todos son iguales, 0.5 como máximo)."""
+    frecuencia = poblacion.mean(axis=1)
+    return float(np.mean(2.0 * frecuencia * (1.0 - frecuencia)))
+
+
+def mejoras_por_pareja(objetivo_padres, objetivo_hijos, minimizar=False, reales=None):
+    """Compara el mejor hijo de cada pareja con el mejor de sus padres.
+
+    Args:
+        objetivo_padres: Valor objetivo del padre de cada hijo, en el orden
+            de la selección (los hijos ``2p`` y ``2p + 1`` comparten padres)
+        objetivo_hijos: Valor objetivo de cada hijo
+        minimizar: Si es True, mejorar es disminuir el objetivo
+        reales: Máscara de los hijos con valor objetivo real; los predichos
+            por un sustituto no cuentan (None si todos son reales)
+
+    Returns:
+        Vector con la mejora (orientada) de cada pareja; negativa si empeoró
+        y NaN si ninguno de sus hijos tiene valor real
+    """
+    parejas = objetivo_hijos.shape[0] // 2
+    padres = orientar_objetivo(objetivo_padres[:2 * parejas], minimizar).reshape(parejas, 2)
+    hijos = orientar_objetivo(objetivo_hijos[:2 * parejas], minimizar).reshape(parejas, 2)
+    if reales is not None:
+        hijos = np.where(reales[:2 * parejas].reshape(parejas, 2), hijos, -np.inf)
+        sin_reales = np.isneginf(hijos).all(axis=1)
+        return np.where(sin_reales, np.nan, hijos.max(axis=1) - padres.max(axis=1))
+    return hijos.max(axis=1) - padres.max(axis=1)
+
+
+class ControladorAdaptativo:
+    """Base de los controladores: lleva el registro de decisiones.
+
+    Attributes:
+        registro: Lista con una entrada por generación con las tasas
+            decididas, la diversidad y el éxito observado
+    """
+
+    usa_operadores = False
+
+    def __init__(self):
+        self.registro = []
+
+    def decidir(self, generacion, poblacion, objetivo, seleccion, configuracion, rng):
+        """Devuelve la ``DecisionOperadores`` para producir la generación ``generacion``.
+
+        Args:
+            generacion: Número de la generación que se va a producir
+            poblacion: Matriz de cromosomas de la generación actual
+            objetivo: Valor objetivo de la generación actual
+            seleccion: Índices de los padres seleccionados
+            configuracion: ``ConfiguracionAG`` de la corrida
+            rng: Generador aleatorio de NumPy
+        """
+        raise NotImplementedError
+
+    def observar(self, objetivo_padres, objetivo_hijos, minimizar=False, reales=None):
+        """Registra el resultado de la última decisión y ajusta el estado del controlador.
+
+        Las parejas cuyos hijos sólo tienen valor predicho (``reales``) no
+        cuentan para el éxito.
+        """
+        mejoras = mejoras_por_pareja(objetivo_padres, objetivo_hijos, minimizar, reales)
+        validas = mejoras[~np.isnan(mejoras)]
+        self.registro[-1]["exito"] = float((validas > 0).mean()) if validas.size else 0.0
+        return mejoras
+
+    def exportar_csv(self, ruta):
+        """Guarda el registro de decisiones en un archivo CSV separado por ';'."""
+        escribir_registros_csv(self.registro, ruta)
+
+    def _registrar(self, generacion, poblacion, decision, **extra):
+        entrada = {
+            "generacion": generacion,
+            "diversidad": diversidad_genetica(poblacion),
+            "crossover": float(np.mean(decision.crossover)),
+            "mutacion": float(np.mean(decision.mutacion)),
+        }
+        entrada.update(extra)
+        self.registro.append(entrada)
+        return decision
+
+
+class ReglaUnQuinto(ControladorAdaptativo):
+    """Regla del 1/5 de éxito sobre la probabilidad de mutación.
+
+    Si más de ``tasa_exito`` de las parejas produce un hijo mejor que ambos
+    padres, la búsqueda progresa y la mutación se amplía (se divide por
+    ``factor``); si menos, se reduce (se multiplica por ``factor``).
+
+    Args:
+        factor: Factor de ajuste, entre 0 y 1
+        tasa_exito: Proporción de éxito de referencia
+        minimo: Probabilidad de mutación mínima, en porcentaje
+        maximo: Probabilidad de mutación máxima, en porcentaje
+    """
+
+    def __init__(self, factor=0.85, tasa_exito=0.2, minimo=0.5, maximo=50.0):
+        super().__init__()
+        self.factor = factor
+        self.tasa_exito = tasa_exito
+        self.minimo = minimo
+        self.maximo = maximo
+        self.mutacion = None
+
+    def decidir(self, generacion, poblacion, objetivo, seleccion, configuracion, rng):
+        if self.mutacion is None:
+            self.mutacion = float(configuracion.probabilidad_mutacion)
+        decision = DecisionOperadores(configuracion.probabilidad_crossover, self.mutacion)
+        return self._registrar(generacion, poblacion, decision)
+
+    def observar(self, objetivo_padres, objetivo_hijos, minimizar=False, reales=None):
+        mejoras = super().observar(objetivo_padres, objetivo_hijos, minimizar, reales)
+        exito = self.registro[-1]["exito"]
+        if exito > self.tasa_exito:
+            self.mutacion /= self.factor
+        elif exito < self.tasa_exito:
+            self.mutacion *= self.factor
+        self.mutacion = min(max(self.mutacion, self.minimo), self.maximo)
+        self.registro[-1]["mutacion_siguiente"] = self.mutacion
+        return mejoras
+
+
+class SrinivasPatnaik(ControladorAdaptativo):
+    """AG adaptativo de Srinivas y Patnaik (1994).
+
+    Las parejas y los individuos por encima del promedio reciben tasas
+    proporcionales a su distancia al mejor (``k1`` y ``k2``), de modo que
+    las buenas soluciones se preservan; los que están por debajo del
+    promedio usan las tasas fijas ``k3`` y ``k4``. Todas están en porcentaje.
+    Como el mejor individuo recibiría una mutación nula y la población
+    podría estancarse en él, ningún hijo muta con menos de ``mutacion_minima``.
+
+    Args:
+        k1: Crossover de una pareja cuyo mejor padre está en el promedio (0 si es el mejor)
+        k2: Mutación del hijo de un padre que está en el promedio (0 si es el mejor)
+        k3: Crossover de las parejas por debajo del promedio
+        k4: Mutación de los individuos por debajo del promedio
+        mutacion_minima: Probabilidad de mutación mínima de cada hijo, en porcentaje
+    """
+
+    def __init__(self, k1=100.0, k2=50.0, k3=100.0, k4=50.0, mutacion_minima=0.5):
+        super().__init__()
+        self.k1, self.k2, self.k3, self.k4 = k1, k2, k3, k4
+        self.mutacion_minima = mutacion_minima
+
+    def decidir(self, generacion, poblacion, objetivo, seleccion, configuracion, rng):
+        valores = orientar_objetivo(objetivo, configuracion.minimizar)
+        maximo = valores.max()
+        promedio = valores.mean()
+        parejas = seleccion.shape[0] // 2
+        mejor_padre = valores[seleccion[:2 * parejas]].reshape(parejas, 2).max(axis=1)
+        padre_de_cada_hijo = valores[seleccion]
+        if maximo > promedio:
+            escala = maximo - promedio
+            crossover = np.where(mejor_padre >= promedio, self.k1 * (maximo - mejor_padre) / escala, self.k3)
+            mutacion = np.where(padre_de_cada_hijo >= promedio,
+                                self.k2 * (maximo - padre_de_cada_hijo) / escala, self.k4)
+        else:
+            # Población sin diferencias de fitness: tasas máximas para recuperar diversidad
+            crossover = np.full(parejas, float(self.k3))
+            mutacion = np.full(seleccion.shape[0], float(self.k4))
+        decision = DecisionOperadores(crossover, np.maximum(mutacion, self.mutacion_minima))
+        return self._registrar(generacion, poblacion, decision, maximo=float(maximo), promedio=float(promedio))
+
+
+class CreditoOperadores(ControladorAdaptativo):
+    """Asigna crédito a varios tipos de crossover según la mejora que producen.
+
+    Cada pareja usa un crossover sorteado con las probabilidades actuales.
+    La calidad de cada operador es un promedio exponencial de la mejora
+    normalizada de sus parejas, y las probabilidades se emparejan con las
+    calidades respetando un mínimo por operador.
+
+    Args:
+        operadores: Nombres (de ``OPERADORES_CROSSOVER``) de los crossover a combinar
+        probabilidad_minima: Probabilidad mínima de cada operador
+        adaptacion: Peso de la última generación en la calidad de cada operador
+    """
+
+    usa_operadores = True
+
+    def __init__(self, operadores=OPERADORES_CROSSOVER, probabilidad_minima=0.1, adaptacion=0.3):
+        super().__init__()
+        desconocidos = set(operadores) - set(OPERADORES_CROSSOVER)
+        if desconocidos:
+            raise ValueError(f"Operadores de crossover desconocidos: {', '.join(sorted(desconocidos))}")
+        if probabilidad_minima * len(operadores) > 1:
+            raise ValueError("La suma de las probabilidades mínimas no puede superar 1")
+        self.operadores = tuple(operadores)
+        self.indices = np.array([OPERADORES_CROSSOVER.index(nombre) for nombre in self.operadores])
+        self.probabilidad_minima = probabilidad_minima
+        self.adaptacion = adaptacion
+        self.probabilidades = np.full(len(self.operadores), 1.0 / len(self.operadores))
+        self.calidades = np.zeros(len(self.operadores))
+        self._elegidos = None
+
+    def decidir(self, generacion, poblacion, objetivo, seleccion, configuracion, rng):
+        self._elegidos = rng.choice(len(self.operadores), size=seleccion.shape[0] // 2, p=self.probabilidades)
+        decision = DecisionOperadores(configuracion.probabilidad_crossover, configuracion.probabilidad_mutacion,
+                                      self.indices[self._elegidos])
+        probabilidades = {f"p_{nombre}": float(valor) for nombre, valor in zip(self.operadores, self.probabilidades)}
+        return self._registrar(generacion, poblacion, decision, **probabilidades)
+
+    def observar(self, objetivo_padres, objetivo_hijos, minimizar=False, reales=None):
+        mejoras = super().observar(objetivo_padres, objetivo_hijos, minimizar, reales)
+        validas = ~np.isnan(mejoras)
+        recompensas = np.maximum(np.where(validas, mejoras, 0.0), 0.0)
+        if recompensas.max(initial=0.0) > 0:
+            recompensas = recompensas / recompensas.max()
+        for operador, nombre in enumerate(self.operadores):
+            usadas = (self._elegidos == operador) & validas
+            if usadas.any():
+                recompensa = float(recompensas[usadas].mean())
+                self.calidades[operador] += self.adaptacion * (recompensa - self.calidades[operador])
+                self.registro[-1][f"recompensa_{nombre}"] = recompensa
+        total = self.calidades.sum()
+        libre = 1.0 - self.probabilidad_minima * len(self.operadores)
+        if total > 0:
+            self.probabilidades = self.probabilidad_minima + libre * self.calidades / total
+        return mejoras
@@ -0,0 +1,464 @@
+"""Ciclo generacional del algoritmo genético.
+
+Reúne en una sola implementación las cuatro variantes de ``Pruebas AGs``
+(torneo o ruleta, con o sin élite), seleccionables desde ``ConfiguracionAG``.
+"""
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from .adaptacion import DecisionOperadores
+from .bitsets import compartir_fitness, hacinamiento_determinista, marcar_duplicados
+from .configuracion import ConfiguracionAG
+from .evaluacion import (
+    Estadisticas,
+    Evaluador,
+    calcular_estadisticas,
+    indice_mejor,
+    objetivo_cuadratico,
+    orientar_objetivo,
+    transformar_fitness,
+)
+from .instrumentacion import InstrumentacionNula
+from .operadores import (
+    aplicar_crossover,
+    aplicar_mutacion,
+    cromosoma_a_texto,
+    generar_poblacion_inicial,
+    seleccion_por_ruleta,
+    seleccion_por_torneo,
+    seleccionar_elite,
+)
+from .restricciones import generar_poblacion_valida
+
+
+@dataclass
+class ResultadoAG:
+    """Resultado de una corrida del algoritmo genético.
+
+    Attributes:
+        poblacion: Matriz de cromosomas de la última generación
+        objetivo: Valores objetivo de la última generación
+        fitness: Fitness de la última generación según ``escalado_fitness``
+        mejor_cromosoma: Cromosoma con mejor valor objetivo de la última generación
+        historial: Lista con el cromosoma y las estadísticas de cada generación
+        evaluaciones: Cantidad de evaluaciones reales de la función objetivo
+    """
+
+    poblacion: np.ndarray
+    objetivo: np.ndarray
+    fitness: np.ndarray
+    mejor_cromosoma: str
+    historial: list = field(default_factory=list)
+    evaluaciones: int = 0
+
+
+@dataclass
+class EstadoGeneracion:
+    """Instantánea de una generación entregada por ``iterar_algoritmo_genetico``.
+
+    Attributes:
+        generacion: Número de generación (0 para la población inicial)
+        estadisticas: ``Estadisticas`` del valor objetivo de la generación
+        mejor_cromosoma: Cromosoma con mejor valor objetivo
+        mejor_objetivo: Valor objetivo de ese cromosoma
+        evaluaciones: Evaluaciones reales acumuladas hasta esta generación
+        poblacion: Vista de sólo lectura de la población (None si no se
+            pidió); se sobrescribe al producir las generaciones siguientes,
+            por lo que hay que copiarla si se quiere conservar
+        objetivo: Vista de sólo lectura del valor objetivo de cada individuo
+            (None si no se pidió)
+        predichos: Máscara de los individuos cuyo objetivo es una predicción
+            del sustituto (None si no se pidió o no hay sustituto)
+    """
+
+    generacion: int
+    estadisticas: Estadisticas
+    mejor_cromosoma: str
+    mejor_objetivo: float
+    evaluaciones: int
+    poblacion: np.ndarray = None
+    objetivo: np.ndarray = None
+    predichos: np.ndarray = None
+
+
+def seleccionar_padres(configuracion, objetivo, cantidad, rng, poblacion=None):
+    """Aplica el operador de selección configurado.
+
+    El fitness se calcula sólo si el operador lo necesita: el torneo compara
+    directamente el objetivo orientado, ya que cualquier escalado monótono
+    elige al mismo ganador, salvo que se use fitness compartido. El fitness
+    compartido y la eliminación de duplicados sólo se aplican si se pasa la
+    población; al eliminar duplicados se selecciona sólo entre la primera
+    copia de cada cromosoma, de modo que ningún torneo puede quedar formado
+    únicamente por repetidos.
+    """
+    ruleta = configuracion.seleccion == "ruleta"
+    compartir = configuracion.nichos == "compartido" and poblacion is not None
+    if ruleta or compartir:
+        valores = transformar_fitness(objetivo, configuracion.escalado_fitness, configuracion.minimizar)
+        if compartir:
+            valores = compartir_fitness(valores, poblacion, configuracion.radio_nicho, configuracion.alfa_nicho)
+    else:
+        valores = orientar_objetivo(objetivo, configuracion.minimizar)
+    if configuracion.eliminar_duplicados and poblacion is not None:
+        unicos = np.flatnonzero(~marcar_duplicados(poblacion))
+        if unicos.shape[0] < valores.shape[0]:
+            return unicos[_seleccionar(configuracion, valores[unicos], cantidad, rng)]
+    return _seleccionar(configuracion, valores, cantidad, rng)
+
+
+def _seleccionar(configuracion, valores, cantidad, rng):
+    if configuracion.seleccion == "ruleta":
+        return seleccion_por_ruleta(valores, cantidad, rng)
+    return seleccion_por_torneo(valores, cantidad, rng, configuracion.tamano_torneo)
+
+
+def guardar_datos(ruta, cromosoma, estadisticas, num_poblacion):
+    """Guarda los datos de la generación actual en un archivo CSV.
+
+    Escribe el encabezado al registrar la población inicial, con el mismo
+    formato que ``GuardarDatos``.
+    """
+    with open(ruta, "a", encoding="utf-8") as archivo:
+        if num_poblacion == 0:
+            archivo.write("Cromosoma;Maximo;Minimo;Promedio\n")
+        archivo.write(f'"{cromosoma}";{estadisticas.maximo};{estadisticas.minimo};{estadisticas.promedio}\n')
+
+
+def ejecutar_algoritmo_genetico(configuracion=None, funcion_objetivo=objetivo_cuadratico,
+                                instrumentacion=None, archivo_csv=None, mostrar=False, restricciones=None,
+                                sustituto=None, incremental=None, salon_de_la_fama=None, adaptacion=None,
+                                almacen=None, compartido=None, registro=None, evaluador=None):
+    """Ejecuta el algoritmo genético completo.
+
+    Recorre ``iterar_algoritmo_genetico`` hasta el final y acumula el
+    historial de estadísticas de todas las generaciones.
+
+    Args:
+        configuracion: Parámetros de la corrida (por defecto ``ConfiguracionAG()``)
+        funcion_objetivo: Función vectorizada a maximizar (o a minimizar si
+            ``configuracion.minimizar``)
+        instrumentacion: ``Instrumentacion`` donde registrar tiempos y
+            contadores por fase; si es None no se mide nada
+        archivo_csv: Ruta del CSV donde guardar los datos de cada generación
+        mostrar: Si es True, muestra en pantalla el resumen de cada generación
+        restricciones: ``Restricciones`` que deben cumplir los hijos antes de evaluarse
+        sustituto: ``PreseleccionSustituta`` que decide qué hijos se evalúan
+        incremental: ``EvaluadorIncremental`` para objetivos descomponibles por segmentos
+        salon_de_la_fama: ``SalonDeLaFama`` donde archivar los mejores cromosomas de la corrida
+        adaptacion: ``ControladorAdaptativo`` que decide las tasas de cada generación
+        almacen: ``AlmacenFitness`` persistente con los valores de corridas anteriores
+        compartido: ``EvaluadorCompartido`` que evalúa en procesos sobre
+            buffers de memoria compartida
+        registro: ``RegistroPoblaciones`` donde guardar la población y el
+            objetivo de una de cada ``registro.cada`` generaciones (y de la última)
+        evaluador: ``Evaluador`` ya creado a usar en lugar de ``funcion_objetivo``
+
+    Returns:
+        ``ResultadoAG`` con la última generación y el historial de estadísticas
+    """
+    configuracion = configuracion or ConfiguracionAG()
+    historial = []
+    for estado in iterar_algoritmo_genetico(configuracion, funcion_objetivo, instrumentacion, restricciones,
+                                            sustituto, incremental, salon_de_la_fama, adaptacion,
+                                            incluir_poblacion=True, almacen=almacen, compartido=compartido,
+                                            evaluador=evaluador):
+        _registrar_estado(historial, estado.mejor_cromosoma, estado.estadisticas, estado.generacion,
+                          archivo_csv, mostrar)
+        if registro is not None:
+            registro.registrar(estado.generacion, estado.poblacion, estado.objetivo,
+                               forzar=estado.generacion == configuracion.numero_ciclos)
+
+    poblacion = np.array(estado.poblacion)
+    objetivo = np.array(estado.objetivo)
+    fitness = transformar_fitness(objetivo, configuracion.escalado_fitness, configuracion.minimizar)
+    return ResultadoAG(poblacion, objetivo, fitness, estado.mejor_cromosoma, historial, estado.evaluaciones)
+
+
+def iterar_algoritmo_genetico(configuracion=None, funcion_objetivo=objetivo_cuadratico, instrumentacion=None,
+                              restricciones=None, sustituto=None, incremental=None, salon_de_la_fama=None,
+                              adaptacion=None, incluir_poblacion=False, almacen=None, compartido=None,
+                              evaluador=None):
+    """Ejecuta el algoritmo genético entregando cada generación a medida que se produce.
+
+    Los individuos de élite conservan su valor objetivo sin reevaluarse. Si
+    se indican restricciones, la población inicial se genera válida y los
+    hijos que no las cumplen no se evalúan: se reemplazan por una copia de
+    su padre (válido), con el valor objetivo ya conocido.
+    Con un sustituto, sólo los hijos que éste preselecciona se evalúan de
+    verdad y el resto conserva el valor predicho; los individuos con valor
+    predicho que quedarían entre los mejores (la élite, o el mejor si no hay
+    élite) se evalúan de verdad antes de seguir, y las estadísticas, el
+    mejor cromosoma y el salón de la fama usan sólo valores reales. Con un evaluador
+    incremental, cada hijo hereda los puntajes por segmento de sus padres y
+    sólo se recalculan los segmentos que tocaron el crossover o la mutación
+    (en ese caso no se usan ``funcion_objetivo`` ni la caché). Con
+    ``nichos="hacinamiento"``, cada hijo compite con su padre más parecido
+    y sólo lo reemplaza si no es peor. Con un evaluador compartido,
+    ``poblacion`` y ``pob_siguiente`` son sus buffers de memoria compartida
+    y los procesos evalúan los hijos sin recibir copias (la caché y el
+    almacén son entonces los del evaluador compartido).
+
+    El generador no guarda el historial: quien lo recorre decide qué
+    conservar, y puede detener la corrida en cualquier momento saliendo del
+    ciclo. El tiempo que pasa fuera del generador entre una generación y la
+    siguiente se mide como la fase de salida::
+
+        for estado in iterar_algoritmo_genetico(configuracion):
+            if estado.estadisticas.maximo >= umbral:
+                break
+
+    Args:
+        configuracion: Parámetros de la corrida (por defecto ``ConfiguracionAG()``)
+        funcion_objetivo: Función vectorizada a maximizar (o a minimizar si
+            ``configuracion.minimizar``)
+        instrumentacion: ``Instrumentacion`` donde registrar tiempos y contadores por fase
+        restricciones: ``Restricciones`` que deben cumplir los hijos antes de evaluarse
+        sustituto: ``PreseleccionSustituta`` que decide qué hijos se evalúan
+        incremental: ``EvaluadorIncremental`` para objetivos descomponibles por segmentos
+        salon_de_la_fama: ``SalonDeLaFama`` que se actualiza con cada generación evaluada
+        adaptacion: ``ControladorAdaptativo`` que decide las tasas de crossover
+            y mutación de cada generación y observa la mejora de los hijos
+        incluir_poblacion: Si es True, cada estado incluye vistas de sólo
+            lectura (sin copiar) de la población y su objetivo
+        almacen: ``AlmacenFitness`` persistente con los valores de corridas anteriores
+        compartido: ``EvaluadorCompartido`` en cuyos buffers se alojan
+            ``poblacion`` y ``pob_siguiente``; reemplaza al evaluador de la corrida
+        evaluador: ``Evaluador`` ya creado (por ejemplo, con la caché de
+            corridas anteriores) a usar en lugar de ``funcion_objetivo``,
+            ``usar_cache`` y ``almacen``; las evaluaciones informadas son sólo
+            las de esta corrida
+
+    Yields:
+        ``EstadoGeneracion`` de la población inicial y de cada generación
+    """
+    configuracion = configuracion or ConfiguracionAG()
+    if sustituto is not None and incremental is not None:
+        raise ValueError("El sustituto y la evaluación incremental no pueden combinarse")
+    hacinamiento = configuracion.nichos == "hacinamiento"
+    if hacinamiento and incremental is not None:
+        raise ValueError("El hacinamiento determinista y la evaluación incremental no pueden combinarse")
+    if incremental is not None and adaptacion is not None and adaptacion.usa_operadores:
+        raise ValueError("La evaluación incremental sólo admite crossover de un punto")
+    if incremental is not None and compartido is not None:
+        raise ValueError("La evaluación incremental y el evaluador compartido no pueden combinarse")
+    if evaluador is not None and compartido is not None:
+        raise ValueError("Indique un evaluador o un evaluador compartido, no ambos")
+    instrumentacion = instrumentacion or InstrumentacionNula()
+    if incremental is not None and incremental.instrumentacion is None:
+        incremental.instrumentacion = instrumentacion
+    rng = np.random.default_rng(configuracion.semilla)
+    if compartido is not None:
+        evaluador = compartido
+        if compartido.instrumentacion is None:
+            compartido.instrumentacion = instrumentacion
+    elif evaluador is None:
+        evaluador = Evaluador(funcion_objetivo, configuracion.usar_cache, instrumentacion, almacen)
+    contador = evaluador if incremental is None else incremental
+    # Un evaluador recibido puede venir con evaluaciones de corridas anteriores
+    evaluaciones_previas = contador.evaluaciones
+    tamano = configuracion.tamano_poblacion
+    elite = configuracion.elite
+
+    # Generar y evaluar la población inicial
+    instrumentacion.iniciar_generacion(0)
+    poblacion = generar_poblacion_inicial(tamano, configuracion.longitud_cromosoma, rng)
+    if restricciones is not None:
+        generar_poblacion_valida(restricciones, poblacion, rng)
+    if compartido is not None:
+        poblacion, pob_siguiente = compartido.alojar(poblacion)
+    else:
+        pob_siguiente = np.empty_like(poblacion)
+    with instrumentacion.fase("evaluacion"):
+        objetivo = evaluador.evaluar(poblacion) if incremental is None else incremental.evaluar(poblacion)
+        estadisticas = calcular_estadisticas(objetivo)
+        if sustituto is not None:
+            sustituto.registrar(poblacion, objetivo)
+        if salon_de_la_fama is not None:
+            salon_de_la_fama.actualizar(poblacion, objetivo)
+    # Individuos cuyo objetivo es una predicción del sustituto
+    predicho = np.zeros(tamano, dtype=bool) if sustituto is not None else None
+    yield from _entregar(_crear_estado(0, poblacion, objetivo, estadisticas,
+                                       contador.evaluaciones - evaluaciones_previas,
+                                       configuracion.minimizar, incluir_poblacion, predicho), instrumentacion)
+
+    # Ciclo principal del algoritmo genético
+    for generacion in range(1, configuracion.numero_ciclos + 1):
+        instrumentacion.iniciar_generacion(generacion)
+        with instrumentacion.fase("seleccion"):
+            if elite:
+                mejores = seleccionar_elite(orientar_objetivo(objetivo, configuracion.minimizar), elite)
+                pob_siguiente[:, :elite] = poblacion[:, mejores]
+            seleccion = seleccionar_padres(configuracion, objetivo, tamano - elite, rng, poblacion)
+            if adaptacion is not None:
+                decision = adaptacion.decidir(generacion, poblacion, objetivo, seleccion, configuracion, rng)
+            else:
+                decision = DecisionOperadores(configuracion.probabilidad_crossover,
+                                              configuracion.probabilidad_mutacion)
+        with instrumentacion.fase("crossover"):
+            puntos = aplicar_crossover(poblacion, pob_siguiente, seleccion, decision.crossover, rng,
+                                       inicio=elite, operadores=decision.operadores)
+        with instrumentacion.fase("mutacion"):
+            mutados = aplicar_mutacion(pob_siguiente, decision.mutacion, rng, inicio=elite)
+        if incremental is not None:
+            incremental.preparar(seleccion, puntos, mutados, mejores if elite else ())
+        objetivo_siguiente = np.empty_like(objetivo)
+        a_evaluar = np.ones(tamano, dtype=bool)
+        predicho_siguiente = np.zeros(tamano, dtype=bool) if predicho is not None else None
+        if elite:
+            objetivo_siguiente[:elite] = objetivo[mejores]
+            a_evaluar[:elite] = False
+            if predicho is not None:
+                predicho_siguiente[:elite] = predicho[mejores]
+        if restricciones is not None:
+            with instrumentacion.fase("filtro"):
+                reparados = incremental is not None and restricciones.reparar
+                if reparados:
+                    hijos = pob_siguiente[:, elite:].copy()
+                rechazados = np.flatnonzero(~restricciones.filtrar(pob_siguiente[:, elite:], instrumentacion))
+                if reparados:
+                    incremental.marcar_cambios(hijos, pob_siguiente[:, elite:], elite)
+                # El hijo j de la selección proviene (en su primera parte) del padre seleccion[j]
+                pob_siguiente[:, rechazados + elite] = poblacion[:, seleccion[rechazados]]
+                objetivo_siguiente[rechazados + elite] = objetivo[seleccion[rechazados]]
+                a_evaluar[rechazados + elite] = False
+                if predicho is not None:
+                    predicho_siguiente[rechazados + elite] = predicho[seleccion[rechazados]]
+                if incremental is not None:
+                    incremental.restaurar(rechazados + elite, seleccion[rechazados])
+        poblacion, pob_siguiente = pob_siguiente, poblacion
+
+        with instrumentacion.fase("evaluacion"):
+            objetivo_anterior, objetivo = objetivo, objetivo_siguiente
+            predicho_anterior, predicho = predicho, predicho_siguiente
+            if incremental is not None:
+                objetivo = incremental.completar(poblacion)
+            elif sustituto is not None:
+                _evaluar_con_sustituto(sustituto, evaluador, poblacion, objetivo, predicho, a_evaluar, rng,
+                                       configuracion.minimizar, instrumentacion)
+            elif a_evaluar.all():
+                objetivo[:] = evaluador.evaluar(poblacion)
+            elif a_evaluar[elite:].all():
+                # Sólo la élite conserva su valor: se evalúa una vista, sin copiar los hijos
+                objetivo[elite:] = evaluador.evaluar(poblacion[:, elite:])
+            elif a_evaluar.any():
+                objetivo[a_evaluar] = evaluador.evaluar(poblacion[:, a_evaluar])
+            if adaptacion is not None:
+                # Los hijos con valor predicho por el sustituto no cuentan como éxito ni fracaso
+                reales = None if predicho is None else ~predicho[elite:]
+                adaptacion.observar(objetivo_anterior[seleccion], objetivo[elite:], configuracion.minimizar, reales)
+        if hacinamiento:
+            with instrumentacion.fase("reemplazo"):
+                # pob_siguiente conserva la generación anterior tras el intercambio
+                perdedores, rivales = hacinamiento_determinista(
+                    pob_siguiente[:, seleccion], poblacion[:, elite:], objetivo_anterior[seleccion],
+                    objetivo[elite:], configuracion.minimizar)
+                poblacion[:, perdedores + elite] = pob_siguiente[:, seleccion[rivales]]
+                objetivo[perdedores + elite] = objetivo_anterior[seleccion[rivales]]
+                if predicho is not None:
+                    predicho[perdedores + elite] = predicho_anterior[seleccion[rivales]]
+        with instrumentacion.fase("evaluacion"):
+            if predicho is None:
+                estadisticas = calcular_estadisticas(objetivo)
+                if salon_de_la_fama is not None:
+                    salon_de_la_fama.actualizar(poblacion, objetivo)
+            else:
+                _confirmar_mejores(sustituto, evaluador, poblacion, objetivo, predicho, max(elite, 1),
+                                   configuracion.minimizar, instrumentacion)
+                reales = ~predicho
+                estadisticas = calcular_estadisticas(objetivo[reales])
+                if salon_de_la_fama is not None:
+                    salon_de_la_fama.actualizar(poblacion[:, reales], objetivo[reales])
+        yield from _entregar(_crear_estado(generacion, poblacion, objetivo, estadisticas,
+                                           contador.evaluaciones - evaluaciones_previas,
+                                           configuracion.minimizar, incluir_poblacion, predicho), instrumentacion)
+
+
+def _entregar(estado, instrumentacion):
+    """Entrega el estado midiendo la fase de salida.
+
+    El registro de la generación se cierra aunque quien recorre el
+    generador salga del ciclo (al cerrarse el generador).
+    """
+    try:
+        with instrumentacion.fase("salida"):
+            yield estado
+    finally:
+        instrumentacion.finalizar_generacion()
+
+
+def _crear_estado(generacion, poblacion, objetivo, estadisticas, evaluaciones, minimizar, incluir_poblacion,
+                  predicho=None):
+    """Arma la instantánea de una generación para ``iterar_algoritmo_genetico``."""
+    mejor = indice_mejor(objetivo, minimizar)
+    vista_poblacion = vista_objetivo = vista_predicho = None
+    if incluir_poblacion:
+        vista_poblacion = poblacion.view()
+        vista_poblacion.flags.writeable = False
+        vista_objetivo = objetivo.view()
+        vista_objetivo.flags.writeable = False
+        if predicho is not None:
+            vista_predicho = predicho.view()
+            vista_predicho.flags.writeable = False
+    return EstadoGeneracion(generacion, estadisticas, cromosoma_a_texto(poblacion, mejor), float(objetivo[mejor]),
+                            evaluaciones, vista_poblacion, vista_objetivo, vista_predicho)
+
+
+def _evaluar_con_sustituto(sustituto, evaluador, poblacion, objetivo, predicho, a_evaluar, rng, minimizar,
+                           instrumentacion):
+    """Evalúa de verdad los hijos preseleccionados y asigna (y marca en ``predicho``) el valor predicho al resto."""
+    hijos = np.flatnonzero(a_evaluar)
+    if not hijos.size:
+        return
+    elegidos, predichos = sustituto.elegir(poblacion[:, hijos], rng, minimizar)
+    if predichos is not None:
+        objetivo[hijos[~elegidos]] = predichos[~elegidos]
+        predicho[hijos[~elegidos]] = True
+        predichos = predichos[elegidos]
+    evaluados = poblacion[:, hijos[elegidos]]
+    objetivo[hijos[elegidos]] = evaluador.evaluar(evaluados)
+    sustituto.registrar(evaluados, objetivo[hijos[elegidos]], predichos,
+                        int(hijos.size - elegidos.sum()), instrumentacion)
+
+
+def _confirmar_mejores(sustituto, evaluador, poblacion, objetivo, predicho, cantidad, minimizar, instrumentacion):
+    """Evalúa de verdad los individuos con valor predicho que quedarían entre los ``cantidad`` mejores.
+
+    Se repite hasta que los ``cantidad`` mejores tienen valor real, de modo
+    que una predicción optimista nunca llega a la élite ni se informa como
+    el mejor valor de la generación.
+    """
+    while True:
+        mejores = seleccionar_elite(orientar_objetivo(objetivo, minimizar), cantidad)
+        dudosos = mejores[predicho[mejores]]
+        if not dudosos.size:
+            return
+        predichos = objetivo[dudosos]
+        objetivo[dudosos] = evaluador.evaluar(poblacion[:, dudosos])
+        predicho[dudosos] = False
+        sustituto.confirmar(poblacion[:, dudosos], objetivo[dudosos], predichos, instrumentacion)
+
+
+def _registrar_generacion(historial, poblacion, objetivo, estadisticas, num_poblacion, archivo_csv, mostrar,
+                          minimizar=False):
+    """Agrega la generación al historial y, si corresponde, la muestra y la guarda."""
+    cromosoma = cromosoma_a_texto(poblacion, indice_mejor(objetivo, minimizar))
+    _registrar_estado(historial, cromosoma, estadisticas, num_poblacion, archivo_csv, mostrar)
+
+
+def _registrar_estado(historial, cromosoma, estadisticas, num_poblacion, archivo_csv, mostrar):
+    """Agrega al historial el mejor cromosoma y las estadísticas de una generación."""
+    historial.append({
+        "generacion": num_poblacion,
+        "cromosoma": cromosoma,
+        "maximo": estadisticas.maximo,
+        "minimo": estadisticas.minimo,
+        "promedio": estadisticas.promedio,
+    })
+    if mostrar:
+        titulo = f"Población {num_poblacion}" if num_poblacion != 0 else "Población Inicial"
+        print(f"{titulo:<18} {cromosoma} {estadisticas.maximo:10.4f} "
+              f"{estadisticas.minimo:10.4f} {estadisticas.promedio:10.4f}")
+    if archivo_csv is not None:
+        guardar_datos(archivo_csv, cromosoma, estadisticas, num_poblacion)
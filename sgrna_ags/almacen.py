@@ -0,0 +1,166 @@
+"""Almacén persistente de valores objetivo entre corridas.
+
+La caché de ``Evaluador`` se pierde al terminar cada corrida, por lo que
+un barrido de parámetros con cientos de réplicas contra los mismos loci
+vuelve a evaluar los mismos cromosomas una y otra vez. ``AlmacenFitness``
+guarda los valores en un archivo SQLite indexado por (versión del
+objetivo, longitud, cromosoma empaquetado):
+
+- las consultas y las inserciones se hacen por lotes, una vez por
+  generación;
+- el archivo usa el modo WAL y cada escritura es una transacción
+  ``IMMEDIATE``, por lo que varios hilos o procesos pueden compartirlo;
+- con ``max_entradas`` se descartan primero los cromosomas usados hace más
+  tiempo. Un disparador mantiene la cantidad de entradas sin recorrer la
+  tabla.
+
+La versión del objetivo es una cadena elegida por el usuario; hay que
+cambiarla cada vez que cambia la función objetivo o sus parámetros.
+"""
+import json
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+# Parámetros por consulta; SQLite admite al menos 999
+CLAVES_POR_CONSULTA = 500
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS fitness (
+    version TEXT NOT NULL,
+    longitud INTEGER NOT NULL,
+    clave BLOB NOT NULL,
+    valor TEXT NOT NULL,
+    usado REAL NOT NULL,
+    PRIMARY KEY (version, longitud, clave)
+);
+CREATE INDEX IF NOT EXISTS fitness_usado ON fitness (usado);
+CREATE TABLE IF NOT EXISTS resumen (entradas INTEGER NOT NULL);
+INSERT INTO resumen SELECT COUNT(*) FROM fitness WHERE NOT EXISTS (SELECT 1 FROM resumen);
+CREATE TRIGGER IF NOT EXISTS fitness_alta AFTER INSERT ON fitness
+    BEGIN UPDATE resumen SET entradas = entradas + 1; END;
+CREATE TRIGGER IF NOT EXISTS fitness_baja AFTER DELETE ON fitness
+    BEGIN UPDATE resumen SET entradas = entradas - 1; END;
+"""
+
+
+class AlmacenFitness:
+    """Valores objetivo persistentes, compartidos entre corridas.
+
+    Args:
+        ruta: Archivo SQLite (se crea si no existe)
+        version: Versión de la función objetivo; los valores de otras
+            versiones se ignoran
+        max_entradas: Entradas conservadas como máximo en el archivo (None
+            para no descartar nunca)
+        actualizar_uso: Si es True, cada acierto renueva la antigüedad de la
+            entrada, de modo que se descartan las menos usadas recientemente
+        tiempo_espera: Segundos que se espera a que otro proceso libere el archivo
+
+    Attributes:
+        consultas: Cromosomas buscados
+        aciertos: Cromosomas encontrados
+        guardados: Cromosomas nuevos guardados
+        descartados: Entradas descartadas por ``max_entradas``
+    """
+
+    def __init__(self, ruta, version, max_entradas=None, actualizar_uso=True, tiempo_espera=30.0):
+        if max_entradas is not None and max_entradas < 1:
+            raise ValueError("El almacén debe admitir al menos una entrada")
+        self.ruta = ruta
+        self.version = str(version)
+        self.max_entradas = max_entradas
+        self.actualizar_uso = actualizar_uso
+        self.consultas = 0
+        self.aciertos = 0
+        self.guardados = 0
+        self.descartados = 0
+        self._candado = threading.Lock()
+        self._conexion = sqlite3.connect(ruta, timeout=tiempo_espera, isolation_level=None,
+                                         check_same_thread=False)
+        self._conexion.execute("PRAGMA journal_mode=WAL")
+        self._conexion.execute("PRAGMA synchronous=NORMAL")
+        self._conexion.executescript(f"BEGIN IMMEDIATE;{_ESQUEMA}COMMIT;")
+
+    def __len__(self):
+        with self._candado:
+            return self._conexion.execute("SELECT entradas FROM resumen").fetchone()[0]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
+
+    def buscar(self, claves, longitud):
+        """Busca por lotes el valor guardado de cada cromosoma.
+
+        Args:
+            claves: Claves de ``claves_cromosomas``
+            longitud: Genes de cada cromosoma
+
+        Returns:
+            Diccionario con el valor (número o lista) de las claves encontradas
+        """
+        claves = list(claves)
+        encontrados = {}
+        with self._candado:
+            for inicio in range(0, len(claves), CLAVES_POR_CONSULTA):
+                lote = claves[inicio:inicio + CLAVES_POR_CONSULTA]
+                consulta = ("SELECT clave, valor FROM fitness WHERE version = ? AND longitud = ? "
+                            f"AND clave IN ({', '.join('?' * len(lote))})")
+                for clave, valor in self._conexion.execute(consulta, [self.version, longitud, *lote]):
+                    encontrados[bytes(clave)] = json.loads(valor)
+            if encontrados and self.actualizar_uso:
+                ahora = time.time()
+                with self._transaccion():
+                    self._conexion.executemany(
+                        "UPDATE fitness SET usado = ? WHERE version = ? AND longitud = ? AND clave = ?",
+                        [(ahora, self.version, longitud, clave) for clave in encontrados])
+            self.consultas += len(claves)
+            self.aciertos += len(encontrados)
+        return encontrados
+
+    def guardar(self, valores, longitud):
+        """Guarda en una transacción los valores de varios cromosomas.
+
+        Args:
+            valores: Diccionario clave -> valor (número o lista de números)
+            longitud: Genes de cada cromosoma
+
+        Returns:
+            Cantidad de entradas nuevas
+        """
+        if not valores:
+            return 0
+        ahora = time.time()
+        filas = [(self.version, longitud, clave, json.dumps(valor), ahora) for clave, valor in valores.items()]
+        with self._candado, self._transaccion():
+            nuevas = self._conexion.executemany("INSERT OR IGNORE INTO fitness VALUES (?, ?, ?, ?, ?)",
+                                                filas).rowcount
+            if self.max_entradas is not None:
+                sobrantes = self._conexion.execute("SELECT entradas FROM resumen").fetchone()[0] - self.max_entradas
+                if sobrantes > 0:
+                    self._conexion.execute(
+                        "DELETE FROM fitness WHERE rowid IN (SELECT rowid FROM fitness ORDER BY usado LIMIT ?)",
+                        (sobrantes,))
+                    self.descartados += sobrantes
+        self.guardados += nuevas
+        return nuevas
+
+    def cerrar(self):
+        """Cierra la conexión con el archivo."""
+        with self._candado:
+            self._conexion.close()
+
+    @contextmanager
+    def _transaccion(self):
+        """Abre una transacción ``IMMEDIATE`` y la confirma o la revierte al salir."""
+        self._conexion.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self._conexion.execute("ROLLBACK")
+            raise
+        self._conexion.execute("COMMIT")
@@ -0,0 +1,171 @@
+"""Tubería asincrónica que superpone la reproducción con la evaluación.
+
+Los hijos se envían a evaluar en lotes apenas se crean y, mientras los
+trabajadores evalúan, se prepara el siguiente lote con padres tomados de los
+individuos que ya tienen valor objetivo. Los resultados se integran a la
+población a medida que llegan (estado estacionario), de modo que no hay una
+barrera por generación y, con evaluadores de alta latencia (herramientas de
+plegado externas, búsquedas en índices), los trabajadores no quedan ociosos.
+
+El orden de llegada de los resultados depende de los trabajadores, por lo
+que una corrida no es reproducible aunque se fije la semilla.
+"""
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import numpy as np
+
+from .algoritmo import ResultadoAG, _registrar_generacion
+from .configuracion import ConfiguracionAG
+from .estado_estacionario import EstadisticasIncrementales, elegir_reemplazados, seleccionar_padres_paso
+from .evaluacion import Evaluador, objetivo_cuadratico, transformar_fitness
+from .instrumentacion import InstrumentacionNula
+from .operadores import aplicar_crossover, aplicar_mutacion, generar_poblacion_inicial
+from .restricciones import generar_poblacion_valida
+
+
+class _Poblacion:
+    """Población evaluada que se completa y luego se renueva de a lotes."""
+
+    def __init__(self, longitud_cromosoma, tamano):
+        self.cromosomas = np.zeros((longitud_cromosoma, tamano), dtype=np.uint8)
+        self.objetivo = np.zeros(tamano, dtype=np.float64)
+        self.ocupados = 0
+        self.estadisticas = None
+
+    @property
+    def completa(self):
+        return self.estadisticas is not None
+
+    def integrar(self, configuracion, lote, valores, rng):
+        """Agrega un lote evaluado ocupando lugares libres o reemplazando individuos."""
+        tamano = self.objetivo.shape[0]
+        libres = min(tamano - self.ocupados, lote.shape[1])
+        if libres:
+            destino = slice(self.ocupados, self.ocupados + libres)
+            self.cromosomas[:, destino] = lote[:, :libres]
+            self.objetivo[destino] = valores[:libres]
+            self.ocupados += libres
+            if self.ocupados == tamano:
+                self.estadisticas = EstadisticasIncrementales(self.objetivo, configuracion.minimizar)
+
+        restantes = lote.shape[1] - libres
+        if restantes:
+            reemplazados = elegir_reemplazados(configuracion, self.estadisticas, restantes, rng)
+            for hijo, individuo in enumerate(reemplazados, start=libres):
+                self.cromosomas[:, individuo] = lote[:, hijo]
+                self.estadisticas.reemplazar(individuo, valores[hijo])
+
+
+def ejecutar_asincrono(configuracion=None, funcion_objetivo=objetivo_cuadratico, instrumentacion=None,
+                       archivo_csv=None, mostrar=False, ejecutor=None, lotes_en_vuelo=None, restricciones=None,
+                       almacen=None):
+    """Ejecuta el algoritmo genético con evaluación asincrónica.
+
+    La población inicial y los hijos se evalúan en lotes de
+    ``hijos_por_paso`` individuos. Se mantienen hasta ``lotes_en_vuelo``
+    lotes enviados a la vez y se crean hijos en cuanto hay al menos dos
+    individuos evaluados. Cada ciclo corresponde a ``tamano_poblacion`` hijos
+    creados, igual que en ``ejecutar_estado_estacionario``. Los hijos que no
+    cumplen las restricciones se descartan sin enviarse a evaluar.
+
+    Args:
+        configuracion: Parámetros de la corrida (por defecto ``ConfiguracionAG()``)
+        funcion_objetivo: Función vectorizada a optimizar; con un
+            ``ProcessPoolExecutor`` debe poder serializarse con pickle
+        instrumentacion: ``Instrumentacion`` donde registrar tiempos y contadores
+        archivo_csv: Ruta del CSV donde guardar los datos de cada ciclo
+        mostrar: Si es True, muestra en pantalla el resumen de cada ciclo
+        ejecutor: ``concurrent.futures.Executor`` a usar; si es None se crea un
+            ``ThreadPoolExecutor`` con ``configuracion.trabajadores`` hilos
+        lotes_en_vuelo: Máximo de lotes enviados sin resultado (por defecto
+            el doble de trabajadores)
+        restricciones: ``Restricciones`` que deben cumplir los hijos antes de evaluarse
+        almacen: ``AlmacenFitness`` persistente con los valores de corridas anteriores
+
+    Returns:
+        ``ResultadoAG`` con la población final y el historial por ciclo
+    """
+    configuracion = configuracion or ConfiguracionAG()
+    if configuracion.nichos == "hacinamiento":
+        raise ValueError("El hacinamiento determinista sólo está disponible en el modo generacional")
+    instrumentacion = instrumentacion or InstrumentacionNula()
+    rng = np.random.default_rng(configuracion.semilla)
+    evaluador = Evaluador(funcion_objetivo, configuracion.usar_cache, instrumentacion, almacen)
+    tamano = configuracion.tamano_poblacion
+    longitud = configuracion.longitud_cromosoma
+    cantidad_hijos = configuracion.hijos_por_paso
+    lotes_en_vuelo = lotes_en_vuelo or 2 * configuracion.trabajadores
+    presupuesto_hijos = configuracion.numero_ciclos * tamano
+    propio = ejecutor is None
+    if propio:
+        ejecutor = ThreadPoolExecutor(max_workers=configuracion.trabajadores)
+
+    poblacion = _Poblacion(longitud, tamano)
+    historial = []
+    en_vuelo = {}
+    hijos_enviados = hijos_integrados = 0
+    ciclo = 0
+
+    try:
+        instrumentacion.iniciar_generacion(0)
+        iniciales = generar_poblacion_inicial(tamano, longitud, rng)
+        if restricciones is not None:
+            generar_poblacion_valida(restricciones, iniciales, rng)
+        for inicio in range(0, tamano, cantidad_hijos):
+            lote = iniciales[:, inicio:inicio + cantidad_hijos]
+            en_vuelo[evaluador.evaluar_asincrono(ejecutor, lote)] = (lote, False)
+
+        while True:
+            # Preparar lotes nuevos con los individuos evaluados hasta ahora
+            while (len(en_vuelo) < lotes_en_vuelo and hijos_enviados < presupuesto_hijos
+                   and poblacion.ocupados >= 2):
+                cantidad = min(cantidad_hijos, presupuesto_hijos - hijos_enviados)
+                lote = np.empty((longitud, cantidad), dtype=np.uint8)
+                with instrumentacion.fase("seleccion"):
+                    seleccion = seleccionar_padres_paso(configuracion, poblacion.objetivo[:poblacion.ocupados],
+                                                        cantidad, rng, poblacion.cromosomas[:, :poblacion.ocupados])
+                with instrumentacion.fase("crossover"):
+                    aplicar_crossover(poblacion.cromosomas, lote, seleccion,
+                                      configuracion.probabilidad_crossover, rng)
+                with instrumentacion.fase("mutacion"):
+                    aplicar_mutacion(lote, configuracion.probabilidad_mutacion, rng)
+                hijos_enviados += cantidad
+                if restricciones is not None:
+                    with instrumentacion.fase("filtro"):
+                        validos = restricciones.filtrar(lote, instrumentacion)
+                    # Los rechazados cuentan como hijos del ciclo aunque no se integren
+                    hijos_integrados += int(cantidad - validos.sum())
+                    lote = lote[:, validos]
+                    if not lote.shape[1]:
+                        continue
+                en_vuelo[evaluador.evaluar_asincrono(ejecutor, lote)] = (lote, True)
+            if not en_vuelo:
+                break
+
+            with instrumentacion.fase("evaluacion"):
+                listos, _ = wait(en_vuelo, return_when=FIRST_COMPLETED)
+            for futuro in listos:
+                lote, es_hijo = en_vuelo.pop(futuro)
+                with instrumentacion.fase("reemplazo"):
+                    poblacion.integrar(configuracion, lote, evaluador.resultado(futuro), rng)
+                if es_hijo:
+                    hijos_integrados += lote.shape[1]
+
+            # Cerrar los ciclos completos (el ciclo 0 es la población inicial)
+            while (poblacion.completa and hijos_integrados >= ciclo * tamano
+                   and ciclo <= configuracion.numero_ciclos):
+                with instrumentacion.fase("salida"):
+                    _registrar_generacion(historial, poblacion.cromosomas, poblacion.objetivo,
+                                          poblacion.estadisticas.estadisticas(), ciclo, archivo_csv, mostrar,
+                                          configuracion.minimizar)
+                instrumentacion.finalizar_generacion()
+                ciclo += 1
+                if ciclo <= configuracion.numero_ciclos:
+                    instrumentacion.iniciar_generacion(ciclo)
+    finally:
+        if propio:
+            ejecutor.shutdown(cancel_futures=True)
+
+    fitness = transformar_fitness(poblacion.objetivo, configuracion.escalado_fitness, configuracion.minimizar)
+    return ResultadoAG(poblacion.cromosomas, poblacion.objetivo, fitness, historial[-1]["cromosoma"],
+                       historial, evaluador.evaluaciones)
@@ -0,0 +1,137 @@
+"""Operaciones de bits sobre la población empaquetada.
+
+La matriz de bits ``(longitud, individuos)`` se empaqueta en palabras de
+64 bits, una fila por individuo, de modo que la distancia de Hamming entre
+dos cromosomas es un XOR y un conteo de bits por palabra. Las distancias de
+toda la población se calculan por bloques de filas, sin armar nunca una
+matriz densa ``N×N`` de flotantes, y sobre ellas se construyen el fitness
+compartido, el hacinamiento determinista y la detección de duplicados.
+"""
+import numpy as np
+
+# Cantidad de distancias calculadas a la vez al recorrer la población por bloques
+ELEMENTOS_POR_BLOQUE = 1 << 18
+
+_BITS_POR_BYTE = np.array([bin(valor).count("1") for valor in range(256)], dtype=np.uint8)
+
+
+def contar_bits(palabras):
+    """Cuenta los bits en 1 de cada palabra (``np.bitwise_count`` o una tabla por byte)."""
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(palabras)
+    bytes_ = palabras.view(np.uint8).reshape(palabras.shape + (palabras.itemsize,))
+    return _BITS_POR_BYTE[bytes_].sum(axis=-1, dtype=np.uint8)
+
+
+def empaquetar(poblacion):
+    """Empaqueta la población en una matriz ``(individuos, palabras)`` de ``uint64``."""
+    longitud, individuos = poblacion.shape
+    palabras = -(-longitud // 64)
+    bytes_ = np.zeros((individuos, palabras * 8), dtype=np.uint8)
+    bytes_[:, :-(-longitud // 8)] = np.packbits(poblacion.T, axis=1)
+    return bytes_.view(np.uint64)
+
+
+def distancias_hamming(filas, columnas):
+    """Devuelve la matriz ``(len(filas), len(columnas))`` de distancias entre dos conjuntos empaquetados."""
+    tipo = np.uint16 if filas.shape[1] * 64 < 1 << 16 else np.int32
+    distancias = np.zeros((filas.shape[0], columnas.shape[0]), dtype=tipo)
+    xor = np.empty(distancias.shape, dtype=np.uint64)
+    for palabra in range(filas.shape[1]):
+        np.bitwise_xor(filas[:, palabra, None], columnas[None, :, palabra], out=xor)
+        distancias += contar_bits(xor)
+    return distancias
+
+
+def distancias_por_pares(primeros, segundos):
+    """Devuelve la distancia entre cada fila de ``primeros`` y la misma fila de ``segundos``."""
+    return contar_bits(primeros ^ segundos).sum(axis=1, dtype=np.int32)
+
+
+def recorrer_bloques(empaquetada):
+    """Genera ``(inicio, distancias)`` con las distancias de cada bloque de filas a toda la población."""
+    individuos = empaquetada.shape[0]
+    filas = max(1, ELEMENTOS_POR_BLOQUE // max(1, individuos))
+    for inicio in range(0, individuos, filas):
+        yield inicio, distancias_hamming(empaquetada[inicio:inicio + filas], empaquetada)
+
+
+def contar_nichos(poblacion, radio, alfa=1.0):
+    """Devuelve el contador de nicho de cada individuo para el fitness compartido.
+
+    El contador es ``sum_j max(0, 1 - (d_ij / radio) ** alfa)`` e incluye al
+    propio individuo, por lo que siempre es al menos 1.
+
+    Args:
+        poblacion: Matriz de cromosomas binarios
+        radio: Distancia de Hamming a partir de la cual dos individuos no comparten nicho
+        alfa: Forma de la función de compartición
+    """
+    empaquetada = empaquetar(poblacion)
+    # Aporte de cada distancia posible, precalculado una sola vez
+    aporte = np.maximum(0.0, 1.0 - (np.arange(poblacion.shape[0] + 1) / radio) ** alfa)
+    nichos = np.empty(empaquetada.shape[0])
+    for inicio, distancias in recorrer_bloques(empaquetada):
+        nichos[inicio:inicio + distancias.shape[0]] = aporte[distancias].sum(axis=1)
+    return nichos
+
+
+def compartir_fitness(fitness, poblacion, radio, alfa=1.0):
+    """Divide el fitness (no negativo) de cada individuo por su contador de nicho.
+
+    Con fitness negativo dividir por el contador acercaría a cero a los
+    individuos más apiñados, es decir, los premiaría; por eso se rechaza.
+
+    Raises:
+        ValueError: Si algún fitness es negativo
+    """
+    fitness = np.asarray(fitness, dtype=np.float64)
+    if fitness.min() < 0:
+        raise ValueError("El fitness compartido necesita fitness no negativo; use el escalado 'ranking' o 'sigma'")
+    return fitness / contar_nichos(poblacion, radio, alfa)
+
+
+def marcar_duplicados(poblacion):
+    """Devuelve una máscara con los individuos que repiten un cromosoma anterior."""
+    filas = np.ascontiguousarray(empaquetar(poblacion))
+    claves = filas.view(np.dtype((np.void, filas.dtype.itemsize * filas.shape[1])))[:, 0]
+    _, primeros = np.unique(claves, return_index=True)
+    duplicados = np.ones(poblacion.shape[1], dtype=bool)
+    duplicados[primeros] = False
+    return duplicados
+
+
+def hacinamiento_determinista(padres, hijos, objetivo_padres, objetivo_hijos, minimizar=False):
+    """Decide qué hijos sobreviven frente a su padre más parecido.
+
+    Los padres ``2p`` y ``2p + 1`` se emparejan con los hijos ``2p`` y
+    ``2p + 1`` de forma que la suma de distancias sea mínima, y cada hijo
+    sobrevive sólo si no es peor que el padre con el que compite.
+
+    Args:
+        padres: Matriz de cromosomas de los padres, en el orden de la selección
+        hijos: Matriz de cromosomas de los hijos, en el mismo orden
+        objetivo_padres: Valor objetivo de los padres
+        objetivo_hijos: Valor objetivo de los hijos
+        minimizar: Si es True, gana el menor valor objetivo
+
+    Returns:
+        Tupla ``(perdedores, rivales)``: índices de los hijos que no
+        sobreviven y del padre que ocupa el lugar de cada uno
+    """
+    parejas = hijos.shape[1] // 2
+    padres = empaquetar(padres[:, :2 * parejas])
+    hijos = empaquetar(hijos[:, :2 * parejas])
+    directo = (distancias_por_pares(padres[0::2], hijos[0::2])
+               + distancias_por_pares(padres[1::2], hijos[1::2]))
+    cruzado = (distancias_por_pares(padres[0::2], hijos[1::2])
+               + distancias_por_pares(padres[1::2], hijos[0::2]))
+    # rivales[i]: padre con el que compite el hijo i
+    rivales = np.arange(2 * parejas)
+    intercambiar = np.repeat(cruzado < directo, 2)
+    rivales[intercambiar] ^= 1
+    valores_hijos = objetivo_hijos[:2 * parejas]
+    valores_padres = objetivo_padres[rivales]
+    pierde = valores_hijos > valores_padres if minimizar else valores_hijos < valores_padres
+    perdedores = np.flatnonzero(pierde)
+    return perdedores, rivales[perdedores]
@@ -0,0 +1,296 @@
+"""Interfaz de línea de comandos ``sgrna-ga``.
+
+Ejemplo::
+
+    sgrna-ga run --selection tournament --elite 2 --pop 5000 --gens 500 --workers 16 --out run.parquet
+    sgrna-ga batch --targets loci.fasta --reference genoma.fasta --workers 8 --out guias.csv
+    sgrna-ga serve --reference genoma.fasta --workers 4 --port 8000
+
+Este módulo sólo importa ``argparse`` al cargarse; NumPy y el resto del
+paquete se importan dentro de los subcomandos, por lo que ``--help``
+responde de inmediato.
+"""
+import argparse
+import sys
+
+# Nombres en inglés aceptados además de los de ``ConfiguracionAG``
+SELECCIONES = {"tournament": "torneo", "roulette": "ruleta", "torneo": "torneo", "ruleta": "ruleta"}
+MODOS = ("generacional", "estacionario", "asincrono")
+FORMATOS = ("csv", "json", "parquet")
+
+
+def crear_parser():
+    """Arma el parser de argumentos de ``sgrna-ga``."""
+    from . import __version__
+
+    parser = argparse.ArgumentParser(prog="sgrna-ga", description="Algoritmos genéticos para arrays de sgRNA")
+    parser.add_argument("--version", action="version", version=f"%(prog)s {__version__}")
+    subcomandos = parser.add_subparsers(dest="comando", required=True)
+
+    run = subcomandos.add_parser("run", help="Ejecuta una corrida del algoritmo genético")
+    run.add_argument("--selection", choices=sorted(SELECCIONES), default="tournament",
+                     help="Operador de selección (por defecto: tournament)")
+    run.add_argument("--tournament-size", type=int, default=4, help="Participantes de cada torneo")
+    run.add_argument("--elite", type=int, default=0, help="Individuos de élite por generación")
+    run.add_argument("--pop", type=int, default=10, help="Tamaño de la población")
+    run.add_argument("--length", type=int, default=30, help="Genes (bits) de cada cromosoma")
+    run.add_argument("--gens", type=int, default=20, help="Cantidad de generaciones")
+    run.add_argument("--crossover", type=float, default=75, help="Probabilidad de crossover, en porcentaje")
+    run.add_argument("--mutation", type=float, default=5, help="Probabilidad de mutación, en porcentaje")
+    run.add_argument("--scaling", choices=("crudo", "ranking", "sigma"), default="crudo",
+                     help="Escalado del fitness para la ruleta")
+    run.add_argument("--minimize", action="store_true", help="Minimizar el objetivo en lugar de maximizarlo")
+    run.add_argument("--workers", type=int, default=1,
+                     help="Procesos que evalúan cada generación en memoria compartida (hilos en el modo asincrono)")
+    run.add_argument("--mode", choices=MODOS, default="generacional",
+                     help="Ciclo a usar (por defecto: generacional; asincrono no es reproducible con --workers > 1)")
+    run.add_argument("--objective", default=None, metavar="MODULO:FUNCION",
+                     help="Función objetivo vectorizada a importar (por defecto: (x/coef)^2)")
+    run.add_argument("--cache", action="store_true", help="No reevaluar cromosomas repetidos")
+    run.add_argument("--store", default=None, metavar="SQLITE",
+                     help="Archivo donde conservar los valores objetivo entre corridas")
+    run.add_argument("--objective-version", default=None,
+                     help="Versión del objetivo en --store (por defecto, el valor de --objective)")
+    run.add_argument("--store-max", type=int, default=None, help="Entradas máximas de --store")
+    run.add_argument("--seed", type=int, default=None, help="Semilla del generador aleatorio")
+    run.add_argument("--out", default=None, help="Archivo donde guardar el historial (.csv, .json o .parquet)")
+    run.add_argument("--snapshots", default=None, metavar="ZIP",
+                     help="Archivo donde guardar poblaciones completas (sólo en el modo generacional)")
+    run.add_argument("--snapshot-every", type=int, default=10, help="Generaciones entre poblaciones guardadas")
+    run.add_argument("--instrumentation", default=None, metavar="CSV",
+                     help="Archivo CSV donde guardar tiempos y contadores por generación")
+    run.add_argument("--trace-memory", action="store_true",
+                     help="Agregar a --instrumentation la memoria asignada por generación (tracemalloc)")
+    run.add_argument("--verbose", action="store_true", help="Mostrar el resumen de cada generación")
+    run.set_defaults(funcion=ejecutar_run)
+
+    batch = subcomandos.add_parser("batch", help="Diseña un array de guías por cada región de un FASTA o CSV")
+    batch.add_argument("--targets", required=True, help="FASTA o CSV (columnas nombre y secuencia) con las regiones")
+    batch.add_argument("--out", required=True, help="CSV donde se agrega una fila por locus")
+    batch.add_argument("--reference", default=None, metavar="FASTA",
+                       help="Referencia para penalizar semillas repetidas")
+    batch.add_argument("--seed-length", type=int, default=10, help="Largo de las semillas indexadas")
+    batch.add_argument("--guides", type=int, default=3, help="Guías de cada array")
+    batch.add_argument("--spacer", type=int, default=20, help="Nucleótidos de cada espaciador")
+    batch.add_argument("--pam", default="NGG", help="Patrón IUPAC de la PAM")
+    batch.add_argument("--selection", choices=sorted(SELECCIONES), default="tournament",
+                       help="Operador de selección (por defecto: tournament)")
+    batch.add_argument("--elite", type=int, default=2, help="Individuos de élite por generación")
+    batch.add_argument("--pop", type=int, default=100, help="Tamaño de la población")
+    batch.add_argument("--gens", type=int, default=200, help="Cantidad de generaciones")
+    batch.add_argument("--mutation", type=float, default=30, help="Probabilidad de mutación, en porcentaje")
+    batch.add_argument("--workers", type=int, default=1, help="Procesos que diseñan loci en paralelo")
+    batch.add_argument("--seed", type=int, default=None, help="Semilla del primer locus")
+    batch.set_defaults(funcion=ejecutar_batch)
+
+    serve = subcomandos.add_parser("serve", help="Atiende pedidos de diseño por HTTP con cachés en memoria")
+    serve.add_argument("--host", default="127.0.0.1", help="Dirección donde escuchar")
+    serve.add_argument("--port", type=int, default=8000, help="Puerto TCP")
+    serve.add_argument("--socket", default=None, metavar="RUTA", help="Socket Unix a usar en lugar de TCP")
+    serve.add_argument("--reference", default=None, metavar="FASTA",
+                       help="Referencia para penalizar semillas repetidas")
+    serve.add_argument("--seed-length", type=int, default=10, help="Largo de las semillas indexadas")
+    serve.add_argument("--workers", type=int, default=2, help="Trabajos que se ejecutan a la vez")
+    serve.add_argument("--queue", type=int, default=64, help="Trabajos en espera antes de rechazar (503)")
+    serve.add_argument("--cache-per-locus", type=int, default=100_000, metavar="N",
+                       help="Cromosomas que conserva la caché de fitness de cada locus")
+    serve.add_argument("--verbose", action="store_true", help="Mostrar cada solicitud recibida")
+    serve.set_defaults(funcion=ejecutar_serve)
+    return parser
+
+
+def cargar_objetivo(especificacion):
+    """Importa una función a partir de ``"paquete.modulo:funcion"``."""
+    import importlib
+
+    modulo, separador, nombre = especificacion.partition(":")
+    if not separador or not modulo or not nombre:
+        raise ValueError(f"La función objetivo debe indicarse como MODULO:FUNCION, no {especificacion!r}")
+    try:
+        return getattr(importlib.import_module(modulo), nombre)
+    except (ImportError, AttributeError) as error:
+        raise ValueError(f"No se pudo cargar la función objetivo {especificacion!r}: {error}") from None
+
+
+def formato_de_salida(ruta):
+    """Devuelve el formato del historial según la extensión de ``ruta``.
+
+    Se verifica antes de la corrida, para no descubrir al final que la
+    extensión es desconocida o que falta ``pyarrow``.
+
+    Raises:
+        ValueError: Si la extensión no está en ``FORMATOS`` o si el formato
+            es Parquet y ``pyarrow`` no está instalado
+    """
+    formato = ruta.rsplit(".", 1)[-1].lower()
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato de salida desconocido: {ruta!r} (opciones: {', '.join(FORMATOS)})")
+    if formato == "parquet":
+        try:
+            import pyarrow.parquet
+        except ImportError:
+            raise ValueError("Para guardar en Parquet instale pyarrow (pip install sgrna-ags[parquet])") from None
+    return formato
+
+
+def exportar_historial(historial, ruta):
+    """Guarda el historial de una corrida según la extensión de ``ruta``.
+
+    Los CSV usan ';' como separador, igual que el resto del paquete. El
+    formato Parquet requiere ``pyarrow``.
+    """
+    formato = formato_de_salida(ruta)
+    columnas = list(historial[0]) if historial else []
+    if formato == "json":
+        import json
+
+        with open(ruta, "w", encoding="utf-8") as archivo:
+            json.dump(historial, archivo, ensure_ascii=False, indent=1)
+    elif formato == "parquet":
+        import pyarrow
+        import pyarrow.parquet
+
+        tabla = pyarrow.table({columna: [registro[columna] for registro in historial] for columna in columnas})
+        pyarrow.parquet.write_table(tabla, ruta)
+    else:
+        with open(ruta, "w", encoding="utf-8") as archivo:
+            archivo.write(";".join(columnas) + "\n")
+            for registro in historial:
+                archivo.write(";".join(str(registro[columna]) for columna in columnas) + "\n")
+
+
+def ejecutar_run(argumentos):
+    """Ejecuta el subcomando ``run``."""
+    from .algoritmo import ejecutar_algoritmo_genetico
+    from .configuracion import ConfiguracionAG
+    from .evaluacion import objetivo_cuadratico
+    from .instrumentacion import Instrumentacion
+
+    if argumentos.out:
+        formato_de_salida(argumentos.out)
+    configuracion = ConfiguracionAG(
+        tamano_poblacion=argumentos.pop,
+        longitud_cromosoma=argumentos.length,
+        probabilidad_crossover=argumentos.crossover,
+        probabilidad_mutacion=argumentos.mutation,
+        numero_ciclos=argumentos.gens,
+        seleccion=SELECCIONES[argumentos.selection],
+        tamano_torneo=argumentos.tournament_size,
+        escalado_fitness=argumentos.scaling,
+        minimizar=argumentos.minimize,
+        elite=argumentos.elite,
+        usar_cache=argumentos.cache,
+        trabajadores=argumentos.workers,
+        semilla=argumentos.seed,
+    )
+    funcion_objetivo = cargar_objetivo(argumentos.objective) if argumentos.objective else objetivo_cuadratico
+    instrumentacion = Instrumentacion(argumentos.trace_memory) if argumentos.instrumentation else None
+    almacen = None
+    if argumentos.store:
+        from .almacen import AlmacenFitness
+
+        version = argumentos.objective_version or argumentos.objective or "objetivo_cuadratico"
+        almacen = AlmacenFitness(argumentos.store, version, argumentos.store_max)
+    modo = argumentos.mode
+    if modo == "estacionario":
+        from .estado_estacionario import ejecutar_estado_estacionario as ejecutar
+    elif modo == "asincrono":
+        from .asincrono import ejecutar_asincrono as ejecutar
+    else:
+        ejecutar = ejecutar_algoritmo_genetico
+
+    if argumentos.snapshots and modo != "generacional":
+        raise ValueError("--snapshots sólo está disponible en el modo generacional")
+    opciones = {"almacen": almacen}
+    if modo == "generacional" and argumentos.workers > 1:
+        from .memoria_compartida import EvaluadorCompartido
+
+        opciones = {"compartido": EvaluadorCompartido(funcion_objetivo, configuracion, almacen=almacen)}
+    if argumentos.snapshots:
+        from .registro_poblaciones import RegistroPoblaciones
+
+        opciones["registro"] = RegistroPoblaciones(argumentos.snapshots, argumentos.snapshot_every)
+    try:
+        resultado = ejecutar(configuracion, funcion_objetivo, instrumentacion=instrumentacion,
+                             mostrar=argumentos.verbose, **opciones)
+    finally:
+        if "compartido" in opciones:
+            opciones["compartido"].cerrar()
+        if "registro" in opciones:
+            opciones["registro"].cerrar()
+        if almacen is not None:
+            almacen.cerrar()
+        if instrumentacion is not None:
+            instrumentacion.cerrar()
+    if argumentos.out:
+        exportar_historial(resultado.historial, argumentos.out)
+    if instrumentacion is not None:
+        instrumentacion.exportar_csv(argumentos.instrumentation)
+    mejor = resultado.historial[-1]
+    print(f"Mejor cromosoma: {mejor['cromosoma']}  objetivo: {mejor['minimo' if configuracion.minimizar else 'maximo']}"
+          f"  evaluaciones: {resultado.evaluaciones}")
+    return 0
+
+
+def ejecutar_batch(argumentos):
+    """Ejecuta el subcomando ``batch``."""
+    from .configuracion import ConfiguracionAG
+    from .lotes import IndiceReferencia, disenar_lote, leer_objetivos
+
+    configuracion = ConfiguracionAG(
+        tamano_poblacion=argumentos.pop,
+        longitud_cromosoma=2 * argumentos.guides * (argumentos.spacer + len(argumentos.pam)),
+        probabilidad_mutacion=argumentos.mutation,
+        numero_ciclos=argumentos.gens,
+        seleccion=SELECCIONES[argumentos.selection],
+        elite=argumentos.elite,
+        semilla=argumentos.seed,
+    )
+    indice = None
+    if argumentos.reference:
+        indice = IndiceReferencia.desde_fasta(argumentos.reference, argumentos.seed_length)
+    procesados = disenar_lote(leer_objetivos(argumentos.targets), argumentos.out, configuracion,
+                              argumentos.guides, argumentos.spacer, argumentos.pam, indice,
+                              trabajadores=argumentos.workers)
+    print(f"Loci procesados: {procesados}")
+    return 0
+
+
+def ejecutar_serve(argumentos):
+    """Ejecuta el subcomando ``serve`` hasta recibir Ctrl+C."""
+    from .lotes import IndiceReferencia
+    from .servicio import ServicioDiseno, crear_servidor
+
+    indice = None
+    if argumentos.reference:
+        indice = IndiceReferencia.desde_fasta(argumentos.reference, argumentos.seed_length)
+    servicio = ServicioDiseno(argumentos.workers, argumentos.queue, indice,
+                              max_cromosomas_por_locus=argumentos.cache_per_locus)
+    servidor = crear_servidor(servicio, argumentos.host, argumentos.port, argumentos.socket, argumentos.verbose)
+    if argumentos.socket:
+        print(f"Escuchando en {argumentos.socket}")
+    else:
+        host, puerto = servidor.server_address[:2]
+        print(f"Escuchando en http://{host}:{puerto}")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+        servicio.cerrar()
+    return 0
+
+
+def main(argv=None):
+    """Punto de entrada de ``sgrna-ga``."""
+    parser = crear_parser()
+    argumentos = parser.parse_args(argv)
+    try:
+        return argumentos.funcion(argumentos)
+    except ValueError as error:
+        parser.exit(2, f"sgrna-ga: error: {error}\n")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
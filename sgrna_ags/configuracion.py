@@ -0,0 +1,100 @@
+"""Parámetros del algoritmo genético.
+
+Reúne en un único objeto las constantes globales que los scripts de
+``Pruebas AGs`` definen al comienzo de cada archivo (``TAMANO_POBLACION``,
+``LONGITUD_CROMOSOMA``, ``PROBABILIDAD_CROSSOVER``, ...).
+"""
+from dataclasses import dataclass
+
+# Valores por defecto, iguales a los de los scripts originales
+TAMANO_POBLACION = 10
+LONGITUD_CROMOSOMA = 30
+PROBABILIDAD_CROSSOVER = 75  # 75%
+PROBABILIDAD_MUTACION = 5    # 5%
+NUMERO_CICLOS = 20
+TAMANO_TORNEO = 4
+
+SELECCIONES = ("torneo", "ruleta")
+REEMPLAZOS = ("peor", "torneo")
+ESCALADOS = ("crudo", "ranking", "sigma")
+NICHOS = ("ninguno", "compartido", "hacinamiento")
+
+
+@dataclass
+class ConfiguracionAG:
+    """Configuración de una corrida del algoritmo genético.
+
+    Attributes:
+        tamano_poblacion: Cantidad de individuos por generación
+        longitud_cromosoma: Cantidad de genes (bits) de cada cromosoma
+        probabilidad_crossover: Probabilidad de cruce de cada pareja, en porcentaje
+        probabilidad_mutacion: Probabilidad de mutar cada individuo, en porcentaje
+        numero_ciclos: Cantidad de generaciones a ejecutar
+        seleccion: Operador de selección ("torneo" o "ruleta")
+        tamano_torneo: Cantidad de participantes de cada torneo
+        escalado_fitness: Transformación del objetivo usada por la ruleta
+            ("crudo", "ranking" o "sigma")
+        minimizar: Si es True, se busca el menor valor objetivo (por ejemplo la MFE)
+        elite: Cantidad de mejores individuos copiados sin cambios a la siguiente generación
+        usar_cache: Si es True, no se reevalúan cromosomas ya evaluados en la corrida
+        hijos_por_paso: Hijos creados y evaluados en cada paso del modo estacionario
+        reemplazo: Individuos reemplazados en el modo estacionario ("peor" o "torneo")
+        trabajadores: Cantidad de hilos o procesos que evalúan en paralelo
+        nichos: Mecanismo de diversidad ("ninguno", "compartido" para fitness
+            compartido en la selección o "hacinamiento" para hacinamiento
+            determinista entre padres e hijos, sólo en el modo generacional)
+        radio_nicho: Distancia de Hamming del fitness compartido (por
+            defecto, un décimo de la longitud del cromosoma)
+        alfa_nicho: Forma de la función de compartición
+        eliminar_duplicados: Si es True, sólo la primera copia de cada
+            cromosoma repetido puede ser elegida como padre
+        semilla: Semilla del generador aleatorio (None para una corrida no reproducible)
+    """
+
+    tamano_poblacion: int = TAMANO_POBLACION
+    longitud_cromosoma: int = LONGITUD_CROMOSOMA
+    probabilidad_crossover: float = PROBABILIDAD_CROSSOVER
+    probabilidad_mutacion: float = PROBABILIDAD_MUTACION
+    numero_ciclos: int = NUMERO_CICLOS
+    seleccion: str = "torneo"
+    tamano_torneo: int = TAMANO_TORNEO
+    escalado_fitness: str = "crudo"
+    minimizar: bool = False
+    elite: int = 0
+    usar_cache: bool = False
+    hijos_por_paso: int = 2
+    reemplazo: str = "peor"
+    trabajadores: int = 1
+    nichos: str = "ninguno"
+    radio_nicho: int = None
+    alfa_nicho: float = 1.0
+    eliminar_duplicados: bool = False
+    semilla: int = None
+
+    def __post_init__(self):
+        if self.seleccion not in SELECCIONES:
+            raise ValueError(f"Selección desconocida: {self.seleccion!r} (opciones: {', '.join(SELECCIONES)})")
+        if self.reemplazo not in REEMPLAZOS:
+            raise ValueError(f"Reemplazo desconocido: {self.reemplazo!r} (opciones: {', '.join(REEMPLAZOS)})")
+        if self.escalado_fitness not in ESCALADOS:
+            raise ValueError(f"Escalado desconocido: {self.escalado_fitness!r} (opciones: {', '.join(ESCALADOS)})")
+        if self.nichos not in NICHOS:
+            raise ValueError(f"Nichos desconocidos: {self.nichos!r} (opciones: {', '.join(NICHOS)})")
+        if self.seleccion == "ruleta" and self.minimizar and self.escalado_fitness == "crudo":
+            raise ValueError("Para minimizar con ruleta use el escalado 'ranking' o 'sigma'")
+        if self.nichos == "compartido" and self.minimizar and self.escalado_fitness == "crudo":
+            raise ValueError("Para minimizar con fitness compartido use el escalado 'ranking' o 'sigma'")
+        if self.tamano_poblacion < 2:
+            raise ValueError("La población debe tener al menos 2 individuos")
+        if not 0 <= self.elite < self.tamano_poblacion:
+            raise ValueError("La élite debe ser menor que el tamaño de la población")
+        if not 1 <= self.hijos_por_paso <= self.tamano_poblacion:
+            raise ValueError("Los hijos por paso deben estar entre 1 y el tamaño de la población")
+        if self.trabajadores < 1:
+            raise ValueError("Debe haber al menos un trabajador")
+        if self.longitud_cromosoma < 2:
+            raise ValueError("El cromosoma debe tener al menos 2 genes")
+        if self.radio_nicho is None:
+            self.radio_nicho = max(1, self.longitud_cromosoma // 10)
+        if self.radio_nicho < 1:
+            raise ValueError("El radio de nicho debe ser al menos 1")
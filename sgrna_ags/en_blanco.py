@@ -0,0 +1,114 @@
+"""Puntaje de eficiencia en el blanco con tablas de pesos por posición.
+
+Los modelos de eficiencia de corte tipo Doench suman contribuciones que
+dependen sólo del nucleótido (o dinucleótido) en cada posición de la guía.
+Las tablas se precalculan aplanadas en un único vector, de modo que puntuar
+toda la población es un solo ``np.take`` sobre la matriz de códigos de 2
+bits seguido de una suma.
+"""
+import numpy as np
+
+from .incremental import EvaluadorIncremental
+from .secuencias import (
+    NUCLEOTIDOS,
+    agregar_puntajes,
+    decodificar_nucleotidos,
+    dividir_en_segmentos,
+    verificar_agregacion,
+)
+
+
+class PuntajeEnBlanco:
+    """Función objetivo de eficiencia en el blanco de cada guía del array.
+
+    El cromosoma se lee como segmentos consecutivos de ``longitud_segmento``
+    nucleótidos; cada segmento se puntúa con las tablas y los puntajes de
+    los segmentos se combinan según ``agregacion``.
+
+    Args:
+        pesos_nucleotido: Matriz ``(posiciones, 4)`` con el peso de cada
+            nucleótido (orden ACGT) en cada posición
+        pesos_dinucleotido: Matriz ``(posiciones - 1, 16)`` con el peso de
+            cada dinucleótido (AA, AC, ..., TT) que empieza en cada posición;
+            None para no usar dinucleótidos
+        intercepto: Término constante del modelo
+        logistica: Si es True, el puntaje de cada guía es la logística de la
+            suma (como en el Rule Set 1 de Doench)
+        longitud_segmento: Nucleótidos de cada segmento del cromosoma (por
+            defecto, la cantidad de posiciones de las tablas)
+        agregacion: Cómo combinar las guías del array ("media", "minimo" o "suma")
+    """
+
+    def __init__(self, pesos_nucleotido, pesos_dinucleotido=None, intercepto=0.0, logistica=False,
+                 longitud_segmento=None, agregacion="media"):
+        pesos_nucleotido = np.asarray(pesos_nucleotido, dtype=np.float64)
+        posiciones = pesos_nucleotido.shape[0]
+        if pesos_nucleotido.shape != (posiciones, 4):
+            raise ValueError("Los pesos por nucleótido deben tener forma (posiciones, 4)")
+        verificar_agregacion(agregacion)
+        tablas = [pesos_nucleotido.ravel()]
+        if pesos_dinucleotido is not None:
+            pesos_dinucleotido = np.asarray(pesos_dinucleotido, dtype=np.float64)
+            if pesos_dinucleotido.shape != (posiciones - 1, 16):
+                raise ValueError("Los pesos por dinucleótido deben tener forma (posiciones - 1, 16)")
+            tablas.append(pesos_dinucleotido.ravel())
+        self.posiciones = posiciones
+        self.usa_dinucleotidos = pesos_dinucleotido is not None
+        self.tabla = np.concatenate(tablas)
+        self.intercepto = float(intercepto)
+        self.logistica = logistica
+        self.longitud_segmento = longitud_segmento or posiciones
+        if self.longitud_segmento < posiciones:
+            raise ValueError("El segmento no puede ser más corto que las tablas de pesos")
+        self.agregacion = agregacion
+        # Desplazamiento de cada posición dentro de la tabla aplanada
+        self._base_nucleotido = (np.arange(posiciones) * 4)[None, :, None]
+        self._base_dinucleotido = (posiciones * 4 + np.arange(posiciones - 1) * 16)[None, :, None]
+
+    @classmethod
+    def desde_caracteristicas(cls, posiciones, caracteristicas, intercepto=0.0, **opciones):
+        """Construye las tablas a partir de una lista de características.
+
+        Args:
+            posiciones: Largo de la guía puntuada
+            caracteristicas: Secuencia de tuplas ``(posicion, motivo, peso)``
+                donde ``motivo`` es un nucleótido o un dinucleótido
+                (por ejemplo ``(20, "G", 0.3)`` o ``(3, "TT", -0.2)``)
+            intercepto: Término constante del modelo
+            **opciones: Resto de los argumentos de ``PuntajeEnBlanco``
+        """
+        pesos_nucleotido = np.zeros((posiciones, 4))
+        pesos_dinucleotido = None
+        for posicion, motivo, peso in caracteristicas:
+            codigos = [NUCLEOTIDOS.index(base) for base in motivo.upper()]
+            if len(codigos) == 1:
+                pesos_nucleotido[posicion, codigos[0]] += peso
+            elif len(codigos) == 2:
+                if pesos_dinucleotido is None:
+                    pesos_dinucleotido = np.zeros((posiciones - 1, 16))
+                pesos_dinucleotido[posicion, codigos[0] * 4 + codigos[1]] += peso
+            else:
+                raise ValueError(f"Motivo no soportado: {motivo!r} (sólo nucleótidos o dinucleótidos)")
+        return cls(pesos_nucleotido, pesos_dinucleotido, intercepto, **opciones)
+
+    def puntajes_por_guia(self, poblacion):
+        """Devuelve el puntaje de cada guía, con forma ``(guias, individuos)``."""
+        codigos = decodificar_nucleotidos(poblacion).astype(np.intp)
+        segmentos = dividir_en_segmentos(codigos, self.longitud_segmento)[:, :self.posiciones]
+        indices = self._base_nucleotido + segmentos
+        if self.usa_dinucleotidos:
+            dinucleotidos = self._base_dinucleotido + segmentos[:, :-1] * 4 + segmentos[:, 1:]
+            indices = np.concatenate([indices, dinucleotidos], axis=1)
+        puntajes = np.take(self.tabla, indices).sum(axis=1) + self.intercepto
+        if self.logistica:
+            puntajes = 1.0 / (1.0 + np.exp(-puntajes))
+        return puntajes
+
+    def __call__(self, poblacion):
+        """Devuelve el puntaje de cada array de guías de la población."""
+        return agregar_puntajes(self.puntajes_por_guia(poblacion), self.agregacion)
+
+    def evaluador_incremental(self, instrumentacion=None):
+        """Devuelve un ``EvaluadorIncremental`` que puntúa cada guía por separado."""
+        return EvaluadorIncremental(self.puntajes_por_guia, 2 * self.longitud_segmento, self.agregacion,
+                                    instrumentacion)
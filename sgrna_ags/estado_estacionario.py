@@ -0,0 +1,225 @@
+"""Modo de estado estacionario con reemplazo incremental.
+
+En lugar de reconstruir toda la población en cada ciclo, cada paso crea y
+evalúa sólo ``hijos_por_paso`` descendientes y los inserta en lugar de los
+peores individuos (o de los perdedores de un torneo inverso). Las
+estadísticas de la población se mantienen de forma incremental con una suma
+acumulada y dos montículos (mejores y peores) con invalidación perezosa.
+Con selección por torneo, los padres se eligen leyendo sólo el objetivo de
+los candidatos sorteados, de modo que cada paso cuesta O(k log N) además de
+las k evaluaciones. La ruleta, el fitness compartido y la eliminación de
+duplicados necesitan el fitness de toda la población, por lo que con ellos
+cada paso cuesta O(N) (O(N²) con fitness compartido).
+"""
+import heapq
+
+import numpy as np
+
+from .algoritmo import ResultadoAG, _registrar_generacion, seleccionar_padres
+from .configuracion import ConfiguracionAG
+from .evaluacion import Estadisticas, Evaluador, objetivo_cuadratico, transformar_fitness
+from .instrumentacion import InstrumentacionNula
+from .operadores import aplicar_crossover, aplicar_mutacion, generar_poblacion_inicial
+from .restricciones import generar_poblacion_valida
+
+
+class EstadisticasIncrementales:
+    """Total, mínimo, máximo y promedio de una población que cambia de a pocos individuos.
+
+    Args:
+        objetivo: Vector de valores objetivo de la población; se actualiza en
+            el lugar con cada reemplazo
+        minimizar: Si es True, los peores individuos son los de mayor objetivo
+    """
+
+    def __init__(self, objetivo, minimizar=False):
+        self.objetivo = objetivo
+        self.minimizar = minimizar
+        self.versiones = np.zeros(objetivo.shape[0], dtype=np.int64)
+        self._reconstruir()
+
+    def _reconstruir(self):
+        """Recalcula la suma exacta y compacta los montículos."""
+        self.total = float(self.objetivo.sum())
+        # _bajos es un montículo de mínimos del objetivo y _altos uno de máximos
+        self._bajos = [(float(valor), int(self.versiones[i]), i) for i, valor in enumerate(self.objetivo)]
+        self._altos = [(-valor, version, i) for valor, version, i in self._bajos]
+        heapq.heapify(self._bajos)
+        heapq.heapify(self._altos)
+        if self.minimizar:
+            self._peores, self._mejores = self._altos, self._bajos
+        else:
+            self._peores, self._mejores = self._bajos, self._altos
+
+    def _vigente(self, entrada):
+        return entrada[1] == self.versiones[entrada[2]]
+
+    def reemplazar(self, individuo, valor):
+        """Registra que ``individuo`` pasa a tener el valor objetivo ``valor``."""
+        valor = float(valor)
+        self.total += valor - float(self.objetivo[individuo])
+        self.objetivo[individuo] = valor
+        self.versiones[individuo] += 1
+        version = int(self.versiones[individuo])
+        heapq.heappush(self._bajos, (valor, version, individuo))
+        heapq.heappush(self._altos, (-valor, version, individuo))
+        if len(self._bajos) > 4 * self.objetivo.shape[0]:
+            self._reconstruir()
+
+    def peores(self, cantidad):
+        """Devuelve los índices de los ``cantidad`` peores individuos vigentes."""
+        indices = []
+        descartados = []
+        while len(indices) < cantidad and self._peores:
+            entrada = heapq.heappop(self._peores)
+            if self._vigente(entrada):
+                indices.append(entrada[2])
+                descartados.append(entrada)
+        # Las entradas se devuelven al montículo: el llamador decide si reemplaza
+        for entrada in descartados:
+            heapq.heappush(self._peores, entrada)
+        return indices
+
+    def _tope(self, monticulo):
+        """Descarta las entradas vencidas y devuelve el índice del tope del montículo."""
+        while not self._vigente(monticulo[0]):
+            heapq.heappop(monticulo)
+        return monticulo[0][2]
+
+    def mejor(self):
+        """Devuelve el índice del mejor individuo vigente."""
+        return self._tope(self._mejores)
+
+    def estadisticas(self):
+        """Devuelve las estadísticas actuales sin recorrer la población."""
+        minimo = float(self.objetivo[self._tope(self._bajos)])
+        maximo = float(self.objetivo[self._tope(self._altos)])
+        return Estadisticas(self.total, minimo, maximo, self.total / self.objetivo.shape[0])
+
+
+def seleccionar_padres_paso(configuracion, objetivo, cantidad, rng, poblacion):
+    """Elige los padres de un paso del modo estacionario.
+
+    El torneo sin nichos ni eliminación de duplicados sortea los candidatos
+    y compara sólo su objetivo, sin orientar ni copiar el de toda la
+    población; elige los mismos padres que ``seleccionar_padres`` con el
+    mismo generador. El resto de los casos se delega en ``seleccionar_padres``.
+    """
+    if (configuracion.seleccion != "torneo" or configuracion.nichos != "ninguno"
+            or configuracion.eliminar_duplicados):
+        return seleccionar_padres(configuracion, objetivo, cantidad, rng, poblacion)
+    candidatos = rng.integers(0, objetivo.shape[0], size=(cantidad, configuracion.tamano_torneo))
+    buscar_mejor = np.argmin if configuracion.minimizar else np.argmax
+    return candidatos[np.arange(cantidad), buscar_mejor(objetivo[candidatos], axis=1)]
+
+
+def elegir_reemplazados(configuracion, estadisticas, cantidad, rng):
+    """Elige los individuos que serán reemplazados por los nuevos hijos.
+
+    Con ``reemplazo="peor"`` se eligen los peores de la población. Con
+    ``reemplazo="torneo"`` se hace un torneo inverso por hijo y pierde el de
+    peor objetivo; los perdedores se eligen sin reposición (los
+    participantes que ya perdieron un torneo anterior se vuelven a sortear)
+    y, si hay élite, el mejor individuo nunca participa.
+
+    Returns:
+        Lista de índices distintos (tiene menos de ``cantidad`` elementos sólo
+        si la población no alcanza)
+    """
+    if configuracion.reemplazo == "peor":
+        return estadisticas.peores(cantidad)
+
+    objetivo = estadisticas.objetivo
+    tamano = objetivo.shape[0]
+    excluidos = {estadisticas.mejor()} if configuracion.elite else set()
+    cantidad = min(cantidad, tamano - len(excluidos))
+    candidatos = rng.integers(0, tamano, size=(cantidad, configuracion.tamano_torneo))
+    buscar_peor = np.argmax if configuracion.minimizar else np.argmin
+    perdedores = []
+    for torneo in candidatos:
+        repetidos = np.isin(torneo, list(excluidos)) if excluidos else None
+        while repetidos is not None and repetidos.any():
+            torneo[repetidos] = rng.integers(0, tamano, size=int(repetidos.sum()))
+            repetidos = np.isin(torneo, list(excluidos))
+        perdedor = int(torneo[buscar_peor(objetivo[torneo])])
+        perdedores.append(perdedor)
+        excluidos.add(perdedor)
+    return perdedores
+
+
+def ejecutar_estado_estacionario(configuracion=None, funcion_objetivo=objetivo_cuadratico,
+                                 instrumentacion=None, archivo_csv=None, mostrar=False, restricciones=None,
+                                 almacen=None):
+    """Ejecuta el algoritmo genético en modo de estado estacionario.
+
+    Cada ciclo equivale a una generación en cantidad de hijos creados:
+    consta de ``tamano_poblacion // hijos_por_paso`` pasos. Los hijos que no
+    cumplen las restricciones se descartan sin evaluarse.
+
+    Args:
+        configuracion: Parámetros de la corrida (por defecto ``ConfiguracionAG()``)
+        funcion_objetivo: Función vectorizada a maximizar (o a minimizar si
+            ``configuracion.minimizar``)
+        instrumentacion: ``Instrumentacion`` donde registrar tiempos y contadores
+        archivo_csv: Ruta del CSV donde guardar los datos de cada ciclo
+        mostrar: Si es True, muestra en pantalla el resumen de cada ciclo
+        restricciones: ``Restricciones`` que deben cumplir los hijos antes de evaluarse
+        almacen: ``AlmacenFitness`` persistente con los valores de corridas anteriores
+
+    Returns:
+        ``ResultadoAG`` con la población final y el historial por ciclo
+    """
+    configuracion = configuracion or ConfiguracionAG()
+    if configuracion.nichos == "hacinamiento":
+        raise ValueError("El hacinamiento determinista sólo está disponible en el modo generacional")
+    instrumentacion = instrumentacion or InstrumentacionNula()
+    rng = np.random.default_rng(configuracion.semilla)
+    evaluador = Evaluador(funcion_objetivo, configuracion.usar_cache, instrumentacion, almacen)
+    tamano = configuracion.tamano_poblacion
+    cantidad_hijos = configuracion.hijos_por_paso
+    pasos_por_ciclo = max(1, tamano // cantidad_hijos)
+    historial = []
+
+    instrumentacion.iniciar_generacion(0)
+    poblacion = generar_poblacion_inicial(tamano, configuracion.longitud_cromosoma, rng)
+    if restricciones is not None:
+        generar_poblacion_valida(restricciones, poblacion, rng)
+    hijos = np.empty((configuracion.longitud_cromosoma, cantidad_hijos), dtype=np.uint8)
+    with instrumentacion.fase("evaluacion"):
+        objetivo = evaluador.evaluar(poblacion)
+        estadisticas = EstadisticasIncrementales(objetivo, configuracion.minimizar)
+    with instrumentacion.fase("salida"):
+        _registrar_generacion(historial, poblacion, objetivo, estadisticas.estadisticas(), 0, archivo_csv, mostrar,
+                              configuracion.minimizar)
+    instrumentacion.finalizar_generacion()
+
+    for ciclo in range(1, configuracion.numero_ciclos + 1):
+        instrumentacion.iniciar_generacion(ciclo)
+        for _ in range(pasos_por_ciclo):
+            with instrumentacion.fase("seleccion"):
+                seleccion = seleccionar_padres_paso(configuracion, objetivo, cantidad_hijos, rng, poblacion)
+            with instrumentacion.fase("crossover"):
+                aplicar_crossover(poblacion, hijos, seleccion, configuracion.probabilidad_crossover, rng)
+            with instrumentacion.fase("mutacion"):
+                aplicar_mutacion(hijos, configuracion.probabilidad_mutacion, rng)
+            validos = hijos
+            if restricciones is not None:
+                with instrumentacion.fase("filtro"):
+                    validos = hijos[:, restricciones.filtrar(hijos, instrumentacion)]
+                if not validos.shape[1]:
+                    continue
+            with instrumentacion.fase("evaluacion"):
+                valores = evaluador.evaluar(validos)
+            with instrumentacion.fase("reemplazo"):
+                reemplazados = elegir_reemplazados(configuracion, estadisticas, validos.shape[1], rng)
+                for hijo, individuo in enumerate(reemplazados):
+                    poblacion[:, individuo] = validos[:, hijo]
+                    estadisticas.reemplazar(individuo, valores[hijo])
+        with instrumentacion.fase("salida"):
+            _registrar_generacion(historial, poblacion, objetivo, estadisticas.estadisticas(),
+                                  ciclo, archivo_csv, mostrar, configuracion.minimizar)
+        instrumentacion.finalizar_generacion()
+
+    fitness = transformar_fitness(objetivo, configuracion.escalado_fitness, configuracion.minimizar)
+    return ResultadoAG(poblacion, objetivo, fitness, historial[-1]["cromosoma"],
+                       historial, evaluador.evaluaciones)
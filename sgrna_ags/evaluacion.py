@@ -0,0 +1,326 @@
+"""Evaluación de la población: función objetivo, fitness y estadísticas."""
+import threading
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass
+
+import numpy as np
+
+from .operadores import convertir_binario_a_decimal
+
+
+def objetivo_cuadratico(poblacion):
+    """Función objetivo de los scripts originales, f(x) = (x/coef)^2.
+
+    ``coef`` es el valor máximo posible del cromosoma binario y el resultado
+    se redondea a 4 decimales, igual que en ``FunObj``.
+
+    Args:
+        poblacion: Matriz de cromosomas binarios
+
+    Returns:
+        Vector con el valor objetivo de cada individuo
+    """
+    coeficiente = float((1 << poblacion.shape[0]) - 1)
+    decimales = convertir_binario_a_decimal(poblacion)
+    return np.round((decimales / coeficiente) ** 2, 4)
+
+
+@dataclass(frozen=True)
+class Estadisticas:
+    """Total, mínimo, máximo y promedio de un vector de valores."""
+
+    total: float
+    minimo: float
+    maximo: float
+    promedio: float
+
+
+def calcular_estadisticas(valores):
+    """Calcula las estadísticas de un vector de valores objetivo o fitness."""
+    valores = np.asarray(valores)
+    total = float(valores.sum())
+    return Estadisticas(total, float(valores.min()), float(valores.max()), total / valores.shape[0])
+
+
+def orientar_objetivo(objetivo, minimizar=False):
+    """Devuelve el objetivo orientado para maximizar (negado si se minimiza)."""
+    objetivo = np.asarray(objetivo, dtype=np.float64)
+    return -objetivo if minimizar else objetivo
+
+
+def indice_mejor(objetivo, minimizar=False):
+    """Devuelve el índice del individuo con mejor valor objetivo."""
+    return int(np.argmin(objetivo) if minimizar else np.argmax(objetivo))
+
+
+def transformar_fitness(objetivo, escalado="crudo", minimizar=False):
+    """Transforma el valor objetivo en un fitness apto para la selección por ruleta.
+
+    Sólo se llama cuando el operador de selección lo necesita: la ruleta es
+    invariante a la escala, por lo que no hace falta dividir por el total
+    como en ``FunFit``.
+
+    Escalados disponibles:
+        - ``"crudo"``: el objetivo orientado para maximizar; la ruleta exige
+          que no sea negativo
+        - ``"ranking"``: la posición (1..N) del individuo ordenado de peor a mejor
+        - ``"sigma"``: ``max(0, 1 + (x - media) / (2 * desvío))``, o 1 para
+          todos si el desvío es cero
+
+    Args:
+        objetivo: Vector de valores de la función objetivo
+        escalado: Transformación a aplicar
+        minimizar: Si es True, un objetivo menor es mejor (por ejemplo la MFE)
+
+    Returns:
+        Vector de fitness, mayor cuanto mejor es el individuo
+    """
+    valores = orientar_objetivo(objetivo, minimizar)
+    if escalado == "ranking":
+        fitness = np.empty_like(valores)
+        fitness[np.argsort(valores, kind="stable")] = np.arange(1, valores.shape[0] + 1)
+        return fitness
+    if escalado == "sigma":
+        desvio = valores.std()
+        if desvio == 0:
+            return np.ones_like(valores)
+        return np.maximum(0.0, 1.0 + (valores - valores.mean()) / (2.0 * desvio))
+    return valores
+
+
+def evaluar_vector(funcion_objetivo, poblacion):
+    """Aplica la función objetivo y devuelve el resultado como vector ``float64``."""
+    return np.asarray(funcion_objetivo(poblacion), dtype=np.float64)
+
+
+def _armar_objetivo(cantidad, encontrados, fuentes):
+    """Arma el objetivo de un envío asincrónico con los valores conocidos y los de cada ``Future``.
+
+    Args:
+        cantidad: Individuos del envío
+        encontrados: Valor de cada individuo hallado en la caché o el almacén
+        fuentes: Tuplas ``(futuro, columna, individuos)`` con la columna del
+            resultado del futuro que corresponde a esos individuos
+    """
+    valores = [(np.asarray(futuro.result())[..., columna], individuos) for futuro, columna, individuos in fuentes]
+    forma = valores[0][0].shape if valores else np.shape(next(iter(encontrados.values())))
+    objetivo = np.empty(forma + (cantidad,), dtype=np.float64)
+    for individuo, valor in encontrados.items():
+        objetivo[..., individuo] = valor
+    for valor, individuos in valores:
+        objetivo[..., individuos] = valor[..., None]
+    return objetivo
+
+
+def claves_cromosomas(poblacion):
+    """Devuelve una clave hasheable (``bytes``) por individuo de la población."""
+    empaquetada = np.ascontiguousarray(np.packbits(poblacion, axis=0).T)
+    return [fila.tobytes() for fila in empaquetada]
+
+
+class Evaluador:
+    """Evalúa poblaciones completas con una función objetivo vectorizada.
+
+    Lleva la cuenta de las evaluaciones reales realizadas y, si se activa la
+    caché, evita reevaluar cromosomas que ya se evaluaron en la corrida. Con
+    un ``AlmacenFitness`` también se reutilizan los valores de corridas
+    anteriores y se guardan los nuevos.
+
+    Args:
+        funcion_objetivo: Función que recibe una matriz de cromosomas y
+            devuelve el vector de valores objetivo
+        usar_cache: Si es True, guarda el valor objetivo de cada cromosoma evaluado
+        instrumentacion: Instrumentación donde se registran los contadores
+        almacen: ``AlmacenFitness`` persistente a consultar antes de evaluar
+            (activa también la caché de la corrida)
+    """
+
+    def __init__(self, funcion_objetivo=objetivo_cuadratico, usar_cache=False, instrumentacion=None, almacen=None):
+        self.funcion_objetivo = funcion_objetivo
+        self.cache = {} if usar_cache or almacen is not None else None
+        self.instrumentacion = instrumentacion
+        self.almacen = almacen
+        self.evaluaciones = 0
+        self.aciertos_cache = 0
+        self.aciertos_almacen = 0
+        # Cromosomas enviados por evaluar_asincrono cuyo valor aún no está en la caché
+        self._en_vuelo = {}
+        # Envíos terminados (o cancelados) cuyos valores falta pasar a la caché
+        self._terminados = deque()
+
+    def evaluar(self, poblacion):
+        """Devuelve el vector de valores objetivo de la población.
+
+        Si la función objetivo devuelve una matriz ``(objetivos, individuos)``
+        (modo multiobjetivo), el resultado conserva esa forma.
+        """
+        if self.cache is None:
+            self._contar(poblacion.shape[1], 0)
+            return self._aplicar(poblacion)
+
+        self._recoger_terminados()
+        encontrados, pendientes = self._buscar_en_cache(poblacion)
+        valores = None
+        if pendientes:
+            primeros = [individuos[0] for individuos in pendientes.values()]
+            valores = self._aplicar(poblacion[:, primeros])
+        return self._completar(poblacion.shape, encontrados, pendientes, valores)
+
+    def evaluar_asincrono(self, ejecutor, poblacion):
+        """Envía la evaluación de la población a un ejecutor sin esperar el resultado.
+
+        Con la caché activa sólo se envían los cromosomas que no se
+        evaluaron antes ni están siendo evaluados por un envío anterior (en
+        ese caso se espera el resultado de aquel envío); los contadores se
+        actualizan al enviar. Al terminar cada envío sus valores quedan
+        anotados, y la siguiente llamada a ``evaluar``, ``evaluar_asincrono``
+        o ``resultado`` los pasa a la caché y al almacén desde el hilo que
+        consume, nunca desde los hilos del ejecutor. Así también se liberan
+        los envíos cancelados o cuyo resultado nadie recogió.
+
+        Args:
+            ejecutor: ``concurrent.futures.Executor`` donde se evalúa
+            poblacion: Matriz de cromosomas a evaluar (no debe modificarse
+                hasta que el resultado esté listo)
+
+        Returns:
+            ``Future`` que se resuelve con el vector de valores objetivo
+        """
+        if self.cache is None:
+            self._contar(poblacion.shape[1], 0)
+            return ejecutor.submit(evaluar_vector, self.funcion_objetivo, poblacion)
+
+        self._recoger_terminados()
+        encontrados, pendientes = self._buscar_en_cache(poblacion, contar=False)
+        nuevos = {clave: individuos for clave, individuos in pendientes.items() if clave not in self._en_vuelo}
+        reutilizados = sum(len(individuos) for clave, individuos in pendientes.items() if clave not in nuevos)
+        self._contar(len(nuevos), len(encontrados) + reutilizados)
+        if nuevos:
+            primeros = [individuos[0] for individuos in nuevos.values()]
+            parcial = ejecutor.submit(evaluar_vector, self.funcion_objetivo, poblacion[:, primeros])
+            claves = list(nuevos)
+            for columna, clave in enumerate(claves):
+                self._en_vuelo[clave] = (parcial, columna)
+            # Se registra antes que ``armar``: el envío queda anotado antes de resolverse el resultado
+            parcial.add_done_callback(
+                lambda listo, claves=claves: self._terminados.append((listo, poblacion.shape[0], claves)))
+        # Cada cromosoma pendiente se lee de la columna del envío que lo evalúa
+        fuentes = [self._en_vuelo[clave] + (individuos,) for clave, individuos in pendientes.items()]
+
+        resultado = Future()
+        esperando = {parcial for parcial, _, _ in fuentes}
+        cerrojo = threading.Lock()
+
+        def armar(listo):
+            with cerrojo:
+                esperando.discard(listo)
+                if esperando or resultado.done():
+                    return
+            try:
+                objetivo = _armar_objetivo(poblacion.shape[1], encontrados, fuentes)
+            except BaseException as error:
+                resultado.set_exception(error)
+            else:
+                resultado.set_result(objetivo)
+
+        if not esperando:
+            armar(None)
+        for parcial in list(esperando):
+            parcial.add_done_callback(armar)
+        return resultado
+
+    def resultado(self, futuro):
+        """Devuelve el valor objetivo de un envío de ``evaluar_asincrono``.
+
+        Debe llamarse desde el hilo que consume los resultados: es quien
+        guarda en la caché y en el almacén los valores de los envíos terminados.
+        """
+        try:
+            return futuro.result()
+        finally:
+            if self.cache is not None:
+                self._recoger_terminados()
+
+    def _recoger_terminados(self):
+        """Pasa a la caché (y al almacén) los valores de los envíos asincrónicos terminados.
+
+        Los envíos cancelados o que fallaron sólo se quitan de los cromosomas
+        en vuelo, para que un pedido posterior los vuelva a evaluar.
+        """
+        while self._terminados:
+            parcial, longitud, claves = self._terminados.popleft()
+            for clave in claves:
+                del self._en_vuelo[clave]
+            if parcial.cancelled() or parcial.exception() is not None:
+                continue
+            valores = parcial.result()
+            guardados = {clave: valores[..., columna].tolist() for columna, clave in enumerate(claves)}
+            self.cache.update(guardados)
+            if self.almacen is not None:
+                self.almacen.guardar(guardados, longitud)
+
+    def _aplicar(self, poblacion):
+        """Aplica la función objetivo a los individuos que deben evaluarse de verdad."""
+        return evaluar_vector(self.funcion_objetivo, poblacion)
+
+    def _buscar_en_cache(self, poblacion, contar=True):
+        """Busca en la caché el valor objetivo de cada individuo.
+
+        Args:
+            poblacion: Matriz de cromosomas
+            contar: Si es False, no actualiza los contadores de evaluaciones y
+                aciertos (los actualiza quien llama)
+
+        Returns:
+            Tupla ``(encontrados, pendientes)``: ``encontrados`` asocia cada
+            individuo ya evaluado con su valor y ``pendientes`` asocia la
+            clave de cada cromosoma sin evaluar con los individuos que lo tienen
+        """
+        encontrados = {}
+        pendientes = {}
+        for individuo, clave in enumerate(claves_cromosomas(poblacion)):
+            valor = self.cache.get(clave)
+            if valor is None:
+                pendientes.setdefault(clave, []).append(individuo)
+            else:
+                encontrados[individuo] = valor
+        if self.almacen is not None and pendientes:
+            guardados = self.almacen.buscar(pendientes, poblacion.shape[0])
+            for clave, valor in guardados.items():
+                self.cache[clave] = valor
+                for individuo in pendientes.pop(clave):
+                    encontrados[individuo] = valor
+            self.aciertos_almacen += len(guardados)
+            if self.instrumentacion is not None:
+                self.instrumentacion.contar("aciertos_almacen", len(guardados))
+        if contar:
+            self._contar(len(pendientes), len(encontrados))
+        return encontrados, pendientes
+
+    def _completar(self, forma_poblacion, encontrados, pendientes, valores):
+        """Guarda en la caché los valores nuevos y arma el objetivo de la población."""
+        longitud, cantidad = forma_poblacion
+        if valores is not None:
+            forma = valores.shape[:-1]
+        else:
+            forma = np.shape(next(iter(encontrados.values())))
+        objetivo = np.empty(forma + (cantidad,), dtype=np.float64)
+        for individuo, valor in encontrados.items():
+            objetivo[..., individuo] = valor
+        for columna, (clave, individuos) in enumerate(pendientes.items()):
+            valor = valores[..., columna]
+            self.cache[clave] = valor.tolist()
+            objetivo[..., individuos] = valor[..., None]
+        if self.almacen is not None and pendientes:
+            self.almacen.guardar({clave: self.cache[clave] for clave in pendientes}, longitud)
+        return objetivo
+
+    def _contar(self, evaluados, aciertos):
+        self.evaluaciones += evaluados
+        self.aciertos_cache += aciertos
+        if self.instrumentacion is not None:
+            self.instrumentacion.contar("evaluaciones", evaluados)
+            if self.cache is not None:
+                self.instrumentacion.contar("aciertos_cache", aciertos)
+                self.instrumentacion.contar("fallos_cache", evaluados)
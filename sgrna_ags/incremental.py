@@ -0,0 +1,157 @@
+"""Reevaluación incremental de objetivos descomponibles por segmentos.
+
+Cuando el objetivo de un array de guías es una combinación (suma, media o
+mínimo) de puntajes independientes de cada segmento, un hijo sólo difiere
+de sus padres en los segmentos que corta el punto de crossover o que
+contienen el gen mutado. ``EvaluadorIncremental`` guarda el puntaje parcial
+de cada segmento de cada individuo, hereda los de los padres y recalcula
+sólo los segmentos tocados, de modo que el costo de evaluar una generación
+es proporcional al cambio y no a la longitud del cromosoma.
+"""
+import numpy as np
+
+from .secuencias import agregar_puntajes, dividir_en_segmentos, verificar_agregacion
+
+
+class EvaluadorIncremental:
+    """Evalúa poblaciones reutilizando los puntajes parciales por segmento.
+
+    Uso dentro del ciclo generacional::
+
+        objetivo = incremental.evaluar(poblacion)
+        ...  # crossover y mutación
+        incremental.preparar(seleccion, puntos, mutados, mejores)
+        objetivo = incremental.completar(pob_siguiente)
+
+    Args:
+        funcion_segmento: Función que recibe una matriz de bits
+            ``(genes_segmento, segmentos)`` y devuelve el puntaje de cada columna
+        genes_segmento: Genes (bits) de cada segmento del cromosoma
+        agregacion: Cómo combinar los segmentos de un individuo ("suma",
+            "media" o "minimo")
+        instrumentacion: Instrumentación donde se registran los contadores
+
+    Attributes:
+        parciales: Matriz ``(segmentos, individuos)`` con el puntaje de cada
+            segmento de la última población evaluada
+        evaluaciones: Individuos a los que se les recalculó al menos un segmento
+        segmentos_evaluados: Segmentos recalculados en toda la corrida
+        segmentos_reutilizados: Segmentos heredados sin recalcular
+    """
+
+    def __init__(self, funcion_segmento, genes_segmento, agregacion="suma", instrumentacion=None):
+        verificar_agregacion(agregacion)
+        self.funcion_segmento = funcion_segmento
+        self.genes_segmento = genes_segmento
+        self.agregacion = agregacion
+        self.instrumentacion = instrumentacion
+        self.parciales = None
+        self.evaluaciones = 0
+        self.segmentos_evaluados = 0
+        self.segmentos_reutilizados = 0
+        self._siguientes = None
+        self._sucios = None
+
+    def evaluar(self, poblacion):
+        """Evalúa todos los segmentos de la población y devuelve su objetivo."""
+        bloques = self._bloques(poblacion)
+        segmentos, _, individuos = bloques.shape
+        self._siguientes = np.empty((segmentos, individuos))
+        self._sucios = np.ones((segmentos, individuos), dtype=bool)
+        return self.completar(poblacion)
+
+    def preparar(self, seleccion, puntos, mutados=None, mejores=()):
+        """Hereda los puntajes parciales de los padres y marca los segmentos a recalcular.
+
+        Sigue la disposición de ``aplicar_crossover``: los hijos de la pareja
+        ``p`` ocupan las columnas ``inicio + 2p`` y ``inicio + 2p + 1``, con
+        ``inicio = len(mejores)``.
+
+        Args:
+            seleccion: Vector de índices de los padres seleccionados
+            puntos: Punto de cruce de cada pareja (devuelto por ``aplicar_crossover``)
+            mutados: Tupla ``(individuos, genes)`` devuelta por ``aplicar_mutacion``
+            mejores: Índices de los individuos de élite copiados al principio
+        """
+        seleccion = np.asarray(seleccion)
+        segmentos, _ = self.parciales.shape
+        mejores = np.asarray(mejores, dtype=np.intp)
+        inicio = mejores.shape[0]
+        siguientes = np.empty((segmentos, inicio + seleccion.shape[0]))
+        sucios = np.zeros(siguientes.shape, dtype=bool)
+        siguientes[:, :inicio] = self.parciales[:, mejores]
+
+        parejas = puntos.shape[0]
+        padre1 = self.parciales[:, seleccion[0:2 * parejas:2]]
+        padre2 = self.parciales[:, seleccion[1:2 * parejas:2]]
+        comienzos = np.arange(segmentos)[:, None] * self.genes_segmento
+        # Segmentos que quedan enteros antes del corte, y los que el corte parte en dos
+        del_primero = comienzos + self.genes_segmento <= puntos[None, :]
+        cortados = (comienzos < puntos[None, :]) & ~del_primero
+        fin = inicio + 2 * parejas
+        siguientes[:, inicio:fin:2] = np.where(del_primero, padre1, padre2)
+        siguientes[:, inicio + 1:fin:2] = np.where(del_primero, padre2, padre1)
+        sucios[:, inicio:fin:2] = cortados
+        sucios[:, inicio + 1:fin:2] = cortados
+        if seleccion.shape[0] % 2:
+            siguientes[:, fin] = self.parciales[:, seleccion[-1]]
+
+        if mutados is not None:
+            individuos, genes = mutados
+            sucios[genes // self.genes_segmento, individuos] = True
+        self._siguientes = siguientes
+        self._sucios = sucios
+
+    def marcar_cambios(self, antes, despues, inicio=0):
+        """Marca para recalcular los segmentos modificados después de ``preparar`` (por ejemplo, al reparar).
+
+        Args:
+            antes: Copia de los hijos antes de modificarlos
+            despues: Hijos modificados
+            inicio: Columna de la población a la que corresponde el primer hijo
+        """
+        cambios = (self._bloques(antes) != self._bloques(despues)).any(axis=1)
+        self._sucios[:, inicio:inicio + cambios.shape[1]] |= cambios
+
+    def restaurar(self, columnas, padres):
+        """Vuelve a los puntajes de los padres en las columnas reemplazadas por una copia de ellos."""
+        self._siguientes[:, columnas] = self.parciales[:, padres]
+        self._sucios[:, columnas] = False
+
+    def completar(self, poblacion):
+        """Recalcula los segmentos marcados y devuelve el objetivo de la población.
+
+        Args:
+            poblacion: Matriz de cromosomas a la que corresponden los
+                puntajes preparados
+
+        Returns:
+            Vector con el valor objetivo de cada individuo
+        """
+        bloques = self._bloques(poblacion)
+        segmentos, individuos = np.nonzero(self._sucios)
+        if segmentos.size:
+            bits = bloques[segmentos, :, individuos].T
+            self._siguientes[segmentos, individuos] = np.ravel(self.funcion_segmento(bits))
+        self._contar(int(self._sucios.any(axis=0).sum()), int(segmentos.size),
+                     int(self._sucios.size - segmentos.size))
+        self.parciales = self._siguientes
+        self._siguientes = self._sucios = None
+        return self.agregar(self.parciales)
+
+    def agregar(self, parciales):
+        """Combina los puntajes parciales de cada individuo según ``agregacion``."""
+        return agregar_puntajes(parciales, self.agregacion)
+
+    def _bloques(self, poblacion):
+        """Reordena la población como ``(segmentos, genes_segmento, individuos)``."""
+        return dividir_en_segmentos(poblacion, self.genes_segmento, "genes")
+
+    def _contar(self, evaluados, segmentos_evaluados, segmentos_reutilizados):
+        self.evaluaciones += evaluados
+        self.segmentos_evaluados += segmentos_evaluados
+        self.segmentos_reutilizados += segmentos_reutilizados
+        if self.instrumentacion is not None:
+            self.instrumentacion.contar("evaluaciones", evaluados)
+            self.instrumentacion.contar("segmentos_evaluados", segmentos_evaluados)
+            self.instrumentacion.contar("segmentos_reutilizados", segmentos_reutilizados)
@@ -0,0 +1,152 @@
+"""Instrumentación opcional del ciclo generacional.
+
+Registra por generación el tiempo de pared de cada fase (selección,
+crossover, mutación, filtro de restricciones, evaluación, reemplazo y
+salida), los contadores de evaluaciones (reales y ahorradas), de la caché
+de fitness, de hijos rechazados y de segmentos reevaluados. Sólo usa
+relojes monótonos y contadores enteros, sin trabajo por individuo, por lo
+que puede quedar activada en corridas de producción.
+
+Con ``memoria=True`` registra además la memoria asignada en cada
+generación mediante ``tracemalloc``, que también ve los buffers de los
+arreglos de NumPy. El rastreo encarece cada asignación, por lo que es
+opcional.
+"""
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+FASES = ("seleccion", "crossover", "mutacion", "filtro", "evaluacion", "reemplazo", "salida")
+CONTADORES = ("evaluaciones", "aciertos_cache", "fallos_cache", "rechazados", "evaluaciones_ahorradas",
+              "segmentos_evaluados", "segmentos_reutilizados", "aciertos_almacen")
+
+
+def escribir_registros_csv(registros, ruta):
+    """Guarda una lista de diccionarios en un CSV separado por ';' con la unión de sus claves."""
+    columnas = []
+    for registro in registros:
+        for clave in registro:
+            if clave not in columnas:
+                columnas.append(clave)
+    with open(ruta, "w", encoding="utf-8") as archivo:
+        archivo.write(";".join(columnas) + "\n")
+        for registro in registros:
+            archivo.write(";".join(str(registro.get(clave, "")) for clave in columnas) + "\n")
+
+
+class Instrumentacion:
+    """Acumula tiempos y contadores por generación.
+
+    Uso típico dentro del ciclo::
+
+        instrumentacion.iniciar_generacion(generacion)
+        with instrumentacion.fase("seleccion"):
+            ...
+        instrumentacion.finalizar_generacion()
+
+    Args:
+        memoria: Si es True, agrega a cada generación ``memoria_neta`` (bytes
+            que quedaron asignados al terminarla) y ``memoria_pico`` (máximo
+            de bytes asignados durante ella por encima del inicio), medidos
+            con ``tracemalloc``. El rastreo se inicia si no estaba activo y
+            se detiene con ``cerrar``.
+    """
+
+    def __init__(self, memoria=False):
+        self.registros = []
+        self.memoria = memoria
+        self._actual = None
+        self._memoria_inicial = 0
+        self._inicio_generacion = 0
+        self._detener_rastreo = memoria and not tracemalloc.is_tracing()
+        if self._detener_rastreo:
+            tracemalloc.start()
+
+    def iniciar_generacion(self, generacion):
+        """Abre el registro de una nueva generación."""
+        self._actual = {"generacion": generacion}
+        for fase in FASES:
+            self._actual[f"t_{fase}"] = 0.0
+        for contador in CONTADORES:
+            self._actual[contador] = 0
+        if self.memoria:
+            self._memoria_inicial = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        self._inicio_generacion = time.perf_counter_ns()
+
+    @contextmanager
+    def fase(self, nombre):
+        """Mide el tiempo de pared (en segundos) de una fase de la generación."""
+        inicio = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            clave = f"t_{nombre}"
+            self._actual[clave] = self._actual.get(clave, 0.0) + (time.perf_counter_ns() - inicio) / 1e9
+
+    def contar(self, nombre, cantidad=1):
+        """Suma ``cantidad`` al contador ``nombre`` de la generación actual."""
+        if self._actual is not None:
+            self._actual[nombre] = self._actual.get(nombre, 0) + cantidad
+
+    def finalizar_generacion(self):
+        """Cierra el registro de la generación actual y lo agrega al historial."""
+        registro = self._actual
+        registro["t_total"] = (time.perf_counter_ns() - self._inicio_generacion) / 1e9
+        consultas = registro["aciertos_cache"] + registro["fallos_cache"]
+        registro["tasa_aciertos_cache"] = registro["aciertos_cache"] / consultas if consultas else 0.0
+        if self.memoria:
+            actual, pico = tracemalloc.get_traced_memory()
+            registro["memoria_neta"] = actual - self._memoria_inicial
+            registro["memoria_pico"] = pico - self._memoria_inicial
+        self.registros.append(registro)
+        self._actual = None
+        return registro
+
+    def resumen(self):
+        """Devuelve los tiempos y contadores acumulados de toda la corrida."""
+        resumen = {"generaciones": len(self.registros)}
+        for registro in self.registros:
+            for clave, valor in registro.items():
+                if clave == "memoria_pico":
+                    resumen[clave] = max(resumen.get(clave, 0), valor)
+                elif clave not in ("generacion", "tasa_aciertos_cache"):
+                    resumen[clave] = resumen.get(clave, 0) + valor
+        consultas = resumen.get("aciertos_cache", 0) + resumen.get("fallos_cache", 0)
+        resumen["tasa_aciertos_cache"] = resumen.get("aciertos_cache", 0) / consultas if consultas else 0.0
+        return resumen
+
+    def exportar_csv(self, ruta):
+        """Guarda los registros por generación en un archivo CSV separado por ';'."""
+        escribir_registros_csv(self.registros, ruta)
+
+    def cerrar(self):
+        """Detiene ``tracemalloc`` si lo inició esta instrumentación."""
+        if self._detener_rastreo:
+            tracemalloc.stop()
+            self._detener_rastreo = False
+
+
+class InstrumentacionNula:
+    """Instrumentación que no registra nada; se usa cuando no se pide medir."""
+
+    registros = ()
+
+    def iniciar_generacion(self, generacion):
+        pass
+
+    @contextmanager
+    def fase(self, nombre):
+        yield
+
+    def contar(self, nombre, cantidad=1):
+        pass
+
+    def finalizar_generacion(self):
+        return None
+
+    def resumen(self):
+        return {}
+
+    def cerrar(self):
+        pass
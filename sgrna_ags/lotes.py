@@ -0,0 +1,347 @@
+"""Diseño de arrays de guías para muchos loci en un solo proceso.
+
+Lee las regiones blanco de un FASTA o un CSV y ejecuta una optimización
+por locus. Cada cromosoma es un array de ``guias`` segmentos (espaciador
+más PAM) y su objetivo premia que cada guía coincida con un sitio del locus
+(en cualquiera de las dos hebras, con la PAM presente) y penaliza las
+semillas que aparecen muchas veces en la referencia.
+
+El índice de la referencia y las tablas de puntaje se cargan una sola vez y
+se comparten con un único grupo de procesos, que se crea al comenzar el
+lote; los resultados se escriben a medida que termina cada locus.
+"""
+import csv
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import replace
+
+import numpy as np
+
+from .algoritmo import ejecutar_algoritmo_genetico
+from .configuracion import ConfiguracionAG
+from .evaluacion import indice_mejor
+from .secuencias import (
+    CODIGO_INVALIDO,
+    cromosoma_a_secuencia,
+    decodificar_nucleotidos,
+    dividir_en_segmentos,
+    secuencia_a_codigos,
+    tabla_patron,
+)
+
+EXTENSIONES_FASTA = (".fa", ".fasta", ".fna", ".fas")
+COMPLEMENTOS = str.maketrans("ACGTU", "TGCAA")
+
+# Columnas del CSV de resultados de ``disenar_lote``
+COLUMNAS_LOTE = ("nombre", "estado", "mensaje", "array", "guias", "objetivo", "evaluaciones", "segundos")
+
+# K-meros acumulados antes de sumarlos a los conteos del índice con un único ``bincount``
+KMEROS_POR_CONTEO = 1 << 24
+
+# Índice y puntaje compartidos por todos los loci de un proceso (ver ``_iniciar_trabajador``)
+_contexto = {}
+
+
+def leer_fasta(ruta):
+    """Genera ``(nombre, secuencia)`` por cada registro de un FASTA, sin cargar el archivo entero."""
+    nombre, partes = None, []
+    with open(ruta, encoding="utf-8") as archivo:
+        for linea in archivo:
+            linea = linea.strip()
+            if linea.startswith(">"):
+                if nombre is not None:
+                    yield nombre, "".join(partes)
+                encabezado = linea[1:].split()
+                nombre = encabezado[0] if encabezado else ""
+                partes = []
+            elif linea and nombre is not None:
+                partes.append(linea.upper())
+    if nombre is not None:
+        yield nombre, "".join(partes)
+
+
+def leer_csv(ruta):
+    """Genera ``(nombre, secuencia)`` por cada fila de un CSV con columnas ``nombre`` y ``secuencia``.
+
+    El separador (';', ',' o tabulación) se detecta a partir del encabezado.
+    """
+    with open(ruta, encoding="utf-8", newline="") as archivo:
+        dialecto = csv.Sniffer().sniff(archivo.readline(), delimiters=";,\t")
+        archivo.seek(0)
+        for fila in csv.DictReader(archivo, dialect=dialecto):
+            yield fila["nombre"], fila["secuencia"].strip().upper()
+
+
+def leer_objetivos(ruta):
+    """Lee las regiones blanco de un FASTA o un CSV según la extensión del archivo."""
+    if ruta.lower().endswith(EXTENSIONES_FASTA):
+        return leer_fasta(ruta)
+    return leer_csv(ruta)
+
+
+def complemento_inverso(secuencia):
+    """Devuelve el complemento inverso de una secuencia de nucleótidos."""
+    return secuencia.upper().translate(COMPLEMENTOS)[::-1]
+
+
+def _indices_kmeros(codigos, k):
+    """Devuelve el índice (base 4) de cada k-mero de un vector de códigos."""
+    posiciones = codigos.shape[0] - k + 1
+    if posiciones <= 0:
+        return np.empty(0, dtype=np.int64)
+    indices = np.zeros(posiciones, dtype=np.int64)
+    for desplazamiento in range(k):
+        indices = indices * 4 + codigos[desplazamiento:desplazamiento + posiciones]
+    return indices
+
+
+def _kmeros_validos(codigos, k):
+    """Devuelve el índice de cada k-mero que no contiene ``CODIGO_INVALIDO``."""
+    invalidos = codigos == CODIGO_INVALIDO
+    indices = _indices_kmeros(np.where(invalidos, 0, codigos).astype(np.int64), k)
+    if not invalidos.any():
+        return indices
+    # Inválidos dentro de cada ventana de k posiciones, a partir de la suma acumulada
+    acumulados = np.concatenate(([0], np.cumsum(invalidos)))
+    return indices[acumulados[k:] == acumulados[:-k]]
+
+
+def _codigos_por_hebra(secuencia):
+    """Devuelve los códigos de la secuencia y de su complemento inverso (los inválidos se conservan)."""
+    codigos = secuencia_a_codigos(secuencia, estricta=False)
+    complemento = np.where(codigos == CODIGO_INVALIDO, CODIGO_INVALIDO, 3 - codigos).astype(np.uint8)
+    return codigos, complemento[::-1]
+
+
+class IndiceReferencia:
+    """Conteo de todos los k-meros de una referencia, en ambas hebras.
+
+    Args:
+        secuencias: Iterable de secuencias de la referencia (se omiten los
+            tramos con caracteres distintos de ACGT)
+        k: Largo de los k-meros (semillas) contados
+    """
+
+    def __init__(self, secuencias, k=10):
+        self.k = k
+        self.conteos = np.zeros(4 ** k, dtype=np.int32)
+        # Los k-meros de muchos registros se acumulan y se cuentan juntos: un
+        # ``bincount`` de 4**k casillas por registro domina el costo con
+        # referencias de muchas secuencias cortas
+        pendientes, acumulados = [], 0
+        for secuencia in secuencias:
+            for codigos in _codigos_por_hebra(secuencia):
+                pendientes.append(_kmeros_validos(codigos, k))
+                acumulados += pendientes[-1].shape[0]
+            if acumulados >= KMEROS_POR_CONTEO:
+                self._contar(pendientes)
+                pendientes, acumulados = [], 0
+        self._contar(pendientes)
+
+    def _contar(self, pendientes):
+        if pendientes:
+            indices = np.concatenate(pendientes)
+            self.conteos += np.bincount(indices, minlength=self.conteos.shape[0]).astype(np.int32)
+
+    @classmethod
+    def desde_fasta(cls, ruta, k=10):
+        """Construye el índice a partir de todos los registros de un FASTA."""
+        return cls((secuencia for _, secuencia in leer_fasta(ruta)), k)
+
+    def ocurrencias(self, semillas):
+        """Devuelve cuántas veces aparece cada semilla (matriz de códigos ``(k, ...)``)."""
+        indices = np.zeros(semillas.shape[1:], dtype=np.int64)
+        for fila in semillas[-self.k:]:
+            indices = indices * 4 + fila
+        return self.conteos[indices]
+
+
+class ObjetivoLocus:
+    """Función objetivo de un array de guías para una región blanco.
+
+    El valor de cada guía es la fracción de nucleótidos que coinciden con el
+    sitio más parecido del locus, menos ``peso_fuera`` por el logaritmo de
+    las apariciones extra de su semilla en la referencia, más
+    ``peso_puntaje`` por su puntaje en el blanco. El del array es el
+    promedio de sus guías.
+
+    Args:
+        secuencia: Región blanco
+        longitud_espaciador: Nucleótidos de cada espaciador
+        pam: Patrón IUPAC de la PAM
+        indice: ``IndiceReferencia`` para penalizar semillas repetidas (o None)
+        puntaje: ``PuntajeEnBlanco`` por segmento (o None)
+        peso_fuera: Peso de la penalización por semillas repetidas
+        peso_puntaje: Peso del puntaje en el blanco
+    """
+
+    def __init__(self, secuencia, longitud_espaciador=20, pam="NGG", indice=None, puntaje=None,
+                 peso_fuera=0.1, peso_puntaje=0.1):
+        self.longitud_espaciador = longitud_espaciador
+        self.longitud_segmento = longitud_espaciador + len(pam)
+        self.indice = indice
+        self.puntaje = puntaje
+        self.peso_fuera = peso_fuera
+        self.peso_puntaje = peso_puntaje
+        self.sitios = self._buscar_sitios(secuencia, tabla_patron(pam))
+
+    def _buscar_sitios(self, secuencia, tabla_pam):
+        """Devuelve la matriz ``(sitios, longitud_segmento)`` de sitios con PAM en ambas hebras."""
+        sitios = []
+        for codigos in _codigos_por_hebra(secuencia):
+            codigos = codigos[codigos != CODIGO_INVALIDO]
+            cantidad = codigos.shape[0] - self.longitud_segmento + 1
+            if cantidad <= 0:
+                continue
+            ventanas = np.lib.stride_tricks.sliding_window_view(codigos, self.longitud_segmento)
+            pam = ventanas[:, self.longitud_espaciador:]
+            con_pam = tabla_pam[np.arange(pam.shape[1]), pam].all(axis=1)
+            sitios.append(ventanas[con_pam])
+        if not sitios or not sum(bloque.shape[0] for bloque in sitios):
+            raise ValueError("La región blanco no tiene sitios con la PAM indicada")
+        return np.concatenate(sitios)
+
+    def __call__(self, poblacion):
+        segmentos = dividir_en_segmentos(decodificar_nucleotidos(poblacion), self.longitud_segmento)
+        coincidencia = np.zeros((segmentos.shape[0], poblacion.shape[1]))
+        for inicio in range(0, self.sitios.shape[0], 64):
+            bloque = self.sitios[inicio:inicio + 64]
+            iguales = (segmentos[:, None] == bloque[None, :, :, None]).sum(axis=2)
+            np.maximum(coincidencia, iguales.max(axis=1) / self.longitud_segmento, out=coincidencia)
+        valores = coincidencia
+        if self.indice is not None:
+            semillas = np.moveaxis(segmentos[:, :self.longitud_espaciador], 1, 0).astype(np.int64)
+            extra = np.maximum(self.indice.ocurrencias(semillas) - 1, 0)
+            valores = valores - self.peso_fuera * np.log1p(extra)
+        if self.puntaje is not None:
+            valores = valores + self.peso_puntaje * self.puntaje.puntajes_por_guia(poblacion)
+        return valores.mean(axis=0)
+
+
+def _iniciar_trabajador(indice, puntaje):
+    """Deja el índice y el puntaje compartidos disponibles para los loci de este proceso."""
+    _contexto["indice"] = indice
+    _contexto["puntaje"] = puntaje
+
+
+def disenar_locus(nombre, secuencia, configuracion, longitud_espaciador=20, pam="NGG", restricciones=None):
+    """Optimiza el array de guías de un locus con el índice y el puntaje del proceso.
+
+    Returns:
+        Diccionario con el nombre del locus, el estado ("ok"), el mejor array
+        y sus guías, su valor objetivo, las evaluaciones y el tiempo empleado
+
+    Raises:
+        ValueError: Si el locus no tiene sitios con la PAM o la configuración no es válida
+    """
+    inicio = time.perf_counter()
+    objetivo = ObjetivoLocus(secuencia, longitud_espaciador, pam, _contexto.get("indice"), _contexto.get("puntaje"))
+    resultado = ejecutar_algoritmo_genetico(configuracion, objetivo, restricciones=restricciones)
+    fila = resumir_resultado(nombre, resultado, objetivo.longitud_segmento, configuracion.minimizar)
+    fila["estado"] = "ok"
+    fila["segundos"] = round(time.perf_counter() - inicio, 4)
+    return fila
+
+
+def fila_de_error(nombre, error):
+    """Devuelve la fila del CSV de resultados de un locus que no se pudo diseñar."""
+    return {"nombre": nombre, "estado": "error", "mensaje": str(error)}
+
+
+def resumir_resultado(nombre, resultado, longitud_segmento, minimizar=False):
+    """Devuelve el mejor array de un ``ResultadoAG`` como secuencia y como lista de guías separadas por comas."""
+    mejor = indice_mejor(resultado.objetivo, minimizar)
+    array = cromosoma_a_secuencia(resultado.poblacion, mejor)
+    return {
+        "nombre": nombre,
+        "array": array,
+        "guias": ",".join(array[inicio:inicio + longitud_segmento] for inicio in range(0, len(array), longitud_segmento)),
+        "objetivo": float(resultado.objetivo[mejor]),
+        "evaluaciones": resultado.evaluaciones,
+    }
+
+
+def disenar_lote(objetivos, ruta_salida, configuracion=None, guias=3, longitud_espaciador=20, pam="NGG",
+                 indice=None, puntaje=None, restricciones=None, trabajadores=1, en_vuelo=None):
+    """Diseña un array de guías por cada región blanco y escribe cada resultado al terminar.
+
+    Un locus que no se puede diseñar (por ejemplo, sin sitios con la PAM) no
+    detiene el lote: se escribe su fila con ``estado="error"`` y el mensaje
+    de la excepción, y se sigue con el siguiente.
+
+    Args:
+        objetivos: Iterable de ``(nombre, secuencia)``, por ejemplo ``leer_objetivos(ruta)``;
+            se consume a medida que se liberan trabajadores
+        ruta_salida: CSV separado por ';' donde se agrega una fila por locus
+        configuracion: Parámetros del AG (la longitud del cromosoma se ajusta
+            a ``guias`` segmentos; si tiene semilla, cada locus usa ``semilla + i``)
+        guias: Guías de cada array
+        longitud_espaciador: Nucleótidos de cada espaciador
+        pam: Patrón IUPAC de la PAM
+        indice: ``IndiceReferencia`` compartido por todos los loci
+        puntaje: ``PuntajeEnBlanco`` compartido por todos los loci
+        restricciones: ``Restricciones`` que deben cumplir los hijos
+        trabajadores: Procesos del grupo (1 para ejecutar en este proceso)
+        en_vuelo: Máximo de loci enviados sin terminar (por defecto, el doble de trabajadores)
+
+    Returns:
+        Cantidad de loci procesados, incluidos los que terminaron con error
+    """
+    configuracion = configuracion or ConfiguracionAG()
+    longitud = 2 * guias * (longitud_espaciador + len(pam))
+    en_vuelo = en_vuelo or 2 * trabajadores
+    procesados = 0
+
+    def configuracion_locus(numero):
+        semilla = None if configuracion.semilla is None else configuracion.semilla + numero
+        return replace(configuracion, longitud_cromosoma=longitud, semilla=semilla)
+
+    nuevo = not os.path.exists(ruta_salida) or os.path.getsize(ruta_salida) == 0
+    with open(ruta_salida, "a", encoding="utf-8", newline="") as archivo:
+        escritor = csv.DictWriter(archivo, fieldnames=COLUMNAS_LOTE, delimiter=";")
+        if nuevo:
+            escritor.writeheader()
+            archivo.flush()
+        if trabajadores == 1:
+            _iniciar_trabajador(indice, puntaje)
+            for numero, (nombre, secuencia) in enumerate(objetivos):
+                try:
+                    fila = disenar_locus(nombre, secuencia, configuracion_locus(numero), longitud_espaciador, pam,
+                                         restricciones)
+                except ValueError as error:
+                    fila = fila_de_error(nombre, error)
+                escritor.writerow(fila)
+                archivo.flush()
+                procesados += 1
+            return procesados
+
+        with ProcessPoolExecutor(max_workers=trabajadores, initializer=_iniciar_trabajador,
+                                 initargs=(indice, puntaje)) as ejecutor:
+            # Futuro de cada locus enviado y su nombre, para informar los errores
+            pendientes = {}
+            entradas = enumerate(objetivos)
+            agotado = False
+            while True:
+                while not agotado and len(pendientes) < en_vuelo:
+                    siguiente = next(entradas, None)
+                    if siguiente is None:
+                        agotado = True
+                        break
+                    numero, (nombre, secuencia) = siguiente
+                    futuro = ejecutor.submit(disenar_locus, nombre, secuencia, configuracion_locus(numero),
+                                             longitud_espaciador, pam, restricciones)
+                    pendientes[futuro] = nombre
+                if not pendientes:
+                    break
+                listos, _ = wait(pendientes, return_when=FIRST_COMPLETED)
+                for futuro in listos:
+                    nombre = pendientes.pop(futuro)
+                    try:
+                        fila = futuro.result()
+                    except ValueError as error:
+                        fila = fila_de_error(nombre, error)
+                    escritor.writerow(fila)
+                    procesados += 1
+                archivo.flush()
+    return procesados
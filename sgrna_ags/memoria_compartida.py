@@ -0,0 +1,149 @@
+"""Evaluación en procesos sobre poblaciones en memoria compartida.
+
+Con un ``ProcessPoolExecutor`` común, cada evaluación serializa con pickle
+la porción de la población que recibe cada proceso y el vector de valores
+que devuelve, y en poblaciones grandes ese costo se come buena parte de la
+ganancia del paralelismo. ``EvaluadorCompartido`` aloja en bloques de
+``multiprocessing.shared_memory``:
+
+- el par ``poblacion``/``pob_siguiente`` del ciclo generacional (el doble
+  buffer que se intercambia en cada generación) y un tercer buffer de
+  entrada para poblaciones que no viven en memoria compartida;
+- el vector (o la matriz, con varios objetivos) de valores objetivo.
+
+Los procesos se adjuntan a los bloques una sola vez, al iniciarse, y cada
+evaluación sólo les envía ``(buffer, inicio, cantidad)``: leen las columnas
+de la población sin copiarlas y escriben su resultado directamente en el
+bloque de salida.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .evaluacion import Evaluador, evaluar_vector
+
+# Buffers del bloque de cromosomas: los dos de la población y el de entrada
+BUFFERS = 3
+_ENTRADA = 2
+
+# Vistas de los bloques compartidos dentro de cada proceso trabajador
+_contexto = {}
+
+
+def _adjuntar(nombre_cromosomas, nombre_objetivo, longitud, tamano, objetivos, funcion_objetivo):
+    """Adjunta el proceso trabajador a los bloques compartidos."""
+    bloque_cromosomas = shared_memory.SharedMemory(name=nombre_cromosomas)
+    bloque_objetivo = shared_memory.SharedMemory(name=nombre_objetivo)
+    _contexto["bloques"] = (bloque_cromosomas, bloque_objetivo)
+    _contexto["cromosomas"] = np.ndarray((BUFFERS, longitud, tamano), dtype=np.uint8, buffer=bloque_cromosomas.buf)
+    _contexto["objetivo"] = np.ndarray((objetivos, tamano), dtype=np.float64, buffer=bloque_objetivo.buf)
+    _contexto["funcion_objetivo"] = funcion_objetivo
+
+
+def _evaluar_columnas(buffer, inicio, cantidad):
+    """Evalúa en el proceso trabajador un rango de columnas de un buffer compartido."""
+    poblacion = _contexto["cromosomas"][buffer, :, inicio:inicio + cantidad]
+    valores = evaluar_vector(_contexto["funcion_objetivo"], poblacion)
+    _contexto["objetivo"][:, inicio:inicio + cantidad] = valores.reshape(-1, cantidad)
+
+
+class EvaluadorCompartido(Evaluador):
+    """``Evaluador`` que reparte cada evaluación entre procesos sin serializar la población.
+
+    Se pasa como ``compartido=`` a ``ejecutar_algoritmo_genetico`` o
+    ``iterar_algoritmo_genetico``, que alojan entonces ``poblacion`` y
+    ``pob_siguiente`` en sus buffers. Los bloques se liberan con ``cerrar``
+    (o al salir de un bloque ``with``)::
+
+        with EvaluadorCompartido(funcion_objetivo, configuracion) as compartido:
+            resultado = ejecutar_algoritmo_genetico(configuracion, compartido=compartido)
+
+    Args:
+        funcion_objetivo: Función vectorizada a evaluar; debe poder
+            serializarse con pickle (se envía una vez a cada proceso)
+        configuracion: ``ConfiguracionAG`` de la corrida; se usan la longitud
+            del cromosoma, el tamaño de la población, la caché y ``trabajadores``
+        objetivos: Valores que devuelve la función por individuo
+        instrumentacion: Instrumentación donde se registran los contadores
+        almacen: ``AlmacenFitness`` persistente a consultar antes de evaluar
+        individuos_por_tarea: Columnas de cada tarea (por defecto, una tarea por proceso)
+    """
+
+    def __init__(self, funcion_objetivo, configuracion, objetivos=1, instrumentacion=None, almacen=None,
+                 individuos_por_tarea=None):
+        super().__init__(funcion_objetivo, configuracion.usar_cache, instrumentacion, almacen)
+        self.longitud = configuracion.longitud_cromosoma
+        self.tamano = configuracion.tamano_poblacion
+        self.objetivos = objetivos
+        self.trabajadores = configuracion.trabajadores
+        self.individuos_por_tarea = individuos_por_tarea
+        self._bloque_cromosomas = shared_memory.SharedMemory(create=True, size=BUFFERS * self.longitud * self.tamano)
+        self._bloque_objetivo = shared_memory.SharedMemory(create=True, size=8 * objetivos * self.tamano)
+        self.cromosomas = np.ndarray((BUFFERS, self.longitud, self.tamano), dtype=np.uint8,
+                                     buffer=self._bloque_cromosomas.buf)
+        self.objetivo = np.ndarray((objetivos, self.tamano), dtype=np.float64, buffer=self._bloque_objetivo.buf)
+        self._cerrado = False
+        self._ejecutor = ProcessPoolExecutor(
+            max_workers=self.trabajadores, initializer=_adjuntar,
+            initargs=(self._bloque_cromosomas.name, self._bloque_objetivo.name, self.longitud, self.tamano,
+                      objetivos, funcion_objetivo))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
+
+    def alojar(self, poblacion):
+        """Copia la población inicial al primer buffer compartido.
+
+        Returns:
+            Tupla ``(poblacion, pob_siguiente)`` con las vistas de los dos
+            buffers de la población
+        """
+        if poblacion.shape != (self.longitud, self.tamano):
+            raise ValueError(f"La población {poblacion.shape} no coincide con los buffers compartidos "
+                             f"({self.longitud}, {self.tamano})")
+        self.cromosomas[0] = poblacion
+        return self.cromosomas[0], self.cromosomas[1]
+
+    def cerrar(self):
+        """Detiene los procesos y libera los bloques de memoria compartida (una sola vez)."""
+        if self._cerrado:
+            return
+        self._cerrado = True
+        self._ejecutor.shutdown()
+        del self.cromosomas, self.objetivo
+        for bloque in (self._bloque_cromosomas, self._bloque_objetivo):
+            bloque.close()
+            bloque.unlink()
+
+    def _aplicar(self, poblacion):
+        cantidad = poblacion.shape[1]
+        if cantidad > self.tamano:
+            raise ValueError(f"No se pueden evaluar {cantidad} individuos en buffers de {self.tamano}")
+        ubicacion = self._ubicar(poblacion)
+        if ubicacion is None:
+            # La población no está en memoria compartida: se copia al buffer de entrada
+            self.cromosomas[_ENTRADA, :, :cantidad] = poblacion
+            ubicacion = (_ENTRADA, 0)
+        buffer, inicio = ubicacion
+        por_tarea = self.individuos_por_tarea or max(1, -(-cantidad // self.trabajadores))
+        tareas = [self._ejecutor.submit(_evaluar_columnas, buffer, desde, min(por_tarea, inicio + cantidad - desde))
+                  for desde in range(inicio, inicio + cantidad, por_tarea)]
+        for tarea in tareas:
+            tarea.result()
+        valores = self.objetivo[:, inicio:inicio + cantidad].copy()
+        return valores[0] if self.objetivos == 1 else valores
+
+    def _ubicar(self, poblacion):
+        """Devuelve ``(buffer, inicio)`` si la población es un rango de columnas de un buffer compartido."""
+        if (poblacion.dtype != np.uint8 or poblacion.shape[0] != self.longitud
+                or poblacion.strides != self.cromosomas.strides[1:]):
+            return None
+        desplazamiento = poblacion.__array_interface__["data"][0] - self.cromosomas.__array_interface__["data"][0]
+        buffer, inicio = divmod(desplazamiento, self.longitud * self.tamano)
+        if not 0 <= buffer < BUFFERS or inicio + poblacion.shape[1] > self.tamano:
+            return None
+        return buffer, inicio
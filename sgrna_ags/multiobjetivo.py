@@ -0,0 +1,289 @@
+"""Modo multiobjetivo NSGA-II para optimizar la MFE y los efectos fuera del blanco a la vez.
+
+La función objetivo devuelve una matriz ``(objetivos, individuos)``. Cada
+generación se cruzan y mutan padres elegidos por torneo binario según el
+orden de hacinamiento (frente y distancia) y se conservan los mejores
+``tamano_poblacion`` individuos de la unión de padres e hijos.
+
+El ordenamiento no dominado está vectorizado: para dos objetivos se usa un
+barrido O(N log N) sobre los puntos ordenados y para más objetivos una
+matriz de dominancia construida por bloques (O(M·N²) en NumPy).
+"""
+import bisect
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from .configuracion import ConfiguracionAG
+from .evaluacion import Evaluador
+from .instrumentacion import InstrumentacionNula
+from .operadores import (
+    aplicar_crossover,
+    aplicar_mutacion,
+    cromosoma_a_texto,
+    generar_poblacion_inicial,
+    seleccion_por_torneo,
+)
+from .restricciones import generar_poblacion_valida
+
+TAMANO_BLOQUE = 1024
+
+
+@dataclass
+class ResultadoNSGA2:
+    """Resultado de una corrida multiobjetivo.
+
+    Attributes:
+        poblacion: Matriz de cromosomas de la última generación
+        objetivos: Matriz ``(objetivos, individuos)`` de la última generación
+        rangos: Frente de cada individuo (0 es el frente de Pareto)
+        frente: Cromosomas del frente de Pareto de la última generación
+        historial: Tamaño del frente y mejor valor de cada objetivo por generación
+        evaluaciones: Cantidad de evaluaciones reales de la función objetivo
+    """
+
+    poblacion: np.ndarray
+    objetivos: np.ndarray
+    rangos: np.ndarray
+    frente: list
+    historial: list = field(default_factory=list)
+    evaluaciones: int = 0
+
+
+def ordenamiento_no_dominado(valores):
+    """Asigna a cada individuo el índice de su frente de Pareto.
+
+    Todos los objetivos se minimizan.
+
+    Args:
+        valores: Matriz ``(objetivos, individuos)``
+
+    Returns:
+        Vector de enteros con el frente de cada individuo (0 es el no dominado)
+    """
+    valores = np.asarray(valores, dtype=np.float64)
+    if valores.shape[0] == 1:
+        _, rangos = np.unique(valores[0], return_inverse=True)
+        return rangos.ravel()
+    if valores.shape[0] == 2:
+        return _ordenamiento_dos_objetivos(valores)
+    return _ordenamiento_por_dominancia(valores)
+
+
+def _ordenamiento_dos_objetivos(valores):
+    """Barrido para dos objetivos sobre los puntos distintos en orden lexicográfico.
+
+    Cada frente se representa por el menor segundo objetivo de sus miembros
+    (el del último agregado). Esos valores crecen con el índice del frente,
+    así que el frente de cada punto se encuentra por búsqueda binaria.
+    """
+    unicos, inverso = np.unique(valores.T, axis=0, return_inverse=True)
+    ultimos = []
+    rangos_unicos = np.empty(unicos.shape[0], dtype=np.int64)
+    for punto, segundo in enumerate(unicos[:, 1].tolist()):
+        rango = bisect.bisect_right(ultimos, segundo)
+        if rango == len(ultimos):
+            ultimos.append(segundo)
+        else:
+            ultimos[rango] = segundo
+        rangos_unicos[punto] = rango
+    return rangos_unicos[inverso.ravel()]
+
+
+def _matriz_de_dominancia(valores, tamano_bloque=TAMANO_BLOQUE):
+    """Devuelve la matriz booleana ``domina[i, j]`` (i domina a j), calculada por bloques de filas."""
+    cantidad = valores.shape[1]
+    domina = np.empty((cantidad, cantidad), dtype=bool)
+    for inicio in range(0, cantidad, tamano_bloque):
+        bloque = valores[:, inicio:inicio + tamano_bloque, None]
+        no_peor = np.all(bloque <= valores[:, None, :], axis=0)
+        mejor = np.any(bloque < valores[:, None, :], axis=0)
+        domina[inicio:inicio + tamano_bloque] = no_peor & mejor
+    return domina
+
+
+def _ordenamiento_por_dominancia(valores):
+    """Ordenamiento no dominado rápido para cualquier cantidad de objetivos."""
+    domina = _matriz_de_dominancia(valores)
+    dominadores = domina.sum(axis=0)
+    rangos = np.empty(valores.shape[1], dtype=np.int64)
+    frente = np.flatnonzero(dominadores == 0)
+    rango = 0
+    while frente.size:
+        rangos[frente] = rango
+        dominadores -= domina[frente].sum(axis=0)
+        dominadores[frente] = -1
+        frente = np.flatnonzero(dominadores == 0)
+        rango += 1
+    return rangos
+
+
+def distancia_de_hacinamiento(valores, rangos):
+    """Calcula la distancia de hacinamiento de cada individuo dentro de su frente.
+
+    Los extremos de cada frente reciben distancia infinita.
+
+    Args:
+        valores: Matriz ``(objetivos, individuos)``
+        rangos: Frente de cada individuo
+
+    Returns:
+        Vector con la distancia de cada individuo
+    """
+    distancia = np.zeros(valores.shape[1], dtype=np.float64)
+    por_rango = np.argsort(rangos, kind="stable")
+    limites = np.flatnonzero(np.diff(rangos[por_rango])) + 1
+    for miembros in np.split(por_rango, limites):
+        if miembros.shape[0] <= 2:
+            distancia[miembros] = np.inf
+            continue
+        sub = valores[:, miembros]
+        orden = np.argsort(sub, axis=1, kind="stable")
+        ordenados = np.take_along_axis(sub, orden, axis=1)
+        amplitud = ordenados[:, -1] - ordenados[:, 0]
+        amplitud[amplitud == 0] = 1.0
+        aporte = np.empty_like(sub)
+        np.put_along_axis(aporte, orden[:, 1:-1], (ordenados[:, 2:] - ordenados[:, :-2]) / amplitud[:, None], axis=1)
+        np.put_along_axis(aporte, orden[:, [0, -1]], np.inf, axis=1)
+        distancia[miembros] = aporte.sum(axis=0)
+    return distancia
+
+
+def seleccionar_supervivientes(valores, cantidad):
+    """Elige los ``cantidad`` mejores individuos según frente y hacinamiento.
+
+    Returns:
+        Tupla ``(indices, rangos, distancia)`` con los índices elegidos y el
+        frente y la distancia de esos individuos
+    """
+    rangos = ordenamiento_no_dominado(valores)
+    distancia = distancia_de_hacinamiento(valores, rangos)
+    elegidos = np.lexsort((-distancia, rangos))[:cantidad]
+    return elegidos, rangos[elegidos], distancia[elegidos]
+
+
+def clave_de_hacinamiento(rangos, distancia):
+    """Convierte frente y distancia en un valor escalar apto para ``seleccion_por_torneo``.
+
+    Un valor mayor indica un frente mejor o, dentro del mismo frente, una
+    distancia de hacinamiento mayor.
+    """
+    clave = np.empty(rangos.shape[0], dtype=np.float64)
+    clave[np.lexsort((distancia, -rangos))] = np.arange(rangos.shape[0])
+    return clave
+
+
+def guardar_frente(ruta, poblacion, valores, frente, num_poblacion):
+    """Agrega al CSV los individuos del frente de Pareto de una generación."""
+    with open(ruta, "a", encoding="utf-8") as archivo:
+        if num_poblacion == 0:
+            columnas = ";".join(f"Objetivo{m + 1}" for m in range(valores.shape[0]))
+            archivo.write(f"Generacion;Cromosoma;{columnas}\n")
+        for individuo in frente:
+            objetivos = ";".join(str(valor) for valor in valores[:, individuo])
+            archivo.write(f'{num_poblacion};"{cromosoma_a_texto(poblacion, individuo)}";{objetivos}\n')
+
+
+def ejecutar_nsga2(configuracion=None, funcion_objetivos=None, minimizar=None, instrumentacion=None,
+                   archivo_frente=None, mostrar=False, restricciones=None, almacen=None):
+    """Ejecuta el algoritmo genético multiobjetivo NSGA-II.
+
+    De ``configuracion`` se usan el tamaño de población, la longitud del
+    cromosoma, las probabilidades de crossover y mutación, la cantidad de
+    ciclos, la caché y la semilla; la selección es siempre por torneo
+    binario de hacinamiento y el elitismo surge de unir padres e hijos. Los
+    hijos que no cumplen las restricciones se descartan sin evaluarse.
+
+    Args:
+        configuracion: Parámetros de la corrida (por defecto ``ConfiguracionAG()``)
+        funcion_objetivos: Función que recibe una matriz de cromosomas y
+            devuelve una matriz ``(objetivos, individuos)``
+        minimizar: Secuencia con un booleano por objetivo (por defecto se
+            minimizan todos, como la MFE y los efectos fuera del blanco)
+        instrumentacion: ``Instrumentacion`` donde registrar tiempos y contadores
+        archivo_frente: Ruta del CSV donde guardar el frente de Pareto de cada generación
+        mostrar: Si es True, muestra en pantalla el resumen de cada generación
+        restricciones: ``Restricciones`` que deben cumplir los hijos antes de evaluarse
+        almacen: ``AlmacenFitness`` persistente con los valores de corridas anteriores
+
+    Returns:
+        ``ResultadoNSGA2`` con la última generación y su frente de Pareto
+    """
+    if funcion_objetivos is None:
+        raise ValueError("El modo NSGA-II necesita una función que devuelva varios objetivos")
+    configuracion = configuracion or ConfiguracionAG()
+    instrumentacion = instrumentacion or InstrumentacionNula()
+    rng = np.random.default_rng(configuracion.semilla)
+    evaluador = Evaluador(funcion_objetivos, configuracion.usar_cache, instrumentacion, almacen)
+    tamano = configuracion.tamano_poblacion
+    historial = []
+
+    instrumentacion.iniciar_generacion(0)
+    poblacion = generar_poblacion_inicial(tamano, configuracion.longitud_cromosoma, rng)
+    if restricciones is not None:
+        generar_poblacion_valida(restricciones, poblacion, rng)
+    hijos = np.empty_like(poblacion)
+    with instrumentacion.fase("evaluacion"):
+        objetivos = np.atleast_2d(evaluador.evaluar(poblacion))
+        signos = _signos(objetivos.shape[0], minimizar)
+    with instrumentacion.fase("reemplazo"):
+        rangos = ordenamiento_no_dominado(objetivos * signos)
+        distancia = distancia_de_hacinamiento(objetivos * signos, rangos)
+    with instrumentacion.fase("salida"):
+        _registrar_frente(historial, poblacion, objetivos, signos, rangos, 0, archivo_frente, mostrar)
+    instrumentacion.finalizar_generacion()
+
+    for generacion in range(1, configuracion.numero_ciclos + 1):
+        instrumentacion.iniciar_generacion(generacion)
+        with instrumentacion.fase("seleccion"):
+            seleccion = seleccion_por_torneo(clave_de_hacinamiento(rangos, distancia), tamano, rng, 2)
+        with instrumentacion.fase("crossover"):
+            aplicar_crossover(poblacion, hijos, seleccion, configuracion.probabilidad_crossover, rng)
+        with instrumentacion.fase("mutacion"):
+            aplicar_mutacion(hijos, configuracion.probabilidad_mutacion, rng)
+        validos = hijos
+        if restricciones is not None:
+            with instrumentacion.fase("filtro"):
+                validos = hijos[:, restricciones.filtrar(hijos, instrumentacion)]
+        with instrumentacion.fase("evaluacion"):
+            objetivos_hijos = np.empty((objetivos.shape[0], 0))
+            if validos.shape[1]:
+                objetivos_hijos = np.atleast_2d(evaluador.evaluar(validos))
+        with instrumentacion.fase("reemplazo"):
+            union = np.concatenate([poblacion, validos], axis=1)
+            objetivos_union = np.concatenate([objetivos, objetivos_hijos], axis=1)
+            elegidos, rangos, distancia = seleccionar_supervivientes(objetivos_union * signos, tamano)
+            poblacion = union[:, elegidos]
+            objetivos = objetivos_union[:, elegidos]
+        with instrumentacion.fase("salida"):
+            _registrar_frente(historial, poblacion, objetivos, signos, rangos, generacion, archivo_frente, mostrar)
+        instrumentacion.finalizar_generacion()
+
+    frente = [cromosoma_a_texto(poblacion, individuo) for individuo in np.flatnonzero(rangos == 0)]
+    return ResultadoNSGA2(poblacion, objetivos, rangos, frente, historial, evaluador.evaluaciones)
+
+
+def _signos(cantidad_objetivos, minimizar):
+    """Devuelve el factor que convierte cada objetivo en uno a minimizar."""
+    if minimizar is None:
+        minimizar = (True,) * cantidad_objetivos
+    if len(minimizar) != cantidad_objetivos:
+        raise ValueError(f"Se esperaba un sentido por objetivo ({cantidad_objetivos}), no {len(minimizar)}")
+    return np.where(np.asarray(minimizar, dtype=bool), 1.0, -1.0)[:, None]
+
+
+def _registrar_frente(historial, poblacion, objetivos, signos, rangos, num_poblacion, archivo_frente, mostrar):
+    """Agrega el resumen del frente de Pareto al historial y, si corresponde, lo muestra y lo guarda."""
+    frente = np.flatnonzero(rangos == 0)
+    mejores = (objetivos * signos).min(axis=1) * signos[:, 0]
+    historial.append({
+        "generacion": num_poblacion,
+        "tamano_frente": int(frente.shape[0]),
+        "mejores": mejores.tolist(),
+    })
+    if mostrar:
+        titulo = f"Población {num_poblacion}" if num_poblacion != 0 else "Población Inicial"
+        valores = " ".join(f"{valor:10.4f}" for valor in mejores)
+        print(f"{titulo:<18} frente: {frente.shape[0]:5d} {valores}")
+    if archivo_frente is not None:
+        guardar_frente(archivo_frente, poblacion, objetivos, frente, num_poblacion)
@@ -0,0 +1,181 @@
+"""Operadores genéticos vectorizados sobre la población completa.
+
+La población se guarda como una matriz ``uint8`` de forma
+``(longitud_cromosoma, tamano_poblacion)``, con la misma disposición
+gen-individuo que usan los scripts de ``Pruebas AGs``
+(``poblacion[gen][individuo]``). Cada operador procesa todos los
+individuos de una vez en lugar de recorrerlos uno por uno.
+"""
+import numpy as np
+
+# Tipos de crossover que acepta ``aplicar_crossover`` (por índice)
+OPERADORES_CROSSOVER = ("un_punto", "dos_puntos", "uniforme")
+
+
+def generar_poblacion_inicial(tamano_poblacion, longitud_cromosoma, rng):
+    """Genera una población inicial aleatoria de cromosomas binarios.
+
+    Args:
+        tamano_poblacion: Cantidad de individuos
+        longitud_cromosoma: Cantidad de genes de cada individuo
+        rng: Generador aleatorio de NumPy
+
+    Returns:
+        Matriz de cromosomas binarios
+    """
+    return rng.integers(0, 2, size=(longitud_cromosoma, tamano_poblacion), dtype=np.uint8)
+
+
+def convertir_binario_a_decimal(poblacion):
+    """Convierte cada cromosoma binario a su valor decimal equivalente.
+
+    El primer gen es el bit más significativo, igual que en ``BinDec``.
+
+    Args:
+        poblacion: Matriz de cromosomas binarios (hasta 62 genes)
+
+    Returns:
+        Vector ``int64`` con el valor decimal de cada individuo
+    """
+    longitud = poblacion.shape[0]
+    if longitud > 62:
+        raise ValueError("No se puede convertir a decimal un cromosoma de más de 62 genes")
+    pesos = np.left_shift(np.int64(1), np.arange(longitud - 1, -1, -1, dtype=np.int64))
+    return pesos @ poblacion.astype(np.int64)
+
+
+def cromosoma_a_texto(poblacion, individuo):
+    """Devuelve el cromosoma de un individuo como cadena de ceros y unos."""
+    return "".join("1" if gen else "0" for gen in poblacion[:, individuo])
+
+
+def seleccionar_elite(fitness, cantidad):
+    """Devuelve los índices de los ``cantidad`` individuos con mayor fitness.
+
+    Ante empates se prefiere el individuo de menor índice.
+    """
+    if cantidad <= 0:
+        return np.empty(0, dtype=np.intp)
+    return np.argsort(-np.asarray(fitness), kind="stable")[:cantidad]
+
+
+def seleccion_por_torneo(fitness, cantidad, rng, tamano_torneo=4):
+    """Selecciona individuos por torneo.
+
+    Cada torneo toma ``tamano_torneo`` individuos al azar (con reposición) y
+    elige al de mayor fitness; ante empates gana el primero sorteado, igual
+    que en ``Torneo``.
+
+    Args:
+        fitness: Vector de fitness de la población
+        cantidad: Cantidad de individuos a seleccionar
+        rng: Generador aleatorio de NumPy
+        tamano_torneo: Cantidad de participantes por torneo
+
+    Returns:
+        Vector con los índices de los individuos seleccionados
+    """
+    fitness = np.asarray(fitness)
+    candidatos = rng.integers(0, fitness.shape[0], size=(cantidad, tamano_torneo))
+    ganadores = np.argmax(fitness[candidatos], axis=1)
+    return candidatos[np.arange(cantidad), ganadores]
+
+
+def seleccion_por_ruleta(fitness, cantidad, rng):
+    """Selecciona individuos con probabilidad proporcional a su fitness.
+
+    A diferencia de ``Ruleta``, la ruleta no se discretiza en 100 casillas:
+    se sortea sobre la suma acumulada del fitness, que no necesita estar
+    normalizado. Si el fitness total no es positivo se selecciona de manera
+    uniforme.
+
+    Args:
+        fitness: Vector de fitness (no negativo) de la población
+        cantidad: Cantidad de individuos a seleccionar
+        rng: Generador aleatorio de NumPy
+
+    Returns:
+        Vector con los índices de los individuos seleccionados
+    """
+    fitness = np.asarray(fitness, dtype=np.float64)
+    if fitness.min() < 0:
+        raise ValueError("La ruleta necesita fitness no negativo; use el escalado 'ranking' o 'sigma'")
+    acumulado = np.cumsum(fitness)
+    total = acumulado[-1]
+    if not total > 0:
+        return rng.integers(0, acumulado.shape[0], size=cantidad)
+    tiradas = rng.random(cantidad) * total
+    seleccion = np.searchsorted(acumulado, tiradas, side="right")
+    return np.minimum(seleccion, acumulado.shape[0] - 1)
+
+
+def aplicar_crossover(poblacion, pob_siguiente, seleccion, probabilidad, rng, inicio=0, operadores=None):
+    """Aplica crossover entre parejas consecutivas de la selección.
+
+    Por defecto el crossover es de un punto. Los hijos se escriben en
+    ``pob_siguiente`` a partir de la columna ``inicio``. Si la selección
+    tiene una cantidad impar de individuos, el último se copia sin cruzar.
+
+    Args:
+        poblacion: Matriz de cromosomas binarios actual
+        pob_siguiente: Matriz donde se almacena la nueva generación
+        seleccion: Vector de índices de los padres seleccionados
+        probabilidad: Probabilidad de cruce, en porcentaje (un valor o uno por pareja)
+        rng: Generador aleatorio de NumPy
+        inicio: Primera columna de ``pob_siguiente`` a escribir
+        operadores: Índice en ``OPERADORES_CROSSOVER`` del tipo de crossover
+            de cada pareja (None para usar siempre un punto)
+
+    Returns:
+        Vector con el (primer) punto de cruce de cada pareja (igual a la
+        longitud del cromosoma si la pareja no se cruzó)
+    """
+    longitud = poblacion.shape[0]
+    seleccion = np.asarray(seleccion)
+    parejas = seleccion.shape[0] // 2
+    padre1 = poblacion[:, seleccion[0:2 * parejas:2]]
+    padre2 = poblacion[:, seleccion[1:2 * parejas:2]]
+
+    cruza = rng.random(parejas) * 100 < probabilidad
+    puntos = np.where(cruza, rng.integers(1, longitud, size=parejas), longitud)
+    # True donde el hijo conserva el gen de su propio padre
+    genes = np.arange(longitud)[:, None]
+    mascara = genes < puntos[None, :]
+    if operadores is not None:
+        operadores = np.asarray(operadores)
+        dos_puntos = np.flatnonzero(cruza & (operadores == 1))
+        if dos_puntos.size:
+            segundos = rng.integers(1, longitud, size=dos_puntos.size)
+            desde = np.minimum(puntos[dos_puntos], segundos)
+            hasta = np.maximum(puntos[dos_puntos], segundos)
+            mascara[:, dos_puntos] = (genes < desde) | (genes >= hasta)
+        uniformes = np.flatnonzero(cruza & (operadores == 2))
+        if uniformes.size:
+            mascara[:, uniformes] = rng.random((longitud, uniformes.size)) < 0.5
+
+    fin = inicio + 2 * parejas
+    pob_siguiente[:, inicio:fin:2] = np.where(mascara, padre1, padre2)
+    pob_siguiente[:, inicio + 1:fin:2] = np.where(mascara, padre2, padre1)
+    if seleccion.shape[0] % 2:
+        pob_siguiente[:, fin] = poblacion[:, seleccion[-1]]
+    return puntos
+
+
+def aplicar_mutacion(pob_siguiente, probabilidad, rng, inicio=0):
+    """Invierte un gen al azar de cada individuo que resulte sorteado.
+
+    Args:
+        pob_siguiente: Matriz de cromosomas binarios de la nueva generación
+        probabilidad: Probabilidad de mutar cada individuo, en porcentaje (un
+            valor o uno por individuo desde ``inicio``)
+        rng: Generador aleatorio de NumPy
+        inicio: Primera columna sujeta a mutación (las anteriores son élite)
+
+    Returns:
+        Tupla ``(individuos, genes)`` con las posiciones mutadas
+    """
+    longitud, tamano = pob_siguiente.shape
+    individuos = np.flatnonzero(rng.random(tamano - inicio) * 100 < probabilidad) + inicio
+    genes = rng.integers(0, longitud, size=individuos.shape[0])
+    pob_siguiente[genes, individuos] ^= 1
+    return individuos, genes
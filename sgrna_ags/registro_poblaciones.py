@@ -0,0 +1,181 @@
+"""Registro de poblaciones completas cada N generaciones.
+
+``GuardarDatos`` sólo conserva el mejor cromosoma y el máximo, el mínimo y
+el promedio de cada generación, lo que no alcanza para analizar después
+cómo se comportó la selección. ``RegistroPoblaciones`` guarda además la
+población (empaquetada a un bit por gen) y el vector objetivo de una de
+cada ``cada`` generaciones en un archivo zip con un ``.npy`` por arreglo::
+
+    metadatos.json
+    000000/poblacion.npy   # (individuos, ceil(longitud / 8)) uint8
+    000000/objetivo.npy
+    000010/poblacion.npy
+    ...
+
+Por defecto los miembros se guardan sin comprimir, de modo que
+``LectorPoblaciones`` puede abrir cualquier generación con ``np.memmap`` sin
+leer el resto del archivo. Con ``comprimir=True`` el archivo ocupa menos,
+pero cada arreglo se descomprime completo al leerlo. El archivo admite
+agregar generaciones (por ejemplo, al continuar una corrida).
+"""
+import io
+import json
+import struct
+import zipfile
+
+import numpy as np
+
+FORMATO = "sgrna-ags-poblaciones"
+VERSION_FORMATO = 1
+_METADATOS = "metadatos.json"
+
+# Tamaño fijo de la cabecera local de un miembro zip (sin nombre ni campo extra)
+_CABECERA_LOCAL = 30
+
+
+def _miembro(generacion, arreglo):
+    return f"{generacion:06d}/{arreglo}.npy"
+
+
+class RegistroPoblaciones:
+    """Guarda la población y el objetivo de una de cada ``cada`` generaciones.
+
+    Args:
+        ruta: Archivo zip de salida
+        cada: Intervalo entre generaciones registradas
+        comprimir: Si es True, comprime cada arreglo (deja de poder
+            abrirse con ``np.memmap``)
+        agregar: Si es True, agrega generaciones a un archivo existente
+
+    Attributes:
+        generaciones: Generaciones registradas en el archivo
+    """
+
+    def __init__(self, ruta, cada=1, comprimir=False, agregar=False):
+        if cada < 1:
+            raise ValueError("El intervalo entre generaciones registradas debe ser al menos 1")
+        self.ruta = ruta
+        self.cada = cada
+        self.longitud = None
+        self.generaciones = []
+        compresion = zipfile.ZIP_DEFLATED if comprimir else zipfile.ZIP_STORED
+        self._archivo = zipfile.ZipFile(ruta, "a" if agregar else "w", compression=compresion)
+        if agregar and _METADATOS in self._archivo.namelist():
+            self.longitud = json.loads(self._archivo.read(_METADATOS))["longitud"]
+            self.generaciones = _generaciones(self._archivo.namelist())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
+
+    def registrar(self, generacion, poblacion, objetivo, forzar=False):
+        """Guarda la generación si le corresponde según ``cada``.
+
+        Args:
+            generacion: Número de la generación
+            poblacion: Matriz de cromosomas binarios
+            objetivo: Valores objetivo (vector o matriz ``(objetivos, individuos)``)
+            forzar: Si es True, la guarda aunque no le corresponda
+
+        Returns:
+            True si la generación se guardó
+        """
+        if generacion % self.cada and not forzar:
+            return False
+        if generacion in self.generaciones:
+            raise ValueError(f"La generación {generacion} ya está registrada en {self.ruta}")
+        if self.longitud is None:
+            self.longitud = int(poblacion.shape[0])
+            metadatos = {"formato": FORMATO, "version": VERSION_FORMATO, "longitud": self.longitud}
+            self._archivo.writestr(_METADATOS, json.dumps(metadatos))
+        elif poblacion.shape[0] != self.longitud:
+            raise ValueError(f"El registro es de cromosomas de {self.longitud} genes, no de {poblacion.shape[0]}")
+        self._escribir(_miembro(generacion, "poblacion"), np.packbits(poblacion, axis=0).T)
+        self._escribir(_miembro(generacion, "objetivo"), np.asarray(objetivo, dtype=np.float64))
+        self.generaciones.append(generacion)
+        return True
+
+    def cerrar(self):
+        """Escribe el directorio del zip y cierra el archivo."""
+        self._archivo.close()
+
+    def _escribir(self, nombre, arreglo):
+        arreglo = np.ascontiguousarray(arreglo)
+        with self._archivo.open(nombre, "w", force_zip64=arreglo.nbytes >= 1 << 31) as miembro:
+            np.lib.format.write_array(miembro, arreglo, allow_pickle=False)
+
+
+class LectorPoblaciones:
+    """Acceso aleatorio a las generaciones de un archivo de ``RegistroPoblaciones``.
+
+    Args:
+        ruta: Archivo zip escrito por ``RegistroPoblaciones``
+
+    Attributes:
+        longitud: Genes de cada cromosoma
+        generaciones: Generaciones registradas, en orden creciente
+    """
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        with zipfile.ZipFile(ruta) as archivo:
+            self._miembros = {info.filename: info for info in archivo.infolist()}
+            metadatos = json.loads(archivo.read(_METADATOS)) if _METADATOS in self._miembros else {}
+        if metadatos and metadatos.get("formato") != FORMATO:
+            raise ValueError(f"{ruta} no es un registro de poblaciones")
+        self.longitud = metadatos.get("longitud")
+        self.generaciones = sorted(_generaciones(self._miembros))
+
+    def __len__(self):
+        return len(self.generaciones)
+
+    def __iter__(self):
+        """Recorre ``(generacion, poblacion, objetivo)`` de a una generación."""
+        for generacion in self.generaciones:
+            yield generacion, self.poblacion(generacion), self.objetivo(generacion)
+
+    def objetivo(self, generacion):
+        """Devuelve los valores objetivo de una generación (sin leerlos si el archivo no está comprimido)."""
+        return self._abrir(_miembro(generacion, "objetivo"))
+
+    def poblacion_empaquetada(self, generacion):
+        """Devuelve la matriz ``(individuos, bytes)`` con un cromosoma empaquetado por fila."""
+        return self._abrir(_miembro(generacion, "poblacion"))
+
+    def poblacion(self, generacion, individuos=None):
+        """Devuelve la matriz de cromosomas ``(longitud, individuos)`` de una generación.
+
+        Args:
+            generacion: Generación a leer
+            individuos: Índices de los individuos a desempaquetar (None para todos)
+        """
+        empaquetada = self.poblacion_empaquetada(generacion)
+        if individuos is not None:
+            empaquetada = empaquetada[individuos]
+        return np.unpackbits(empaquetada, axis=1, count=self.longitud).T
+
+    def _abrir(self, nombre):
+        info = self._miembros.get(nombre)
+        if info is None:
+            raise KeyError(f"La generación {nombre.split('/')[0].lstrip('0') or 0} no está registrada")
+        if info.compress_type != zipfile.ZIP_STORED:
+            with zipfile.ZipFile(self.ruta) as archivo:
+                return np.load(io.BytesIO(archivo.read(nombre)), allow_pickle=False)
+        with open(self.ruta, "rb") as archivo:
+            archivo.seek(info.header_offset)
+            largo_nombre, largo_extra = struct.unpack("<HH", archivo.read(_CABECERA_LOCAL)[26:30])
+            archivo.seek(info.header_offset + _CABECERA_LOCAL + largo_nombre + largo_extra)
+            version = np.lib.format.read_magic(archivo)
+            if version == (1, 0):
+                forma, fortran, tipo = np.lib.format.read_array_header_1_0(archivo)
+            else:
+                forma, fortran, tipo = np.lib.format.read_array_header_2_0(archivo)
+            desplazamiento = archivo.tell()
+        return np.memmap(self.ruta, dtype=tipo, mode="r", offset=desplazamiento, shape=forma,
+                         order="F" if fortran else "C")
+
+
+def _generaciones(nombres):
+    return [int(nombre.split("/")[0]) for nombre in nombres if nombre.endswith("/objetivo.npy")]
@@ -0,0 +1,186 @@
+"""Filtro de restricciones duras previo a la evaluación.
+
+Un cromosoma representa un array de guías: ``espaciadores`` segmentos
+consecutivos de ``longitud_espaciador`` nucleótidos seguidos de la PAM.
+Antes de gastar tiempo en plegar una guía o buscar sus sitios fuera del
+blanco se descartan, de forma vectorizada sobre toda la población, las que
+no cumplen restricciones baratas de verificar:
+
+- contenido de GC de cada espaciador dentro de una ventana
+- sin corridas de T más largas que ``max_poli_t`` (TTTT termina la
+  transcripción de la ARN polimerasa III)
+- PAM presente al final de cada segmento
+- sin espaciadores repetidos dentro de un mismo array
+"""
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from .secuencias import C, G, T, codificar_nucleotidos, decodificar_nucleotidos, dividir_en_segmentos, tabla_patron
+
+MOTIVOS = ("gc", "poli_t", "pam", "repetidos")
+
+
+@dataclass
+class Restricciones:
+    """Restricciones duras de cada guía y contadores de rechazos.
+
+    Attributes:
+        longitud_espaciador: Nucleótidos de cada espaciador (sin la PAM)
+        pam: Patrón IUPAC de la PAM al final de cada segmento ("" para no exigirla)
+        gc_minimo: Fracción mínima de G+C de cada espaciador
+        gc_maximo: Fracción máxima de G+C de cada espaciador
+        max_poli_t: Máxima cantidad de T consecutivas permitida en un espaciador
+        permitir_repetidos: Si es False, los espaciadores de un array deben ser distintos
+        reparar: Si es True, antes de validar se corrigen la PAM y las corridas de T
+        rechazos: Cantidad de individuos rechazados por cada motivo
+    """
+
+    longitud_espaciador: int = 20
+    pam: str = "NGG"
+    gc_minimo: float = 0.4
+    gc_maximo: float = 0.6
+    max_poli_t: int = 3
+    permitir_repetidos: bool = False
+    reparar: bool = False
+    rechazos: dict = field(default_factory=lambda: dict.fromkeys(MOTIVOS, 0))
+
+    def __post_init__(self):
+        self._tabla_pam = tabla_patron(self.pam)
+
+    @property
+    def longitud_segmento(self):
+        """Nucleótidos de cada segmento (espaciador más PAM)."""
+        return self.longitud_espaciador + len(self.pam)
+
+    def segmentos(self, codigos):
+        """Reordena la matriz de códigos como ``(espaciadores, longitud_segmento, individuos)``."""
+        return dividir_en_segmentos(codigos, self.longitud_segmento)
+
+    def validar(self, poblacion):
+        """Devuelve una máscara con los individuos que cumplen todas las restricciones.
+
+        Suma a ``rechazos`` los individuos rechazados por cada motivo (un
+        individuo puede fallar por varios).
+        """
+        segmentos = self.segmentos(decodificar_nucleotidos(poblacion))
+        espaciadores = segmentos[:, :self.longitud_espaciador]
+        fallas = {
+            "gc": self._falla_gc(espaciadores),
+            "poli_t": self._falla_poli_t(espaciadores),
+            "pam": self._falla_pam(segmentos),
+            "repetidos": self._falla_repetidos(espaciadores),
+        }
+        validos = np.ones(poblacion.shape[1], dtype=bool)
+        for motivo, falla in fallas.items():
+            self.rechazos[motivo] += int(falla.sum())
+            validos &= ~falla
+        return validos
+
+    def _falla_gc(self, espaciadores):
+        es_gc = (espaciadores == C) | (espaciadores == G)
+        fraccion = es_gc.mean(axis=1)
+        return ((fraccion < self.gc_minimo) | (fraccion > self.gc_maximo)).any(axis=0)
+
+    def _falla_poli_t(self, espaciadores):
+        ventana = self.max_poli_t + 1
+        if ventana > self.longitud_espaciador:
+            return np.zeros(espaciadores.shape[2], dtype=bool)
+        acumulado = np.cumsum(espaciadores == T, axis=1, dtype=np.int32)
+        acumulado = np.concatenate([np.zeros_like(acumulado[:, :1]), acumulado], axis=1)
+        corridas = acumulado[:, ventana:] - acumulado[:, :-ventana]
+        return (corridas == ventana).any(axis=(0, 1))
+
+    def _falla_pam(self, segmentos):
+        if not self.pam:
+            return np.zeros(segmentos.shape[2], dtype=bool)
+        pam = segmentos[:, self.longitud_espaciador:]
+        posiciones = np.arange(len(self.pam))[None, :, None]
+        return ~self._tabla_pam[posiciones, pam].all(axis=(0, 1))
+
+    def _falla_repetidos(self, espaciadores):
+        falla = np.zeros(espaciadores.shape[2], dtype=bool)
+        if self.permitir_repetidos:
+            return falla
+        for i in range(espaciadores.shape[0]):
+            for j in range(i + 1, espaciadores.shape[0]):
+                falla |= (espaciadores[i] == espaciadores[j]).all(axis=0)
+        return falla
+
+    def reparar_poblacion(self, poblacion):
+        """Corrige en el lugar la PAM y las corridas de T de cada individuo.
+
+        Cada posición de la PAM que no cumple el patrón toma el primer
+        nucleótido admitido, y cada T que alargaría una corrida más allá de
+        ``max_poli_t`` se cambia por G.
+        """
+        codigos = decodificar_nucleotidos(poblacion)
+        segmentos = self.segmentos(codigos)
+        if self.pam:
+            primeros = np.argmax(self._tabla_pam, axis=1).astype(np.uint8)
+            pam = segmentos[:, self.longitud_espaciador:]
+            posiciones = np.arange(len(self.pam))[None, :, None]
+            segmentos[:, self.longitud_espaciador:] = np.where(self._tabla_pam[posiciones, pam], pam,
+                                                               primeros[None, :, None])
+        corrida = np.zeros((segmentos.shape[0], segmentos.shape[2]), dtype=np.int32)
+        for posicion in range(self.longitud_espaciador):
+            es_t = segmentos[:, posicion] == T
+            corrida = np.where(es_t, corrida + 1, 0)
+            excede = corrida > self.max_poli_t
+            segmentos[:, posicion][excede] = G
+            corrida[excede] = 0
+        codificar_nucleotidos(codigos, poblacion)
+
+    def filtrar(self, poblacion, instrumentacion=None):
+        """Repara (si corresponde) y valida una matriz de hijos.
+
+        Returns:
+            Máscara con los individuos válidos
+        """
+        if self.reparar:
+            self.reparar_poblacion(poblacion)
+        validos = self.validar(poblacion)
+        if instrumentacion is not None:
+            instrumentacion.contar("rechazados", int(validos.shape[0] - validos.sum()))
+        return validos
+
+
+def generar_poblacion_valida(restricciones, poblacion, rng, intentos=100):
+    """Convierte una población inicial aleatoria en una que cumple todas las restricciones.
+
+    Cada individuo se repara siempre (aunque ``restricciones.reparar`` sea
+    False), de modo que la PAM y las corridas de T quedan corregidas sin
+    depender del azar; los que siguen siendo inválidos (por el contenido de
+    GC o por espaciadores repetidos) se vuelven a sortear y reparar hasta
+    ``intentos`` veces. Los ciclos reemplazan a los hijos rechazados por
+    copias de sus padres, por lo que una población inicial inválida dejaría
+    la corrida sin avanzar.
+
+    Args:
+        restricciones: ``Restricciones`` a cumplir
+        poblacion: Matriz de cromosomas binarios; se modifica en el lugar
+        rng: Generador aleatorio de NumPy
+        intentos: Máximo de sorteos para cada individuo inválido
+
+    Returns:
+        Máscara con los individuos válidos (todos True)
+
+    Raises:
+        ValueError: Si tras ``intentos`` sorteos algún individuo sigue inválido
+    """
+    # Los sorteos de la población inicial no cuentan como rechazos
+    rechazos = dict(restricciones.rechazos)
+    invalidos = np.arange(poblacion.shape[1])
+    try:
+        for _ in range(intentos + 1):
+            individuos = poblacion[:, invalidos]
+            restricciones.reparar_poblacion(individuos)
+            poblacion[:, invalidos] = individuos
+            invalidos = invalidos[~restricciones.validar(individuos)]
+            if not invalidos.size:
+                return np.ones(poblacion.shape[1], dtype=bool)
+            poblacion[:, invalidos] = rng.integers(0, 2, size=(poblacion.shape[0], invalidos.size), dtype=np.uint8)
+    finally:
+        restricciones.rechazos = rechazos
+    raise ValueError(f"No se pudo generar una población inicial válida: {invalidos.size} individuos siguen "
+                     f"sin cumplir las restricciones tras {intentos} sorteos")
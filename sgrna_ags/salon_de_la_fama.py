@@ -0,0 +1,98 @@
+"""Archivo acotado de los mejores cromosomas distintos de toda la corrida.
+
+Sin élite, el mejor cromosoma de una generación puede perderse en la
+siguiente. ``SalonDeLaFama`` conserva los ``capacidad`` mejores cromosomas
+distintos vistos en la corrida en un montículo de mínimos ordenado por el
+valor objetivo (orientado), con un conjunto de claves para descartar
+repetidos. Cada candidato cuesta O(log K) y, antes de recorrerlos, se
+descartan de forma vectorizada los que no superan el peor valor archivado.
+"""
+import heapq
+import itertools
+
+import numpy as np
+
+from .evaluacion import claves_cromosomas, orientar_objetivo
+
+
+class SalonDeLaFama:
+    """Mantiene los mejores ``capacidad`` cromosomas distintos.
+
+    Args:
+        capacidad: Cantidad máxima de cromosomas archivados
+        minimizar: Si es True, los mejores son los de menor valor objetivo
+
+    Attributes:
+        candidatos: Individuos que pasaron el prefiltro por umbral
+        ingresos: Cromosomas que entraron al archivo
+    """
+
+    def __init__(self, capacidad=10, minimizar=False):
+        if capacidad < 1:
+            raise ValueError("La capacidad del salón de la fama debe ser al menos 1")
+        self.capacidad = capacidad
+        self.minimizar = minimizar
+        self.candidatos = 0
+        self.ingresos = 0
+        # Entradas (valor orientado, orden de llegada, clave, cromosoma)
+        self._monticulo = []
+        self._claves = set()
+        self._orden = itertools.count()
+
+    def __len__(self):
+        return len(self._monticulo)
+
+    @property
+    def umbral(self):
+        """Valor orientado que debe superar un cromosoma para entrar (-inf si hay lugar)."""
+        if len(self._monticulo) < self.capacidad:
+            return -np.inf
+        return self._monticulo[0][0]
+
+    def actualizar(self, poblacion, objetivo):
+        """Ofrece al archivo los individuos de una población evaluada.
+
+        Args:
+            poblacion: Matriz de cromosomas binarios
+            objetivo: Valor objetivo de cada individuo
+
+        Returns:
+            Cantidad de cromosomas que entraron al archivo
+        """
+        valores = orientar_objetivo(np.asarray(objetivo, dtype=np.float64), self.minimizar)
+        candidatos = np.flatnonzero(valores > self.umbral)
+        if not candidatos.size:
+            return 0
+        self.candidatos += candidatos.size
+        # Los mejores primero, para que los siguientes choquen antes con el umbral
+        candidatos = candidatos[np.argsort(-valores[candidatos], kind="stable")]
+        ingresos = 0
+        for individuo, clave in zip(candidatos, claves_cromosomas(poblacion[:, candidatos])):
+            valor = float(valores[individuo])
+            if clave in self._claves:
+                continue
+            entrada = (valor, next(self._orden), clave, poblacion[:, individuo].copy())
+            if len(self._monticulo) < self.capacidad:
+                heapq.heappush(self._monticulo, entrada)
+            elif valor > self._monticulo[0][0]:
+                self._claves.discard(heapq.heapreplace(self._monticulo, entrada)[2])
+            else:
+                break
+            self._claves.add(clave)
+            ingresos += 1
+        self.ingresos += ingresos
+        return ingresos
+
+    def mejores(self):
+        """Devuelve ``(cromosomas, objetivo)`` del archivo, del mejor al peor.
+
+        Returns:
+            Tupla con la matriz de cromosomas ``(longitud, archivados)`` y el
+            vector de sus valores objetivo
+        """
+        entradas = sorted(self._monticulo, key=lambda entrada: (-entrada[0], entrada[1]))
+        if not entradas:
+            return np.empty((0, 0), dtype=np.uint8), np.empty(0)
+        cromosomas = np.stack([entrada[3] for entrada in entradas], axis=1)
+        valores = np.array([entrada[0] for entrada in entradas])
+        return cromosomas, orientar_objetivo(valores, self.minimizar)
@@ -0,0 +1,125 @@
+"""Interpretación de los cromosomas binarios como secuencias de nucleótidos.
+
+Cada nucleótido ocupa dos genes consecutivos del cromosoma (A=00, C=01,
+G=10, T=11). La matriz de códigos resultante tiene forma
+``(nucleotidos, individuos)``, con la misma disposición que la población.
+"""
+import numpy as np
+
+NUCLEOTIDOS = "ACGT"
+A, C, G, T = range(4)
+
+# Códigos IUPAC admitidos en patrones como la PAM
+IUPAC = {
+    "A": "A", "C": "C", "G": "G", "T": "T",
+    "R": "AG", "Y": "CT", "S": "CG", "W": "AT", "K": "GT", "M": "AC",
+    "B": "CGT", "D": "AGT", "H": "ACT", "V": "ACG", "N": "ACGT",
+}
+
+# Formas de combinar los puntajes de las guías (segmentos) de un array
+AGREGACIONES = ("suma", "media", "minimo")
+
+# Código de los caracteres que no son nucleótidos en ``secuencia_a_codigos(..., estricta=False)``
+CODIGO_INVALIDO = 255
+
+# Código de cada byte ASCII: ACGT y U (leída como T), en mayúscula o minúscula
+_TABLA_CODIGOS = np.full(256, CODIGO_INVALIDO, dtype=np.uint8)
+_TABLA_CODIGOS[np.frombuffer(b"ACGTUacgtu", dtype=np.uint8)] = [A, C, G, T, T] * 2
+
+
+def decodificar_nucleotidos(poblacion):
+    """Convierte la matriz de bits en la matriz de códigos de nucleótidos (0 a 3).
+
+    Args:
+        poblacion: Matriz de cromosomas binarios con longitud par
+
+    Returns:
+        Matriz ``uint8`` de forma ``(longitud_cromosoma // 2, tamano_poblacion)``
+    """
+    if poblacion.shape[0] % 2:
+        raise ValueError("La longitud del cromosoma debe ser par para leerlo como nucleótidos")
+    return (poblacion[0::2] << 1) | poblacion[1::2]
+
+
+def codificar_nucleotidos(codigos, poblacion=None):
+    """Escribe una matriz de códigos de nucleótidos como bits.
+
+    Args:
+        codigos: Matriz de códigos (0 a 3)
+        poblacion: Matriz de bits donde escribir; si es None se crea una nueva
+
+    Returns:
+        Matriz de cromosomas binarios
+    """
+    if poblacion is None:
+        poblacion = np.empty((2 * codigos.shape[0],) + codigos.shape[1:], dtype=np.uint8)
+    poblacion[0::2] = codigos >> 1
+    poblacion[1::2] = codigos & 1
+    return poblacion
+
+
+def cromosoma_a_secuencia(poblacion, individuo):
+    """Devuelve el cromosoma de un individuo como cadena de nucleótidos."""
+    codigos = decodificar_nucleotidos(poblacion[:, individuo:individuo + 1])[:, 0]
+    return "".join(NUCLEOTIDOS[codigo] for codigo in codigos)
+
+
+def secuencia_a_codigos(secuencia, estricta=True):
+    """Convierte una cadena de nucleótidos (ACGT, U se lee como T) en un vector de códigos.
+
+    Cada carácter se traduce con una tabla de 256 entradas sobre los bytes
+    de la cadena, sin recorrerla en Python.
+
+    Args:
+        secuencia: Cadena de nucleótidos, en mayúscula o minúscula
+        estricta: Si es False, los caracteres que no son nucleótidos (N,
+            huecos, etc.) se devuelven como ``CODIGO_INVALIDO`` en lugar de fallar
+
+    Raises:
+        ValueError: Si ``estricta`` y la secuencia tiene caracteres distintos de ACGTU
+    """
+    codigos = _TABLA_CODIGOS[np.frombuffer(secuencia.encode("ascii", "replace"), dtype=np.uint8)]
+    if estricta and (codigos == CODIGO_INVALIDO).any():
+        raise ValueError(f"Secuencia con caracteres distintos de ACGT: {secuencia!r}")
+    return codigos
+
+
+def dividir_en_segmentos(matriz, longitud_segmento, unidad="nt"):
+    """Reordena una matriz ``(posiciones, individuos)`` como ``(segmentos, longitud_segmento, individuos)``.
+
+    Args:
+        matriz: Matriz de bits o de códigos de nucleótidos
+        longitud_segmento: Posiciones de cada segmento
+        unidad: Nombre de las posiciones en el mensaje de error ("nt" o "genes")
+    """
+    posiciones, individuos = matriz.shape
+    if posiciones % longitud_segmento:
+        raise ValueError(f"El cromosoma ({posiciones} {unidad}) no es múltiplo del segmento "
+                         f"({longitud_segmento} {unidad})")
+    return matriz.reshape(posiciones // longitud_segmento, longitud_segmento, individuos)
+
+
+def verificar_agregacion(agregacion):
+    """Falla si ``agregacion`` no es una de ``AGREGACIONES``."""
+    if agregacion not in AGREGACIONES:
+        raise ValueError(f"Agregación desconocida: {agregacion!r} (opciones: {', '.join(AGREGACIONES)})")
+
+
+def agregar_puntajes(puntajes, agregacion):
+    """Combina los puntajes ``(segmentos, individuos)`` de cada individuo según ``agregacion``."""
+    if agregacion == "minimo":
+        return puntajes.min(axis=0)
+    if agregacion == "media":
+        return puntajes.mean(axis=0)
+    return puntajes.sum(axis=0)
+
+
+def tabla_patron(patron):
+    """Devuelve una tabla booleana ``(posiciones, 4)`` con los nucleótidos admitidos por un patrón IUPAC."""
+    tabla = np.zeros((len(patron), 4), dtype=bool)
+    for posicion, simbolo in enumerate(patron.upper()):
+        if simbolo not in IUPAC:
+            raise ValueError(f"Símbolo IUPAC desconocido en el patrón {patron!r}: {simbolo!r}")
+        for base in IUPAC[simbolo]:
+            tabla[posicion, NUCLEOTIDOS.index(base)] = True
+    return tabla
@@ -0,0 +1,327 @@
+"""Servicio local de diseño de arrays de guías.
+
+Mantiene en memoria, entre un trabajo y el siguiente, el índice de la
+referencia, las tablas de puntaje y una caché de fitness por locus, y
+reparte los trabajos en un grupo acotado de hilos; los trabajos de un
+mismo locus comparten su evaluador y se ejecutan de a uno. Se puede usar
+desde Python (``ServicioDiseno``) o exponer por HTTP en un puerto local o
+en un socket Unix (``crear_servidor``):
+
+- ``POST /trabajos``: encola un trabajo ``{"secuencia": ..., "nombre": ...,
+  "guias": 3, "configuracion": {...}}``; con ``"esperar": true`` responde
+  recién al terminar
+- ``GET /trabajos/<id>``: estado y resultado de un trabajo
+- ``GET /metricas``: profundidad de la cola, trabajos en ejecución y latencias
+- ``GET /salud``: responde ``{"estado": "ok"}``
+"""
+import itertools
+import json
+import os
+import socketserver
+import stat
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import fields
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+from .algoritmo import ejecutar_algoritmo_genetico
+from .configuracion import ConfiguracionAG
+from .evaluacion import Evaluador
+from .lotes import ObjetivoLocus, resumir_resultado
+
+# Campos de ``ConfiguracionAG`` que puede fijar cada trabajo
+CAMPOS_CONFIGURACION = frozenset(campo.name for campo in fields(ConfiguracionAG)) - {"longitud_cromosoma",
+                                                                                    "trabajadores"}
+
+
+class ServicioDiseno:
+    """Recibe trabajos de diseño y los ejecuta en un grupo acotado de hilos.
+
+    Args:
+        trabajadores: Hilos que ejecutan trabajos a la vez
+        max_cola: Trabajos en espera admitidos; los siguientes se rechazan
+        indice: ``IndiceReferencia`` compartido por todos los trabajos
+        puntaje: ``PuntajeEnBlanco`` compartido por todos los trabajos
+        max_loci_en_cache: Loci cuya caché de fitness se conserva (los menos
+            usados recientemente se descartan)
+        max_cromosomas_por_locus: Cromosomas que conserva la caché de cada
+            locus (al terminar un trabajo se descartan los más antiguos)
+        max_trabajos_guardados: Trabajos terminados cuyo resultado se conserva
+        muestras_latencia: Trabajos recientes usados para las latencias
+    """
+
+    def __init__(self, trabajadores=2, max_cola=64, indice=None, puntaje=None, max_loci_en_cache=32,
+                 max_cromosomas_por_locus=100_000, max_trabajos_guardados=1000, muestras_latencia=1000):
+        self.trabajadores = trabajadores
+        self.max_cola = max_cola
+        self.indice = indice
+        self.puntaje = puntaje
+        self.max_loci_en_cache = max_loci_en_cache
+        self.max_cromosomas_por_locus = max_cromosomas_por_locus
+        self.max_trabajos_guardados = max_trabajos_guardados
+        self.completados = 0
+        self.fallidos = 0
+        self.rechazados = 0
+        self._ejecutor = ThreadPoolExecutor(max_workers=trabajadores, thread_name_prefix="sgrna-ga")
+        self._candado = threading.Lock()
+        self._ids = itertools.count(1)
+        self._trabajos = OrderedDict()
+        self._evaluadores = OrderedDict()
+        self._en_cola = 0
+        self._ejecutando = 0
+        self._esperas = deque(maxlen=muestras_latencia)
+        self._ejecuciones = deque(maxlen=muestras_latencia)
+
+    def enviar(self, solicitud):
+        """Encola un trabajo de diseño.
+
+        Args:
+            solicitud: Diccionario con ``secuencia`` (obligatoria) y,
+                opcionalmente, ``nombre``, ``guias``, ``longitud_espaciador``,
+                ``pam`` y ``configuracion`` (campos de ``ConfiguracionAG``)
+
+        Returns:
+            Identificador del trabajo
+
+        Raises:
+            ValueError: Si la solicitud no es válida
+            RuntimeError: Si la cola está llena
+        """
+        secuencia = str(solicitud.get("secuencia") or "").upper()
+        if not secuencia:
+            raise ValueError("La solicitud debe incluir la secuencia del locus")
+        guias = int(solicitud.get("guias", 3))
+        longitud_espaciador = int(solicitud.get("longitud_espaciador", 20))
+        pam = str(solicitud.get("pam", "NGG"))
+        campos = dict(solicitud.get("configuracion") or {})
+        desconocidos = set(campos) - CAMPOS_CONFIGURACION
+        if desconocidos:
+            raise ValueError(f"Campos de configuración desconocidos: {', '.join(sorted(desconocidos))}")
+        configuracion = ConfiguracionAG(longitud_cromosoma=2 * guias * (longitud_espaciador + len(pam)), **campos)
+
+        with self._candado:
+            if self._en_cola >= self.max_cola:
+                self.rechazados += 1
+                raise RuntimeError("La cola de trabajos está llena")
+            identificador = str(next(self._ids))
+            trabajo = {
+                "id": identificador,
+                "nombre": solicitud.get("nombre", identificador),
+                "estado": "en_cola",
+                "resultado": None,
+                "error": None,
+                "_enviado": time.perf_counter(),
+                "_terminado": threading.Event(),
+            }
+            self._trabajos[identificador] = trabajo
+            self._en_cola += 1
+            self._podar_trabajos()
+        self._ejecutor.submit(self._ejecutar, trabajo, secuencia, longitud_espaciador, pam, configuracion)
+        return identificador
+
+    def consultar(self, identificador):
+        """Devuelve el estado público de un trabajo (None si no existe o ya se descartó)."""
+        with self._candado:
+            trabajo = self._trabajos.get(identificador)
+            if trabajo is None:
+                return None
+            return {clave: valor for clave, valor in trabajo.items() if not clave.startswith("_")}
+
+    def esperar(self, identificador, tiempo_maximo=None):
+        """Espera a que un trabajo termine y devuelve su estado."""
+        with self._candado:
+            trabajo = self._trabajos.get(identificador)
+        if trabajo is not None:
+            trabajo["_terminado"].wait(tiempo_maximo)
+        return self.consultar(identificador)
+
+    def metricas(self):
+        """Devuelve la profundidad de la cola, los contadores y las latencias recientes (en segundos)."""
+        with self._candado:
+            metricas = {
+                "en_cola": self._en_cola,
+                "ejecutando": self._ejecutando,
+                "trabajadores": self.trabajadores,
+                "completados": self.completados,
+                "fallidos": self.fallidos,
+                "rechazados": self.rechazados,
+                "loci_en_cache": len(self._evaluadores),
+                "cromosomas_en_cache": sum(len(evaluador.cache) for evaluador, _ in self._evaluadores.values()),
+                "aciertos_cache": sum(evaluador.aciertos_cache for evaluador, _ in self._evaluadores.values()),
+            }
+            latencias = {"espera": list(self._esperas), "ejecucion": list(self._ejecuciones)}
+        for nombre, valores in latencias.items():
+            if valores:
+                metricas[f"{nombre}_media"] = float(np.mean(valores))
+                metricas[f"{nombre}_p50"] = float(np.percentile(valores, 50))
+                metricas[f"{nombre}_p95"] = float(np.percentile(valores, 95))
+        return metricas
+
+    def cerrar(self):
+        """Espera a que terminen los trabajos encolados y libera los hilos."""
+        self._ejecutor.shutdown(wait=True)
+
+    def _evaluador(self, secuencia, longitud_espaciador, pam):
+        """Devuelve ``(evaluador, candado)`` del locus, creándolos si hace falta.
+
+        El ``Evaluador`` y su caché no admiten corridas simultáneas: cada
+        trabajo lo usa con el candado tomado.
+        """
+        clave = (secuencia, longitud_espaciador, pam)
+        with self._candado:
+            entrada = self._evaluadores.get(clave)
+            if entrada is not None:
+                self._evaluadores.move_to_end(clave)
+                return entrada
+        objetivo = ObjetivoLocus(secuencia, longitud_espaciador, pam, self.indice, self.puntaje)
+        with self._candado:
+            entrada = self._evaluadores.setdefault(clave, (Evaluador(objetivo, usar_cache=True), threading.Lock()))
+            while len(self._evaluadores) > self.max_loci_en_cache:
+                self._evaluadores.popitem(last=False)
+        return entrada
+
+    def _ejecutar(self, trabajo, secuencia, longitud_espaciador, pam, configuracion):
+        inicio = time.perf_counter()
+        with self._candado:
+            self._en_cola -= 1
+            self._ejecutando += 1
+            trabajo["estado"] = "ejecutando"
+            self._esperas.append(inicio - trabajo["_enviado"])
+        try:
+            evaluador, candado_locus = self._evaluador(secuencia, longitud_espaciador, pam)
+            with candado_locus:
+                try:
+                    resultado = ejecutar_algoritmo_genetico(configuracion, evaluador=evaluador)
+                finally:
+                    self._recortar_cache(evaluador)
+            fila = resumir_resultado(trabajo["nombre"], resultado, evaluador.funcion_objetivo.longitud_segmento,
+                                     configuracion.minimizar)
+            fila["guias"] = fila["guias"].split(",")
+        except Exception as error:
+            with self._candado:
+                trabajo["estado"] = "error"
+                trabajo["error"] = str(error)
+                self.fallidos += 1
+        else:
+            with self._candado:
+                trabajo["estado"] = "terminado"
+                trabajo["resultado"] = fila
+                self.completados += 1
+        finally:
+            with self._candado:
+                self._ejecutando -= 1
+                self._ejecuciones.append(time.perf_counter() - inicio)
+            trabajo["_terminado"].set()
+
+    def _recortar_cache(self, evaluador):
+        """Descarta de la caché del locus los cromosomas más antiguos por encima de ``max_cromosomas_por_locus``.
+
+        Se llama con el candado del locus tomado, entre un trabajo y el siguiente.
+        """
+        sobrantes = len(evaluador.cache) - self.max_cromosomas_por_locus
+        for clave in list(itertools.islice(evaluador.cache, max(sobrantes, 0))):
+            del evaluador.cache[clave]
+
+    def _podar_trabajos(self):
+        """Descarta los trabajos terminados más viejos por encima de ``max_trabajos_guardados``."""
+        sobrantes = len(self._trabajos) - self.max_trabajos_guardados
+        for identificador in [clave for clave, trabajo in self._trabajos.items()
+                              if trabajo["_terminado"].is_set()][:max(sobrantes, 0)]:
+            del self._trabajos[identificador]
+
+
+class _Manejador(BaseHTTPRequestHandler):
+    """Traduce las solicitudes HTTP en llamadas a ``ServicioDiseno``."""
+
+    def do_GET(self):
+        ruta = urlparse(self.path).path.rstrip("/")
+        servicio = self.server.servicio
+        if ruta == "/salud":
+            self._responder(200, {"estado": "ok"})
+        elif ruta == "/metricas":
+            self._responder(200, servicio.metricas())
+        elif ruta.startswith("/trabajos/"):
+            trabajo = servicio.consultar(ruta.rsplit("/", 1)[-1])
+            if trabajo is None:
+                self._responder(404, {"error": "Trabajo inexistente"})
+            else:
+                self._responder(200, trabajo)
+        else:
+            self._responder(404, {"error": "Ruta inexistente"})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path.rstrip("/") != "/trabajos":
+            self._responder(404, {"error": "Ruta inexistente"})
+            return
+        try:
+            largo = int(self.headers.get("Content-Length") or 0)
+            solicitud = json.loads(self.rfile.read(largo) or b"{}")
+            if not isinstance(solicitud, dict):
+                raise ValueError("El cuerpo debe ser un objeto JSON")
+            identificador = self.server.servicio.enviar(solicitud)
+        except (ValueError, TypeError) as error:
+            self._responder(400, {"error": str(error)})
+            return
+        except RuntimeError as error:
+            self._responder(503, {"error": str(error)})
+            return
+        if solicitud.get("esperar") or parse_qs(url.query).get("esperar"):
+            self._responder(200, self.server.servicio.esperar(identificador))
+        else:
+            self._responder(202, self.server.servicio.consultar(identificador))
+
+    def _responder(self, codigo, cuerpo):
+        datos = json.dumps(cuerpo, ensure_ascii=False).encode("utf-8")
+        self.send_response(codigo)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(datos)))
+        self.end_headers()
+        self.wfile.write(datos)
+
+    def address_string(self):
+        # En un socket Unix la dirección del cliente es una cadena vacía
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+
+    def log_message(self, formato, *argumentos):
+        if self.server.mostrar:
+            super().log_message(formato, *argumentos)
+
+
+class _ServidorUnix(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def crear_servidor(servicio, host="127.0.0.1", puerto=8000, socket_unix=None, mostrar=False):
+    """Crea el servidor HTTP del servicio (sin iniciarlo).
+
+    Args:
+        servicio: ``ServicioDiseno`` que atiende los trabajos
+        host: Dirección donde escuchar por TCP
+        puerto: Puerto TCP (0 para elegir uno libre)
+        socket_unix: Ruta de un socket Unix; si se indica, se usa en lugar de TCP
+        mostrar: Si es True, muestra cada solicitud en la salida de errores
+
+    Returns:
+        Servidor listo para ``serve_forever()``
+
+    Raises:
+        ValueError: Si ``socket_unix`` ya existe y no es un socket
+    """
+    if socket_unix is not None:
+        # Un socket que quedó de una ejecución anterior se reemplaza; cualquier otro archivo, no
+        if os.path.lexists(socket_unix):
+            if not stat.S_ISSOCK(os.lstat(socket_unix).st_mode):
+                raise ValueError(f"{socket_unix!r} existe y no es un socket Unix")
+            os.remove(socket_unix)
+        servidor = _ServidorUnix(socket_unix, _Manejador)
+    else:
+        servidor = ThreadingHTTPServer((host, puerto), _Manejador)
+    servidor.servicio = servicio
+    servidor.mostrar = mostrar
+    return servidor
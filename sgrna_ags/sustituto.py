@@ -0,0 +1,166 @@
+"""Preselección con un modelo sustituto para ahorrar evaluaciones costosas.
+
+Un modelo barato (regresión ridge sobre los bits del cromosoma y los
+conteos de k-meros de nucleótidos, sólo con NumPy) se entrena en línea con
+los cromosomas que ya se evaluaron. En cada generación ordena a los hijos
+por su valor predicho y sólo la fracción superior, más una cuota de
+exploración elegida al azar, pasa por el evaluador real; el resto conserva
+el valor predicho.
+"""
+import numpy as np
+
+from .secuencias import decodificar_nucleotidos
+
+
+class ModeloSustituto:
+    """Regresión ridge en línea sobre características del cromosoma.
+
+    El entrenamiento acumula las estadísticas suficientes ``XᵀX`` y ``Xᵀy``,
+    por lo que actualizar el modelo no requiere guardar los cromosomas.
+
+    Args:
+        k: Largo de los k-meros de nucleótidos contados (0 para no usarlos)
+        regularizacion: Peso de la penalización ridge
+        olvido: Factor (0 a 1] que pondera las muestras viejas en cada
+            actualización; con 1 todas pesan igual
+    """
+
+    def __init__(self, k=3, regularizacion=1.0, olvido=1.0):
+        self.k = k
+        self.regularizacion = regularizacion
+        self.olvido = olvido
+        self.muestras = 0
+        self._xtx = None
+        self._xty = None
+        self._pesos = None
+
+    def caracteristicas(self, poblacion):
+        """Devuelve la matriz de características ``(individuos, características)``.
+
+        Incluye un término constante, los bits del cromosoma y, si la
+        longitud es par y ``k > 0``, los conteos de cada k-mero.
+        """
+        individuos = poblacion.shape[1]
+        columnas = [np.ones((individuos, 1)), poblacion.T.astype(np.float64)]
+        if self.k and poblacion.shape[0] % 2 == 0 and poblacion.shape[0] // 2 >= self.k:
+            codigos = decodificar_nucleotidos(poblacion).astype(np.int64)
+            posiciones = codigos.shape[0] - self.k + 1
+            indices = np.zeros((posiciones, individuos), dtype=np.int64)
+            for desplazamiento in range(self.k):
+                indices = indices * 4 + codigos[desplazamiento:desplazamiento + posiciones]
+            cantidad_kmeros = 4 ** self.k
+            indices += np.arange(individuos) * cantidad_kmeros
+            conteos = np.bincount(indices.ravel(), minlength=individuos * cantidad_kmeros)
+            columnas.append(conteos.reshape(individuos, cantidad_kmeros).astype(np.float64))
+        return np.hstack(columnas)
+
+    def actualizar(self, poblacion, objetivo):
+        """Agrega cromosomas evaluados al entrenamiento y recalcula los pesos."""
+        x = self.caracteristicas(poblacion)
+        y = np.asarray(objetivo, dtype=np.float64)
+        if self._xtx is None:
+            self._xtx = np.zeros((x.shape[1], x.shape[1]))
+            self._xty = np.zeros(x.shape[1])
+        self._xtx *= self.olvido
+        self._xty *= self.olvido
+        self._xtx += x.T @ x
+        self._xty += x.T @ y
+        self.muestras += y.shape[0]
+        penalizacion = self.regularizacion * np.eye(x.shape[1])
+        penalizacion[0, 0] = 0.0  # el término constante no se penaliza
+        self._pesos = np.linalg.solve(self._xtx + penalizacion, self._xty)
+
+    def predecir(self, poblacion):
+        """Devuelve el valor objetivo predicho de cada individuo."""
+        return self.caracteristicas(poblacion) @ self._pesos
+
+
+class PreseleccionSustituta:
+    """Decide qué hijos se evalúan de verdad y lleva las métricas del sustituto.
+
+    Args:
+        modelo: ``ModeloSustituto`` a usar (por defecto uno con k=3)
+        fraccion: Fracción de los hijos con mejor predicción que se evalúa
+        exploracion: Fracción adicional de hijos elegidos al azar que se evalúa
+        minimo_entrenamiento: Muestras necesarias antes de empezar a preseleccionar
+
+    Attributes:
+        evaluaciones_reales: Hijos enviados al evaluador real
+        evaluaciones_ahorradas: Hijos que conservaron el valor predicho
+        confirmados: Individuos con valor predicho que se evaluaron de verdad
+            por quedar entre los mejores
+        historial: Error cuadrático medio y correlación de las predicciones
+            frente al valor real en cada generación
+    """
+
+    def __init__(self, modelo=None, fraccion=0.2, exploracion=0.05, minimo_entrenamiento=50):
+        self.modelo = modelo or ModeloSustituto()
+        self.fraccion = fraccion
+        self.exploracion = exploracion
+        self.minimo_entrenamiento = minimo_entrenamiento
+        self.evaluaciones_reales = 0
+        self.evaluaciones_ahorradas = 0
+        self.confirmados = 0
+        self.historial = []
+
+    def elegir(self, hijos, rng, minimizar=False):
+        """Elige los hijos que pasan al evaluador real.
+
+        Returns:
+            Tupla ``(elegidos, predichos)``: máscara de los hijos a evaluar y
+            valor predicho de cada hijo (None si el modelo aún no se entrenó)
+        """
+        cantidad = hijos.shape[1]
+        if self.modelo.muestras < self.minimo_entrenamiento:
+            return np.ones(cantidad, dtype=bool), None
+        predichos = self.modelo.predecir(hijos)
+        orden = np.argsort(predichos if minimizar else -predichos, kind="stable")
+        elegidos = np.zeros(cantidad, dtype=bool)
+        elegidos[orden[:int(np.ceil(self.fraccion * cantidad))]] = True
+        restantes = np.flatnonzero(~elegidos)
+        cuota = min(int(np.ceil(self.exploracion * cantidad)), restantes.shape[0])
+        elegidos[rng.choice(restantes, size=cuota, replace=False)] = True
+        return elegidos, predichos
+
+    def registrar(self, evaluados, objetivo, predichos=None, omitidos=0, instrumentacion=None):
+        """Entrena el modelo con los hijos evaluados y actualiza las métricas.
+
+        Args:
+            evaluados: Matriz de cromosomas evaluados de verdad
+            objetivo: Valor real de esos cromosomas
+            predichos: Valor que el modelo les había predicho (None si no predijo)
+            omitidos: Hijos que conservaron el valor predicho
+            instrumentacion: Instrumentación donde contar las evaluaciones ahorradas
+        """
+        objetivo = np.asarray(objetivo, dtype=np.float64)
+        self.evaluaciones_reales += objetivo.shape[0]
+        self.evaluaciones_ahorradas += omitidos
+        if instrumentacion is not None:
+            instrumentacion.contar("evaluaciones_ahorradas", omitidos)
+        if predichos is not None and objetivo.shape[0] > 1:
+            error = float(np.sqrt(np.mean((predichos - objetivo) ** 2)))
+            correlacion = float(np.corrcoef(predichos, objetivo)[0, 1]) if objetivo.std() and predichos.std() else 0.0
+            self.historial.append({"error": error, "correlacion": correlacion,
+                                   "evaluados": int(objetivo.shape[0]), "omitidos": int(omitidos)})
+        if objetivo.shape[0]:
+            self.modelo.actualizar(evaluados, objetivo)
+
+    def confirmar(self, evaluados, objetivo, predichos, instrumentacion=None):
+        """Registra la evaluación real de individuos que antes conservaron el valor predicho.
+
+        Descuenta esos individuos de las evaluaciones ahorradas y entrena el
+        modelo con su valor real.
+
+        Args:
+            evaluados: Matriz de cromosomas evaluados de verdad
+            objetivo: Valor real de esos cromosomas
+            predichos: Valor que el modelo les había predicho
+            instrumentacion: Instrumentación donde descontar las evaluaciones ahorradas
+        """
+        objetivo = np.asarray(objetivo, dtype=np.float64)
+        self.evaluaciones_reales += objetivo.shape[0]
+        self.evaluaciones_ahorradas -= objetivo.shape[0]
+        self.confirmados += objetivo.shape[0]
+        if instrumentacion is not None:
+            instrumentacion.contar("evaluaciones_ahorradas", -objetivo.shape[0])
+        self.modelo.actualizar(evaluados, objetivo)
@@ -0,0 +1,107 @@
+"""Utilidades de las pruebas: scripts originales, sorteos guionados y pruebas estadísticas."""
+import importlib.util
+import math
+from pathlib import Path
+
+import numpy as np
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+# Scripts de referencia de ``Pruebas AGs``
+SCRIPTS = {
+    "ruleta_con_elite": "Pruebas AGs/Ruleta/ruleta_con_elite.py",
+    "ruleta_sin_elite": "Pruebas AGs/Ruleta/ruleta_sin_elite.py",
+    "torneo_con_elite": "Pruebas AGs/Torneo/torneo_con_elite.py",
+    "torneo_sin_elite": "Pruebas AGs/Torneo/torneo_sin_elite.py",
+}
+
+# Los scripts trabajan con 10 individuos de 30 genes
+TAMANO = 10
+LONGITUD = 30
+
+
+def cargar_script(nombre):
+    """Importa uno de los scripts originales como módulo (sin ejecutar su ``main``)."""
+    especificacion = importlib.util.spec_from_file_location(f"legado_{nombre}", RAIZ / SCRIPTS[nombre])
+    modulo = importlib.util.module_from_spec(especificacion)
+    especificacion.loader.exec_module(modulo)
+    return modulo
+
+
+def a_listas(poblacion):
+    """Convierte una matriz de NumPy en la lista de listas ``poblacion[gen][individuo]`` de los scripts."""
+    return [[int(gen) for gen in fila] for fila in poblacion]
+
+
+class AzarGuionado:
+    """Reemplaza al módulo ``random`` de un script: cada ``randint`` devuelve el siguiente valor del guion.
+
+    También reemplaza a ``random.Random()``, que usa ``Ruleta``.
+    """
+
+    def __init__(self, valores):
+        self.valores = list(valores)
+
+    def randint(self, minimo, maximo):
+        valor = self.valores.pop(0)
+        assert minimo <= valor <= maximo, f"{valor} fuera de [{minimo}, {maximo}]"
+        return valor
+
+    def Random(self):
+        return self
+
+
+class GeneradorGuionado:
+    """Imita a ``np.random.Generator`` devolviendo, en orden, los arreglos preparados.
+
+    Args:
+        reales: Arreglos que devuelven las llamadas sucesivas a ``random``
+        enteros: Arreglos que devuelven las llamadas sucesivas a ``integers``
+    """
+
+    def __init__(self, reales=(), enteros=()):
+        self.reales = [np.asarray(valor, dtype=np.float64) for valor in reales]
+        self.enteros = [np.asarray(valor, dtype=np.int64) for valor in enteros]
+
+    @property
+    def agotado(self):
+        return not self.reales and not self.enteros
+
+    def random(self, size=None):
+        valor = self.reales.pop(0)
+        assert valor.shape == _forma(size), f"forma {valor.shape}, se pidió {size}"
+        return valor
+
+    def integers(self, low, high=None, size=None, dtype=np.int64):
+        if high is None:
+            low, high = 0, low
+        valor = self.enteros.pop(0)
+        assert valor.shape == _forma(size), f"forma {valor.shape}, se pidió {size}"
+        assert valor.size == 0 or (low <= valor.min() and valor.max() < high), f"valores fuera de [{low}, {high})"
+        return valor.astype(dtype)
+
+
+def _forma(size):
+    return () if size is None else tuple(np.atleast_1d(size))
+
+
+def umbral_chi_cuadrado(grados, z=3.09):
+    """Valor crítico de chi cuadrado (aproximación de Wilson-Hilferty; z=3.09 equivale a p=0.001)."""
+    return grados * (1 - 2 / (9 * grados) + z * math.sqrt(2 / (9 * grados))) ** 3
+
+
+def verificar_chi_cuadrado(observados, probabilidades):
+    """Falla si las frecuencias observadas no son compatibles con las probabilidades esperadas."""
+    observados = np.asarray(observados, dtype=np.float64)
+    esperados = observados.sum() * np.asarray(probabilidades, dtype=np.float64)
+    assert esperados.min() >= 5, "Hacen falta al menos 5 casos esperados por categoría"
+    estadistico = float(((observados - esperados) ** 2 / esperados).sum())
+    umbral = umbral_chi_cuadrado(observados.size - 1)
+    assert estadistico < umbral, f"chi cuadrado {estadistico:.1f} >= {umbral:.1f}"
+
+
+def verificar_proporcion(exitos, ensayos, probabilidad, z=4.0):
+    """Falla si ``exitos`` se aleja más de ``z`` desvíos de lo esperado para una binomial."""
+    esperado = ensayos * probabilidad
+    desvio = math.sqrt(ensayos * probabilidad * (1 - probabilidad))
+    assert abs(exitos - esperado) < z * desvio, f"{exitos} éxitos, se esperaban {esperado:.1f} ± {z * desvio:.1f}"
@@ -0,0 +1,107 @@
+"""Pruebas de los controladores adaptativos de las tasas de crossover y mutación."""
+import numpy as np
+import pytest
+
+from sgrna_ags.adaptacion import CreditoOperadores, ReglaUnQuinto, SrinivasPatnaik, mejoras_por_pareja
+from sgrna_ags.algoritmo import ejecutar_algoritmo_genetico
+from sgrna_ags.configuracion import ConfiguracionAG
+from sgrna_ags.sustituto import PreseleccionSustituta
+
+
+@pytest.fixture
+def configuracion():
+    return ConfiguracionAG(tamano_poblacion=20, numero_ciclos=25, elite=1, semilla=6)
+
+
+def test_regla_un_quinto_dentro_de_los_limites(configuracion):
+    controlador = ReglaUnQuinto(factor=0.5, minimo=1.0, maximo=20.0)
+    ejecutar_algoritmo_genetico(configuracion, adaptacion=controlador)
+    assert len(controlador.registro) == configuracion.numero_ciclos
+    siguientes = [entrada["mutacion_siguiente"] for entrada in controlador.registro]
+    assert all(1.0 <= valor <= 20.0 for valor in siguientes)
+    # Con factor 0.5 la mutación llega a alguno de los límites
+    assert {1.0, 20.0} & set(siguientes)
+
+
+@pytest.mark.parametrize("exito, esperado", [(1.0, 8.0), (0.0, 2.0)])
+def test_regla_un_quinto_recorta(exito, esperado):
+    controlador = ReglaUnQuinto(factor=0.25, minimo=2.0, maximo=8.0)
+    controlador.mutacion = 5.0
+    controlador.registro.append({})
+    padres = np.zeros(10)
+    controlador.observar(padres, padres + (1.0 if exito else -1.0))
+    assert controlador.mutacion == esperado
+
+
+class SustitutoSinEvaluar(PreseleccionSustituta):
+    """Predice para todos los hijos un valor mejor que cualquier real."""
+
+    def elegir(self, hijos, rng, minimizar=False):
+        return np.zeros(hijos.shape[1], dtype=bool), np.full(hijos.shape[1], 10.0)
+
+
+def test_mejoras_sin_los_hijos_predichos():
+    padres = np.array([1.0, 2.0, 1.0, 2.0, 1.0, 2.0])
+    hijos = np.array([3.0, 0.0, 3.0, 0.0, 3.0, 0.0])
+    reales = np.array([True, True, False, True, False, False])
+    mejoras = mejoras_por_pareja(padres, hijos, reales=reales)
+    assert mejoras[:2].tolist() == [1.0, -2.0] and np.isnan(mejoras[2])
+    controlador = CreditoOperadores(operadores=("un_punto", "dos_puntos"))
+    controlador._elegidos = np.array([0, 0, 1])
+    controlador.registro.append({})
+    controlador.observar(padres, hijos, reales=reales)
+    assert controlador.registro[-1]["exito"] == 0.5
+    assert "recompensa_dos_puntos" not in controlador.registro[-1]
+    assert controlador.calidades[1] == 0.0
+
+
+def test_las_predicciones_del_sustituto_no_cuentan_como_exito(configuracion):
+    controlador = ReglaUnQuinto(minimo=1.0)
+    ejecutar_algoritmo_genetico(configuracion, sustituto=SustitutoSinEvaluar(), adaptacion=controlador)
+    assert [entrada["exito"] for entrada in controlador.registro] == [0.0] * configuracion.numero_ciclos
+    assert controlador.mutacion == 1.0
+
+
+def test_srinivas_patnaik_muta_incluso_al_mejor(configuracion):
+    controlador = SrinivasPatnaik(mutacion_minima=0.5)
+    objetivo = np.arange(10.0)
+    seleccion = np.array([9, 9, 9, 8, 0, 1, 5, 9])
+    decision = controlador.decidir(1, np.zeros((4, 10), dtype=np.uint8), objetivo, seleccion, configuracion,
+                                   np.random.default_rng(0))
+    assert decision.mutacion.shape == (8,) and decision.crossover.shape == (4,)
+    assert decision.mutacion.min() == 0.5
+    assert np.all(decision.mutacion <= controlador.k4)
+    assert decision.crossover[0] == 0.0
+    assert np.all((decision.crossover >= 0) & (decision.crossover <= controlador.k3))
+
+
+def test_srinivas_patnaik_sin_diferencias_usa_tasas_maximas(configuracion):
+    controlador = SrinivasPatnaik()
+    decision = controlador.decidir(1, np.zeros((4, 6), dtype=np.uint8), np.ones(6), np.arange(6), configuracion,
+                                   np.random.default_rng(0))
+    assert decision.crossover.tolist() == [controlador.k3] * 3
+    assert decision.mutacion.tolist() == [controlador.k4] * 6
+
+
+def test_srinivas_patnaik_en_la_corrida(configuracion):
+    controlador = SrinivasPatnaik()
+    ejecutar_algoritmo_genetico(configuracion, adaptacion=controlador)
+    for entrada in controlador.registro:
+        assert 0.5 <= entrada["mutacion"] <= controlador.k4
+        assert 0.0 <= entrada["crossover"] <= controlador.k3
+
+
+def test_credito_operadores_respeta_el_minimo(configuracion):
+    controlador = CreditoOperadores(probabilidad_minima=0.1)
+    ejecutar_algoritmo_genetico(configuracion, adaptacion=controlador)
+    probabilidades = [[entrada[f"p_{nombre}"] for nombre in controlador.operadores]
+                      for entrada in controlador.registro]
+    assert np.allclose(np.sum(probabilidades, axis=1), 1.0)
+    assert np.min(probabilidades) >= 0.1 - 1e-12
+
+
+def test_credito_operadores_rechaza_minimos_imposibles():
+    with pytest.raises(ValueError):
+        CreditoOperadores(operadores=("un_punto", "dos_puntos"), probabilidad_minima=0.6)
+    with pytest.raises(ValueError):
+        CreditoOperadores(operadores=("desconocido",))
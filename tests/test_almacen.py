@@ -0,0 +1,62 @@
+"""Pruebas del almacén persistente de valores objetivo."""
+import itertools
+
+import pytest
+
+from sgrna_ags import almacen as modulo_almacen
+from sgrna_ags.algoritmo import ejecutar_algoritmo_genetico
+from sgrna_ags.almacen import AlmacenFitness
+from sgrna_ags.configuracion import ConfiguracionAG
+
+
+@pytest.fixture
+def reloj(monkeypatch):
+    """Reemplaza el reloj del almacén por uno que avanza un segundo por llamada."""
+    instantes = itertools.count(1)
+    monkeypatch.setattr(modulo_almacen.time, "time", lambda: float(next(instantes)))
+
+
+def test_reutiliza_entre_corridas(tmp_path):
+    ruta = str(tmp_path / "fitness.sqlite")
+    configuracion = ConfiguracionAG(tamano_poblacion=12, numero_ciclos=6, semilla=9)
+    with AlmacenFitness(ruta, "cuadratico") as almacen:
+        primera = ejecutar_algoritmo_genetico(configuracion, almacen=almacen)
+    with AlmacenFitness(ruta, "cuadratico") as almacen:
+        assert len(almacen) == primera.evaluaciones > 0
+        segunda = ejecutar_algoritmo_genetico(configuracion, almacen=almacen)
+        assert almacen.aciertos == almacen.consultas > 0 and almacen.guardados == 0
+    assert segunda.evaluaciones == 0
+    assert segunda.historial == primera.historial
+
+
+def test_versiones_y_longitudes_aisladas(tmp_path):
+    ruta = str(tmp_path / "fitness.sqlite")
+    with AlmacenFitness(ruta, "v1") as almacen:
+        assert almacen.guardar({b"a": 1.5, b"b": [1.0, -2.0]}, 8) == 2
+        assert almacen.guardar({b"a": 9.0}, 8) == 0
+        assert almacen.buscar([b"a", b"b", b"c"], 8) == {b"a": 1.5, b"b": [1.0, -2.0]}
+        assert almacen.buscar([b"a"], 16) == {}
+    with AlmacenFitness(ruta, "v2") as almacen:
+        assert almacen.buscar([b"a", b"b"], 8) == {}
+        almacen.guardar({b"a": 3.0}, 8)
+        assert len(almacen) == 3
+    with AlmacenFitness(ruta, "v1") as almacen:
+        assert almacen.buscar([b"a"], 8) == {b"a": 1.5}
+
+
+@pytest.mark.parametrize("actualizar_uso, descartada", [(True, b"b"), (False, b"a")])
+def test_descarta_la_menos_usada(tmp_path, reloj, actualizar_uso, descartada):
+    with AlmacenFitness(str(tmp_path / "fitness.sqlite"), "v", max_entradas=3,
+                        actualizar_uso=actualizar_uso) as almacen:
+        for clave in (b"a", b"b", b"c"):
+            almacen.guardar({clave: 1.0}, 4)
+        almacen.buscar([b"a"], 4)
+        almacen.guardar({b"d": 1.0}, 4)
+        assert len(almacen) == 3 and almacen.descartados == 1
+        restantes = almacen.buscar([b"a", b"b", b"c", b"d"], 4)
+    assert set(restantes) == {b"a", b"b", b"c", b"d"} - {descartada}
+
+
+def test_max_entradas_invalido(tmp_path):
+    with pytest.raises(ValueError):
+        AlmacenFitness(str(tmp_path / "fitness.sqlite"), "v", max_entradas=0)
@@ -0,0 +1,80 @@
+"""Pruebas de la evaluación asincrónica."""
+import threading
+from concurrent.futures import CancelledError, ThreadPoolExecutor, wait
+
+import numpy as np
+
+from sgrna_ags.asincrono import ejecutar_asincrono
+from sgrna_ags.configuracion import ConfiguracionAG
+from sgrna_ags.evaluacion import Evaluador, claves_cromosomas, objetivo_cuadratico
+
+
+def test_cromosomas_en_vuelo_no_se_reenvian():
+    liberar = threading.Event()
+    llamados = []
+
+    def objetivo_lento(poblacion):
+        llamados.append(poblacion.shape[1])
+        liberar.wait(5)
+        return objetivo_cuadratico(poblacion)
+
+    poblacion = np.random.default_rng(0).integers(0, 2, size=(30, 6), dtype=np.uint8)
+    segundo = poblacion[:, [0, 1, 1, 2]]
+    evaluador = Evaluador(objetivo_lento, usar_cache=True)
+    with ThreadPoolExecutor(2) as ejecutor:
+        primero_futuro = evaluador.evaluar_asincrono(ejecutor, poblacion)
+        segundo_futuro = evaluador.evaluar_asincrono(ejecutor, segundo)
+        liberar.set()
+        wait([primero_futuro, segundo_futuro])
+        # Los hilos del ejecutor no escriben la caché: la escribe quien recoge el resultado
+        assert not evaluador.cache
+        assert np.array_equal(evaluador.resultado(segundo_futuro), objetivo_cuadratico(segundo))
+        assert np.array_equal(evaluador.resultado(primero_futuro), objetivo_cuadratico(poblacion))
+    assert llamados == [6]
+    assert evaluador.evaluaciones == 6
+    assert len(evaluador.cache) == 6
+    assert not evaluador._en_vuelo
+
+
+def test_corrida_asincrona_con_cache_no_repite_evaluaciones():
+    configuracion = ConfiguracionAG(tamano_poblacion=20, numero_ciclos=10, usar_cache=True, trabajadores=3, semilla=4)
+    evaluados = []
+
+    def objetivo_contado(poblacion):
+        evaluados.extend(claves_cromosomas(poblacion))
+        return objetivo_cuadratico(poblacion)
+
+    resultado = ejecutar_asincrono(configuracion, objetivo_contado)
+    assert resultado.evaluaciones == len(evaluados) == len(set(evaluados))
+    assert len(resultado.historial) == 11
+    assert np.array_equal(resultado.objetivo, objetivo_cuadratico(resultado.poblacion))
+
+
+def test_envio_no_recogido_igual_llega_a_la_cache():
+    poblacion = np.random.default_rng(1).integers(0, 2, size=(30, 5), dtype=np.uint8)
+    evaluador = Evaluador(usar_cache=True)
+    with ThreadPoolExecutor(1) as ejecutor:
+        wait([evaluador.evaluar_asincrono(ejecutor, poblacion)])
+        # El resultado nunca se recoge: el siguiente pedido encuentra los valores en la caché
+        repetido = evaluador.evaluar_asincrono(ejecutor, poblacion)
+        assert np.array_equal(evaluador.resultado(repetido), objetivo_cuadratico(poblacion))
+    assert evaluador.evaluaciones == 5 and evaluador.aciertos_cache == 5
+    assert not evaluador._en_vuelo and len(evaluador.cache) == 5
+
+
+def test_envio_cancelado_se_vuelve_a_evaluar():
+    poblacion = np.random.default_rng(2).integers(0, 2, size=(30, 4), dtype=np.uint8)
+    evaluador = Evaluador(usar_cache=True)
+    liberar = threading.Event()
+    ejecutor = ThreadPoolExecutor(1)
+    ejecutor.submit(liberar.wait, 5)
+    cancelado = evaluador.evaluar_asincrono(ejecutor, poblacion)
+    ejecutor.shutdown(wait=False, cancel_futures=True)
+    liberar.set()
+    assert not evaluador.cache
+    with ThreadPoolExecutor(1) as otro:
+        nuevo = evaluador.evaluar_asincrono(otro, poblacion)
+        assert np.array_equal(evaluador.resultado(nuevo), objetivo_cuadratico(poblacion))
+    assert isinstance(cancelado.exception(timeout=1), CancelledError)
+    assert evaluador.evaluaciones == 8
+    assert not evaluador._en_vuelo and len(evaluador.cache) == 4
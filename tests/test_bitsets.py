@@ -0,0 +1,75 @@
+"""Pruebas de las distancias empaquetadas, el fitness compartido y la eliminación de duplicados."""
+import numpy as np
+import pytest
+
+from sgrna_ags.algoritmo import ejecutar_algoritmo_genetico, seleccionar_padres
+from sgrna_ags.bitsets import compartir_fitness, contar_nichos, distancias_hamming, empaquetar, marcar_duplicados
+from sgrna_ags.configuracion import ConfiguracionAG
+
+
+@pytest.fixture
+def poblacion():
+    return np.random.default_rng(3).integers(0, 2, size=(70, 25), dtype=np.uint8)
+
+
+def test_distancias_iguales_a_las_densas(poblacion):
+    empaquetada = empaquetar(poblacion)
+    densas = (poblacion[:, :, None] != poblacion[:, None, :]).sum(axis=0)
+    assert np.array_equal(distancias_hamming(empaquetada, empaquetada), densas)
+
+
+def test_contar_nichos_por_fuerza_bruta(poblacion):
+    radio, alfa = 30, 2.0
+    densas = (poblacion[:, :, None] != poblacion[:, None, :]).sum(axis=0)
+    esperado = np.maximum(0.0, 1.0 - (densas / radio) ** alfa).sum(axis=1)
+    assert np.allclose(contar_nichos(poblacion, radio, alfa), esperado)
+
+
+def test_marcar_duplicados_conserva_la_primera_copia(poblacion):
+    poblacion[:, [4, 9]] = poblacion[:, [1, 1]]
+    poblacion[:, 12] = poblacion[:, 7]
+    assert np.flatnonzero(marcar_duplicados(poblacion)).tolist() == [4, 9, 12]
+
+
+def test_compartir_rechaza_fitness_negativo(poblacion):
+    with pytest.raises(ValueError, match="no negativo"):
+        compartir_fitness(np.linspace(-1, 1, poblacion.shape[1]), poblacion, 5)
+
+
+def test_compartir_con_objetivo_negativo_exige_escalado(poblacion):
+    objetivo = -np.arange(1.0, poblacion.shape[1] + 1)
+    rng = np.random.default_rng(0)
+    crudo = ConfiguracionAG(tamano_poblacion=25, longitud_cromosoma=70, nichos="compartido")
+    with pytest.raises(ValueError, match="ranking"):
+        seleccionar_padres(crudo, objetivo, 10, rng, poblacion)
+    ranking = ConfiguracionAG(tamano_poblacion=25, longitud_cromosoma=70, nichos="compartido",
+                              escalado_fitness="ranking")
+    assert seleccionar_padres(ranking, objetivo, 10, rng, poblacion).shape == (10,)
+
+
+@pytest.mark.parametrize("seleccion, esperados", [("torneo", {0, 1, 2}), ("ruleta", {0})])
+def test_sin_duplicados_nunca_elige_una_copia(poblacion, seleccion, esperados):
+    # Casi toda la población repite al individuo 0, el mejor: los torneos formados
+    # sólo por copias no pueden devolver una copia
+    poblacion[:, 3:] = poblacion[:, [0]]
+    objetivo = np.zeros(poblacion.shape[1])
+    objetivo[0] = objetivo[3:] = 10.0
+    configuracion = ConfiguracionAG(tamano_poblacion=25, longitud_cromosoma=70, seleccion=seleccion,
+                                    eliminar_duplicados=True)
+    elegidos = seleccionar_padres(configuracion, objetivo, 2000, np.random.default_rng(1), poblacion)
+    assert set(elegidos.tolist()) == esperados
+
+
+def test_sin_duplicados_con_ruleta_de_fitness_nulo_elige_entre_unicos(poblacion):
+    poblacion[:, 2:] = poblacion[:, [0]]
+    configuracion = ConfiguracionAG(tamano_poblacion=25, longitud_cromosoma=70, seleccion="ruleta",
+                                    eliminar_duplicados=True)
+    elegidos = seleccionar_padres(configuracion, np.zeros(25), 1000, np.random.default_rng(2), poblacion)
+    assert set(elegidos.tolist()) == {0, 1}
+
+
+def test_corrida_con_nichos_y_sin_duplicados():
+    configuracion = ConfiguracionAG(tamano_poblacion=30, longitud_cromosoma=40, numero_ciclos=15,
+                                    nichos="compartido", eliminar_duplicados=True, semilla=5)
+    resultado = ejecutar_algoritmo_genetico(configuracion, lambda poblacion: poblacion.sum(axis=0))
+    assert resultado.historial[-1]["maximo"] > resultado.historial[0]["maximo"]
@@ -0,0 +1,74 @@
+"""Pruebas de la línea de comandos ``sgrna-ga``."""
+import json
+import sys
+
+import pytest
+
+from sgrna_ags.cli import crear_parser, main
+
+
+def correr(ruta, *opciones):
+    assert main(["run", "--pop", "20", "--gens", "5", "--seed", "3", "--out", str(ruta), *opciones]) == 0
+    return json.loads(ruta.read_text(encoding="utf-8"))
+
+
+def test_modo_por_defecto_generacional():
+    argumentos = crear_parser().parse_args(["run", "--workers", "4"])
+    assert argumentos.mode == "generacional"
+
+
+def test_trabajadores_no_cambian_el_resultado(tmp_path):
+    serial = correr(tmp_path / "serial.json")
+    primera = correr(tmp_path / "primera.json", "--workers", "2")
+    segunda = correr(tmp_path / "segunda.json", "--workers", "2")
+    assert primera == segunda == serial
+    assert len(serial) == 6
+
+
+def test_run_exporta_historial_e_instrumentacion(tmp_path, capsys):
+    historial = tmp_path / "historial.csv"
+    instrumentacion = tmp_path / "instrumentacion.csv"
+    assert main(["run", "--pop", "10", "--gens", "4", "--elite", "1", "--selection", "roulette", "--seed", "1",
+                 "--out", str(historial), "--instrumentation", str(instrumentacion)]) == 0
+    lineas = historial.read_text(encoding="utf-8").splitlines()
+    assert lineas[0] == "generacion;cromosoma;maximo;minimo;promedio"
+    assert len(lineas) == 6
+    assert len(instrumentacion.read_text(encoding="utf-8").splitlines()) == 6
+    assert "Mejor cromosoma:" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("nombre, mensaje", [("historial.txt", "Formato de salida desconocido"),
+                                              ("historial.parquet", "instale pyarrow")])
+def test_run_rechaza_la_salida_antes_de_correr(tmp_path, capsys, monkeypatch, nombre, mensaje):
+    # Ninguna generación llega a mostrarse: la salida se verifica antes de la corrida
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+    monkeypatch.setitem(sys.modules, "pyarrow.parquet", None)
+    with pytest.raises(SystemExit) as salida:
+        main(["run", "--gens", "1", "--verbose", "--out", str(tmp_path / nombre)])
+    assert salida.value.code == 2
+    capturado = capsys.readouterr()
+    assert mensaje in capturado.err and "Población" not in capturado.out
+    assert not (tmp_path / nombre).exists()
+
+
+@pytest.mark.parametrize("objetivo", ["modulo_inexistente:f", "sgrna_ags.evaluacion:inexistente"])
+def test_run_rechaza_objetivo_que_no_se_puede_cargar(capsys, objetivo):
+    with pytest.raises(SystemExit) as salida:
+        main(["run", "--gens", "1", "--objective", objetivo])
+    assert salida.value.code == 2
+    assert "No se pudo cargar la función objetivo" in capsys.readouterr().err
+
+
+def test_batch_con_referencia(tmp_path, capsys):
+    objetivos = tmp_path / "loci.fasta"
+    objetivos.write_text(">uno descripcion\nTTTACGTACGTACGTACGTACGTAGGTT\nCCATTGCAGGATCCGATTAGCAAGGC\n"
+                         ">sin_pam\n" + "A" * 60 + "\n", encoding="utf-8")
+    referencia = tmp_path / "genoma.fasta"
+    referencia.write_text(">chr1\nACGTACGTACNNGTTTACGTACGTACGT\n", encoding="utf-8")
+    salida = tmp_path / "guias.csv"
+    assert main(["batch", "--targets", str(objetivos), "--reference", str(referencia), "--seed-length", "6",
+                 "--guides", "2", "--pop", "10", "--gens", "3", "--seed", "1", "--out", str(salida)]) == 0
+    assert "Loci procesados: 2" in capsys.readouterr().out
+    lineas = salida.read_text(encoding="utf-8").splitlines()
+    assert lineas[0].split(";")[:3] == ["nombre", "estado", "mensaje"]
+    assert [linea.split(";")[:2] for linea in lineas[1:]] == [["uno", "ok"], ["sin_pam", "error"]]
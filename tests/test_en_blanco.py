@@ -0,0 +1,52 @@
+"""Pruebas del puntaje en el blanco con tablas por posición."""
+import math
+
+import numpy as np
+import pytest
+
+from sgrna_ags.en_blanco import PuntajeEnBlanco
+from sgrna_ags.secuencias import NUCLEOTIDOS, cromosoma_a_secuencia
+
+
+def puntaje_directo(secuencia, pesos, dinucleotidos, intercepto, logistica):
+    """Puntaje de una guía recorriendo la secuencia base por base."""
+    total = intercepto + sum(pesos[i, NUCLEOTIDOS.index(base)] for i, base in enumerate(secuencia))
+    if dinucleotidos is not None:
+        total += sum(dinucleotidos[i, NUCLEOTIDOS.index(a) * 4 + NUCLEOTIDOS.index(b)]
+                     for i, (a, b) in enumerate(zip(secuencia, secuencia[1:])))
+    return 1 / (1 + math.exp(-total)) if logistica else total
+
+
+@pytest.mark.parametrize("agregacion", ["suma", "media", "minimo"])
+@pytest.mark.parametrize("logistica", [False, True])
+def test_coincide_con_el_recorrido_directo(agregacion, logistica):
+    rng = np.random.default_rng(0)
+    posiciones, segmento, guias = 20, 23, 3
+    pesos = rng.normal(size=(posiciones, 4))
+    dinucleotidos = rng.normal(size=(posiciones - 1, 16))
+    puntaje = PuntajeEnBlanco(pesos, dinucleotidos, 0.3, logistica, segmento, agregacion)
+    poblacion = rng.integers(0, 2, size=(2 * segmento * guias, 15), dtype=np.uint8)
+    combinar = {"suma": sum, "media": lambda v: sum(v) / len(v), "minimo": min}[agregacion]
+    esperado = []
+    for individuo in range(poblacion.shape[1]):
+        secuencia = cromosoma_a_secuencia(poblacion, individuo)
+        guias_individuo = [secuencia[g * segmento:g * segmento + posiciones] for g in range(guias)]
+        esperado.append(combinar([puntaje_directo(guia, pesos, dinucleotidos, 0.3, logistica)
+                                  for guia in guias_individuo]))
+    assert np.allclose(puntaje(poblacion), esperado)
+
+
+def test_desde_caracteristicas():
+    puntaje = PuntajeEnBlanco.desde_caracteristicas(4, [(0, "G", 1.0), (3, "T", -2.0), (1, "CA", 0.5)],
+                                                    intercepto=0.1)
+    poblacion = np.array([[1, 0, 0, 1, 0, 0, 1, 1], [0, 0, 0, 0, 0, 0, 0, 0]], dtype=np.uint8).T  # GCAT, AAAA
+    assert np.allclose(puntaje(poblacion), [0.1 + 1.0 + 0.5 - 2.0, 0.1])
+
+
+def test_formas_invalidas():
+    with pytest.raises(ValueError, match="forma"):
+        PuntajeEnBlanco(np.zeros((5, 3)))
+    with pytest.raises(ValueError, match="Agregación"):
+        PuntajeEnBlanco(np.zeros((5, 4)), agregacion="maximo")
+    with pytest.raises(ValueError, match="múltiplo"):
+        PuntajeEnBlanco(np.zeros((5, 4)))(np.zeros((12, 2), dtype=np.uint8))
@@ -0,0 +1,145 @@
+"""Pruebas estadísticas de los operadores vectorizados.
+
+Comprueban con semillas fijas que cada operador sortea con la
+distribución que documenta: frecuencias de selección del torneo y la
+ruleta, cantidad y posición de las mutaciones, tasa de cruce y
+distribución de los puntos de corte. Usan chi cuadrado y aproximaciones
+normales con umbrales holgados (p = 0.001), por lo que sólo fallan si
+cambia la distribución, no por la semilla.
+"""
+import numpy as np
+import pytest
+
+from ayudantes import verificar_chi_cuadrado, verificar_proporcion
+from sgrna_ags.evaluacion import transformar_fitness
+from sgrna_ags.operadores import (
+    aplicar_crossover,
+    aplicar_mutacion,
+    generar_poblacion_inicial,
+    seleccion_por_ruleta,
+    seleccion_por_torneo,
+)
+
+SORTEOS = 20000
+
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(2024)
+
+
+def padres_opuestos(longitud, parejas):
+    """Población con un padre de ceros y otro de unos, y una selección que siempre los empareja."""
+    poblacion = np.zeros((longitud, 2), dtype=np.uint8)
+    poblacion[:, 1] = 1
+    return poblacion, np.tile([0, 1], parejas)
+
+
+def test_poblacion_inicial_equiprobable(rng):
+    poblacion = generar_poblacion_inicial(1000, 30, rng)
+    verificar_proporcion(int(poblacion.sum()), poblacion.size, 0.5)
+    verificar_chi_cuadrado(poblacion.sum(axis=1), np.full(30, 1 / 30))
+
+
+@pytest.mark.parametrize("tamano_torneo", [2, 4])
+def test_frecuencias_del_torneo(rng, tamano_torneo):
+    # Con fitness distintos, el individuo de rango r (1 = peor) gana si es el
+    # mejor de los sorteados: P(r) = (r / N)^k - ((r - 1) / N)^k
+    tamano = 5
+    fitness = rng.permutation(tamano).astype(np.float64)
+    rangos = fitness + 1
+    probabilidades = (rangos / tamano) ** tamano_torneo - ((rangos - 1) / tamano) ** tamano_torneo
+    seleccion = seleccion_por_torneo(fitness, SORTEOS, rng, tamano_torneo)
+    verificar_chi_cuadrado(np.bincount(seleccion, minlength=tamano), probabilidades)
+
+
+@pytest.mark.parametrize("escalado", ["crudo", "ranking", "sigma"])
+def test_frecuencias_de_la_ruleta(rng, escalado):
+    objetivo = np.array([0.5, 1.0, 2.0, 3.5, 5.0, 8.0])
+    fitness = transformar_fitness(objetivo, escalado)
+    seleccion = seleccion_por_ruleta(fitness, SORTEOS, rng)
+    observados = np.bincount(seleccion, minlength=fitness.size)
+    positivos = fitness > 0
+    # Un individuo con fitness nulo nunca debe salir
+    assert not observados[~positivos].any()
+    verificar_chi_cuadrado(observados[positivos], fitness[positivos] / fitness.sum())
+
+
+def test_ruleta_uniforme_sin_fitness(rng):
+    seleccion = seleccion_por_ruleta(np.zeros(8), SORTEOS, rng)
+    verificar_chi_cuadrado(np.bincount(seleccion, minlength=8), np.full(8, 1 / 8))
+
+
+@pytest.mark.parametrize("probabilidad", [5, 30])
+def test_mutacion_invierte_un_gen_uniforme(rng, probabilidad):
+    longitud, elite = 30, 3
+    poblacion = np.zeros((longitud, SORTEOS + elite), dtype=np.uint8)
+    individuos, genes = aplicar_mutacion(poblacion, probabilidad, rng, inicio=elite)
+
+    assert not poblacion[:, :elite].any()
+    invertidos = poblacion.sum(axis=0)
+    assert invertidos.max() <= 1
+    assert np.array_equal(np.flatnonzero(invertidos), individuos)
+    assert np.array_equal(poblacion[genes, individuos], np.ones(individuos.size))
+    verificar_proporcion(individuos.size, SORTEOS, probabilidad / 100)
+    verificar_chi_cuadrado(np.bincount(genes, minlength=longitud), np.full(longitud, 1 / longitud))
+
+
+@pytest.mark.parametrize("probabilidad", [75, 40])
+def test_crossover_un_punto(rng, probabilidad):
+    longitud = 30
+    poblacion, seleccion = padres_opuestos(longitud, SORTEOS)
+    hijos = np.empty((longitud, 2 * SORTEOS), dtype=np.uint8)
+    puntos = aplicar_crossover(poblacion, hijos, seleccion, probabilidad, rng)
+
+    # Cada gen de la pareja proviene de uno de los dos padres
+    assert np.all(hijos[:, 0::2] + hijos[:, 1::2] == 1)
+    # El primer hijo lleva ceros hasta el punto de corte y unos después
+    cortes = longitud - hijos[:, 0::2].sum(axis=0)
+    assert np.array_equal(cortes, puntos)
+    cruzadas = puntos < longitud
+    verificar_proporcion(int(cruzadas.sum()), SORTEOS, probabilidad / 100)
+    verificar_chi_cuadrado(np.bincount(puntos[cruzadas], minlength=longitud)[1:],
+                           np.full(longitud - 1, 1 / (longitud - 1)))
+
+
+def test_crossover_con_probabilidad_por_pareja(rng):
+    longitud = 20
+    poblacion, seleccion = padres_opuestos(longitud, 1000)
+    probabilidades = np.tile([0.0, 100.0], 500)
+    hijos = np.empty((longitud, 2000), dtype=np.uint8)
+    puntos = aplicar_crossover(poblacion, hijos, seleccion, probabilidades, rng)
+    assert np.all(puntos[0::2] == longitud)
+    assert np.all(puntos[1::2] < longitud)
+
+
+def test_crossover_dos_puntos(rng):
+    longitud = 30
+    poblacion, seleccion = padres_opuestos(longitud, SORTEOS)
+    hijos = np.empty((longitud, 2 * SORTEOS), dtype=np.uint8)
+    aplicar_crossover(poblacion, hijos, seleccion, 100, rng, operadores=np.ones(SORTEOS, dtype=np.intp))
+
+    assert np.all(hijos[:, 0::2] + hijos[:, 1::2] == 1)
+    # El primer hijo toma del otro padre un único tramo contiguo
+    tramos = np.diff(hijos[:, 0::2].astype(np.int8), axis=0)
+    assert np.all((tramos == 1).sum(axis=0) <= 1)
+    assert np.all((tramos == -1).sum(axis=0) <= 1)
+    # Con dos cortes a y b uniformes en 1..L-1, el gen g se intercambia si
+    # min(a, b) <= g < max(a, b): P(g) = 2 * g * (L - 1 - g) / (L - 1)^2
+    intercambiados = hijos[:, 0::2].sum(axis=1)
+    assert intercambiados[0] == intercambiados[-1] == 0
+    for gen in range(1, longitud - 1):
+        probabilidad = 2 * gen * (longitud - 1 - gen) / (longitud - 1) ** 2
+        verificar_proporcion(int(intercambiados[gen]), SORTEOS, probabilidad)
+
+
+def test_crossover_uniforme(rng):
+    longitud = 30
+    poblacion, seleccion = padres_opuestos(longitud, SORTEOS)
+    hijos = np.empty((longitud, 2 * SORTEOS), dtype=np.uint8)
+    aplicar_crossover(poblacion, hijos, seleccion, 100, rng, operadores=np.full(SORTEOS, 2, dtype=np.intp))
+
+    assert np.all(hijos[:, 0::2] + hijos[:, 1::2] == 1)
+    intercambiados = hijos[:, 0::2].sum(axis=1)
+    for gen in range(longitud):
+        verificar_proporcion(int(intercambiados[gen]), SORTEOS, 0.5)
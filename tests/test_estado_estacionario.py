@@ -0,0 +1,54 @@
+"""Pruebas del modo de estado estacionario."""
+import numpy as np
+import pytest
+
+from sgrna_ags.algoritmo import seleccionar_padres
+from sgrna_ags.configuracion import ConfiguracionAG
+from sgrna_ags.estado_estacionario import (
+    EstadisticasIncrementales,
+    ejecutar_estado_estacionario,
+    elegir_reemplazados,
+    seleccionar_padres_paso,
+)
+
+
+@pytest.mark.parametrize("minimizar", [False, True])
+def test_torneo_del_paso_elige_los_mismos_padres(minimizar):
+    configuracion = ConfiguracionAG(tamano_poblacion=50, minimizar=minimizar)
+    objetivo = np.random.default_rng(0).integers(0, 10, size=50).astype(np.float64)
+    esperados = seleccionar_padres(configuracion, objetivo, 200, np.random.default_rng(1))
+    obtenidos = seleccionar_padres_paso(configuracion, objetivo, 200, np.random.default_rng(1), None)
+    assert np.array_equal(obtenidos, esperados)
+
+
+def test_estadisticas_incrementales_coinciden_con_el_recalculo():
+    rng = np.random.default_rng(3)
+    objetivo = rng.random(40)
+    estadisticas = EstadisticasIncrementales(objetivo)
+    for _ in range(500):
+        estadisticas.reemplazar(int(rng.integers(40)), rng.random())
+    actuales = estadisticas.estadisticas()
+    assert actuales.maximo == objetivo.max() and actuales.minimo == objetivo.min()
+    assert actuales.promedio == pytest.approx(objetivo.mean())
+    assert estadisticas.peores(3) == np.argsort(objetivo)[:3].tolist()
+
+
+@pytest.mark.parametrize("elite", [0, 1])
+def test_torneo_inverso_sin_reposicion(elite):
+    # Con torneos de 4 entre 6 individuos, los perdedores se repetirían a menudo
+    configuracion = ConfiguracionAG(tamano_poblacion=6, reemplazo="torneo", elite=elite)
+    rng = np.random.default_rng(5)
+    for _ in range(200):
+        estadisticas = EstadisticasIncrementales(rng.random(6))
+        perdedores = elegir_reemplazados(configuracion, estadisticas, 4, rng)
+        assert len(perdedores) == len(set(perdedores)) == 4
+        if elite:
+            assert estadisticas.mejor() not in perdedores
+
+
+def test_corrida_con_torneo_inverso_conserva_al_mejor():
+    configuracion = ConfiguracionAG(tamano_poblacion=8, hijos_por_paso=4, reemplazo="torneo", elite=1,
+                                    numero_ciclos=5, semilla=2)
+    resultado = ejecutar_estado_estacionario(configuracion)
+    assert resultado.evaluaciones == 8 + 5 * 8
+    assert resultado.historial[-1]["maximo"] >= resultado.historial[0]["maximo"]
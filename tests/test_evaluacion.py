@@ -0,0 +1,63 @@
+"""Pruebas del fitness de la ruleta cuando se minimiza el objetivo."""
+import numpy as np
+import pytest
+
+from ayudantes import verificar_chi_cuadrado
+from sgrna_ags.algoritmo import ejecutar_algoritmo_genetico, seleccionar_padres
+from sgrna_ags.configuracion import ConfiguracionAG
+from sgrna_ags.evaluacion import transformar_fitness
+from sgrna_ags.operadores import seleccion_por_ruleta
+
+OBJETIVO = np.array([3.0, -1.0, 7.0, 0.5, -4.0])
+
+
+def test_ranking_al_minimizar_premia_al_menor():
+    fitness = transformar_fitness(OBJETIVO, "ranking", minimizar=True)
+    assert fitness.tolist() == [2.0, 4.0, 1.0, 3.0, 5.0]
+    assert np.array_equal(fitness, transformar_fitness(-OBJETIVO, "ranking"))
+
+
+def test_sigma_al_minimizar_decrece_con_el_objetivo():
+    fitness = transformar_fitness(OBJETIVO, "sigma", minimizar=True)
+    valores = -OBJETIVO
+    assert np.allclose(fitness, np.maximum(0.0, 1.0 + (valores - valores.mean()) / (2.0 * valores.std())))
+    orden = np.argsort(OBJETIVO)
+    assert np.all(np.diff(fitness[orden]) <= 0) and fitness[orden[0]] > fitness[orden[-1]]
+    assert fitness.min() >= 0
+    assert np.array_equal(transformar_fitness(np.full(4, 2.5), "sigma", minimizar=True), np.ones(4))
+
+
+@pytest.mark.parametrize("escalado", ["ranking", "sigma"])
+def test_frecuencias_de_la_ruleta_al_minimizar(escalado):
+    configuracion = ConfiguracionAG(tamano_poblacion=5, seleccion="ruleta", escalado_fitness=escalado,
+                                    minimizar=True)
+    elegidos = seleccionar_padres(configuracion, OBJETIVO, 20000, np.random.default_rng(6))
+    fitness = transformar_fitness(OBJETIVO, escalado, minimizar=True)
+    presentes = fitness > 0
+    observados = np.bincount(elegidos, minlength=OBJETIVO.shape[0])
+    assert np.all(observados[~presentes] == 0)
+    verificar_chi_cuadrado(observados[presentes], fitness[presentes] / fitness.sum())
+
+
+def test_corrida_con_ruleta_al_minimizar_baja_el_minimo():
+    configuracion = ConfiguracionAG(tamano_poblacion=20, numero_ciclos=30, elite=1, seleccion="ruleta",
+                                    escalado_fitness="ranking", minimizar=True, semilla=3)
+    historial = ejecutar_algoritmo_genetico(configuracion).historial
+    assert historial[-1]["minimo"] < historial[0]["minimo"]
+    assert historial[-1]["promedio"] < historial[0]["promedio"]
+    assert all(posterior["minimo"] <= anterior["minimo"] for anterior, posterior in zip(historial, historial[1:]))
+
+
+@pytest.mark.parametrize("fitness", [[-1.0, 1.0], [-3.0, 1.0], [2.0, -0.5, 4.0]])
+def test_ruleta_rechaza_fitness_negativo(fitness):
+    # Un total nulo o negativo sólo es posible con algún fitness negativo (salvo todo cero)
+    with pytest.raises(ValueError, match="ranking"):
+        seleccion_por_ruleta(np.array(fitness), 10, np.random.default_rng(0))
+
+
+def test_ruleta_con_objetivo_crudo_negativo_exige_escalado():
+    configuracion = ConfiguracionAG(tamano_poblacion=5, seleccion="ruleta")
+    with pytest.raises(ValueError, match="ranking"):
+        seleccionar_padres(configuracion, OBJETIVO, 10, np.random.default_rng(0))
+    with pytest.raises(ValueError, match="Para minimizar con ruleta"):
+        ConfiguracionAG(seleccion="ruleta", minimizar=True)
@@ -0,0 +1,54 @@
+"""Pruebas de la reevaluación incremental por segmentos."""
+import numpy as np
+import pytest
+
+from sgrna_ags.algoritmo import ejecutar_algoritmo_genetico, iterar_algoritmo_genetico
+from sgrna_ags.configuracion import ConfiguracionAG
+from sgrna_ags.en_blanco import PuntajeEnBlanco
+from sgrna_ags.incremental import EvaluadorIncremental
+from sgrna_ags.restricciones import Restricciones
+
+
+@pytest.fixture
+def puntaje():
+    return PuntajeEnBlanco(np.random.default_rng(0).normal(size=(20, 4)), longitud_segmento=23,
+                           agregacion="media")
+
+
+@pytest.mark.parametrize("opciones", [{}, {"elite": 2}, {"seleccion": "ruleta", "escalado_fitness": "ranking"}])
+def test_incremental_igual_a_la_evaluacion_completa(puntaje, opciones):
+    configuracion = ConfiguracionAG(tamano_poblacion=30, longitud_cromosoma=2 * 3 * 23, numero_ciclos=25,
+                                    probabilidad_mutacion=40, semilla=5, **opciones)
+    incremental = puntaje.evaluador_incremental()
+    for estado in iterar_algoritmo_genetico(configuracion, incremental=incremental, incluir_poblacion=True):
+        assert np.allclose(estado.objetivo, puntaje(np.array(estado.poblacion)))
+    completo = ejecutar_algoritmo_genetico(configuracion, puntaje)
+    assert np.allclose(estado.objetivo, completo.objetivo)
+    assert incremental.segmentos_reutilizados > incremental.segmentos_evaluados
+
+
+def test_incremental_con_restricciones_reparadas(puntaje):
+    configuracion = ConfiguracionAG(tamano_poblacion=30, longitud_cromosoma=2 * 3 * 23, numero_ciclos=20,
+                                    probabilidad_mutacion=40, elite=1, semilla=2)
+    incremental = puntaje.evaluador_incremental()
+    restricciones = Restricciones(reparar=True)
+    for estado in iterar_algoritmo_genetico(configuracion, incremental=incremental, restricciones=restricciones,
+                                            incluir_poblacion=True):
+        assert np.allclose(estado.objetivo, puntaje(np.array(estado.poblacion)))
+
+
+def test_sin_cambios_no_se_recalcula_nada():
+    llamados = []
+
+    def segmento(bits):
+        llamados.append(bits.shape[1])
+        return bits.sum(axis=0).astype(float)
+
+    incremental = EvaluadorIncremental(segmento, 4, "suma")
+    poblacion = np.random.default_rng(1).integers(0, 2, size=(12, 6), dtype=np.uint8)
+    assert np.array_equal(incremental.evaluar(poblacion), poblacion.sum(axis=0))
+    # Parejas sin cruce (punto igual a la longitud) ni mutaciones: los hijos son copias de los padres
+    seleccion = np.array([0, 1, 2, 3, 4, 5])
+    incremental.preparar(seleccion, np.full(3, 12))
+    assert np.array_equal(incremental.completar(poblacion), poblacion.sum(axis=0))
+    assert llamados == [18]
@@ -0,0 +1,48 @@
+"""Pruebas de la instrumentación por fase del ciclo generacional."""
+import tracemalloc
+
+import numpy as np
+
+from sgrna_ags.algoritmo import ejecutar_algoritmo_genetico, iterar_algoritmo_genetico
+from sgrna_ags.configuracion import ConfiguracionAG
+from sgrna_ags.instrumentacion import FASES, Instrumentacion
+
+
+def test_un_registro_por_generacion():
+    instrumentacion = Instrumentacion()
+    ejecutar_algoritmo_genetico(ConfiguracionAG(numero_ciclos=5, semilla=1), instrumentacion=instrumentacion)
+    assert [registro["generacion"] for registro in instrumentacion.registros] == list(range(6))
+    assert all(registro["t_total"] >= 0 and f"t_{FASES[0]}" in registro for registro in instrumentacion.registros)
+    assert instrumentacion.resumen()["evaluaciones"] == sum(r["evaluaciones"] for r in instrumentacion.registros)
+
+
+def test_salir_del_ciclo_conserva_la_ultima_generacion():
+    instrumentacion = Instrumentacion()
+    for estado in iterar_algoritmo_genetico(ConfiguracionAG(numero_ciclos=10, semilla=1),
+                                            instrumentacion=instrumentacion):
+        if estado.generacion == 3:
+            break
+    assert [registro["generacion"] for registro in instrumentacion.registros] == [0, 1, 2, 3]
+    assert instrumentacion.registros[-1]["t_salida"] >= 0
+
+
+def test_memoria_mide_los_arreglos_de_numpy():
+    instrumentacion = Instrumentacion(memoria=True)
+    try:
+        instrumentacion.iniciar_generacion(0)
+        conservado = np.ones(1 << 20, dtype=np.uint8)
+        temporal = np.ones(1 << 21, dtype=np.uint8)
+        del temporal
+        registro = instrumentacion.finalizar_generacion()
+    finally:
+        instrumentacion.cerrar()
+    assert registro["memoria_neta"] >= conservado.nbytes
+    assert registro["memoria_pico"] >= conservado.nbytes + (1 << 21)
+    assert not tracemalloc.is_tracing()
+
+
+def test_sin_memoria_no_rastrea():
+    instrumentacion = Instrumentacion()
+    instrumentacion.iniciar_generacion(0)
+    assert "memoria_neta" not in instrumentacion.finalizar_generacion()
+    assert not tracemalloc.is_tracing()
@@ -0,0 +1,57 @@
+"""Pruebas del generador ``iterar_algoritmo_genetico``."""
+import numpy as np
+import pytest
+
+from sgrna_ags.algoritmo import ejecutar_algoritmo_genetico, iterar_algoritmo_genetico
+from sgrna_ags.configuracion import ConfiguracionAG
+from sgrna_ags.evaluacion import objetivo_cuadratico
+
+
+@pytest.fixture
+def configuracion():
+    return ConfiguracionAG(tamano_poblacion=12, numero_ciclos=8, elite=1, semilla=4)
+
+
+def test_recorrido_completo_igual_a_la_corrida(configuracion):
+    resultado = ejecutar_algoritmo_genetico(configuracion)
+    estados = list(iterar_algoritmo_genetico(configuracion))
+    assert [estado.generacion for estado in estados] == list(range(9))
+    historial = resultado.historial
+    assert [estado.mejor_cromosoma for estado in estados] == [registro["cromosoma"] for registro in historial]
+    assert [estado.estadisticas.maximo for estado in estados] == [registro["maximo"] for registro in historial]
+    assert estados[-1].evaluaciones == resultado.evaluaciones
+
+
+def test_salir_del_ciclo_detiene_las_evaluaciones(configuracion):
+    llamados = []
+
+    def objetivo(poblacion):
+        llamados.append(poblacion.shape[1])
+        return objetivo_cuadratico(poblacion)
+
+    generador = iterar_algoritmo_genetico(configuracion, objetivo)
+    for estado in generador:
+        if estado.generacion == 2:
+            break
+    generador.close()
+    assert len(llamados) == 3
+    assert estado.evaluaciones == sum(llamados)
+
+
+def test_vistas_de_solo_lectura_sin_copiar(configuracion):
+    estados = []
+    for estado in iterar_algoritmo_genetico(configuracion, incluir_poblacion=True):
+        assert not estado.poblacion.flags.writeable and not estado.objetivo.flags.writeable
+        with pytest.raises(ValueError):
+            estado.poblacion[0, 0] = 1
+        assert np.array_equal(estado.objetivo, objetivo_cuadratico(estado.poblacion))
+        assert estado.predichos is None
+        estados.append(estado)
+    # Doble buffer: las generaciones de igual paridad comparten la memoria de la población
+    assert np.shares_memory(estados[1].poblacion, estados[3].poblacion)
+    assert not np.shares_memory(estados[1].poblacion, estados[2].poblacion)
+
+
+def test_sin_incluir_poblacion(configuracion):
+    estado = next(iterar_algoritmo_genetico(configuracion))
+    assert estado.poblacion is None and estado.objetivo is None
@@ -0,0 +1,240 @@
+"""Equivalencia exacta entre los operadores vectorizados y los scripts de ``Pruebas AGs``.
+
+Los scripts sortean con el módulo ``random`` y el paquete con
+``np.random.Generator``, por lo que no comparten la secuencia aleatoria.
+Cada prueba fija las decisiones aleatorias (quién compite en cada torneo,
+qué parejas se cruzan y dónde, qué individuos mutan) y las entrega a los
+dos lados: al script con ``AzarGuionado`` y al paquete con
+``GeneradorGuionado``. Con las mismas decisiones, los resultados deben ser
+idénticos.
+
+Diferencias intencionales con los scripts, que no se prueban aquí:
+
+- ``Ruleta`` discretiza el fitness en 100 casillas enteras; el paquete
+  sortea sobre la suma acumulada (sólo coinciden si el fitness ya está en
+  centésimos exactos, el caso que se prueba).
+- ``randint(0, 100) < 75`` cruza con probabilidad 75/101, no 0.75.
+- ``Mutacion`` de ``ruleta_con_elite`` nunca muta el primer gen.
+- Con élite, el ``CrossOver`` de los scripts sobrescribe las columnas 0 y 1
+  donde ``Torneo``/``Ruleta`` copiaron a los mejores; el paquete escribe
+  los hijos a continuación de la élite.
+- Ante empates de fitness, la élite de los scripts prefiere el último
+  individuo y la del paquete el primero.
+"""
+import numpy as np
+import pytest
+
+from ayudantes import LONGITUD, TAMANO, AzarGuionado, GeneradorGuionado, a_listas, cargar_script
+from sgrna_ags.algoritmo import ejecutar_algoritmo_genetico
+from sgrna_ags.configuracion import ConfiguracionAG
+from sgrna_ags.evaluacion import calcular_estadisticas, objetivo_cuadratico, transformar_fitness
+from sgrna_ags.operadores import (
+    aplicar_crossover,
+    aplicar_mutacion,
+    convertir_binario_a_decimal,
+    cromosoma_a_texto,
+    seleccion_por_ruleta,
+    seleccion_por_torneo,
+    seleccionar_elite,
+)
+
+SEMILLAS = range(5)
+
+
+def poblacion_aleatoria(semilla):
+    return np.random.default_rng(semilla).integers(0, 2, size=(LONGITUD, TAMANO), dtype=np.uint8)
+
+
+def evaluar_legado(legado, poblacion):
+    """Aplica ``BinDec``, ``FunObj`` y ``FunFit`` de un script a una población de NumPy."""
+    decimales = [0.0] * TAMANO
+    objetivo = [0.0] * TAMANO
+    fitness = [0.0] * TAMANO
+    total, minimo, maximo, promedio = [0.0] * 2, [0.0] * 2, [0.0] * 2, [0.0] * 2
+    legado.BinDec(a_listas(poblacion), decimales)
+    binario = legado.FunObj(decimales, objetivo, total, minimo, maximo, promedio)
+    legado.FunFit(objetivo, fitness, total, minimo, maximo, promedio)
+    return decimales, objetivo, fitness, binario, (total[0], minimo[0], maximo[0], promedio[0])
+
+
+@pytest.fixture(scope="module")
+def torneo_sin_elite():
+    return cargar_script("torneo_sin_elite")
+
+
+@pytest.fixture(scope="module")
+def torneo_con_elite():
+    return cargar_script("torneo_con_elite")
+
+
+@pytest.fixture(scope="module")
+def ruleta_sin_elite():
+    return cargar_script("ruleta_sin_elite")
+
+
+@pytest.mark.parametrize("semilla", SEMILLAS)
+def test_bindec_y_funobj_iguales_al_legado(torneo_sin_elite, semilla):
+    poblacion = poblacion_aleatoria(semilla)
+    decimales, objetivo, _, binario, estadisticas_legado = evaluar_legado(torneo_sin_elite, poblacion)
+
+    nuevos = convertir_binario_a_decimal(poblacion)
+    assert nuevos.tolist() == decimales
+    nuevo_objetivo = objetivo_cuadratico(poblacion)
+    assert nuevo_objetivo.tolist() == objetivo
+    estadisticas = calcular_estadisticas(nuevo_objetivo)
+    np.testing.assert_allclose((estadisticas.total, estadisticas.minimo, estadisticas.maximo,
+                                estadisticas.promedio), estadisticas_legado)
+    # FunObj devuelve el cromosoma de mayor valor decimal sin ceros a la izquierda
+    assert cromosoma_a_texto(poblacion, int(nuevos.argmax())).lstrip("0") == binario
+
+
+@pytest.mark.parametrize("semilla", SEMILLAS)
+def test_fitness_crudo_proporcional_a_funfit(torneo_sin_elite, semilla):
+    poblacion = poblacion_aleatoria(semilla)
+    _, objetivo, fitness, _, _ = evaluar_legado(torneo_sin_elite, poblacion)
+    crudo = transformar_fitness(np.array(objetivo), "crudo")
+    np.testing.assert_allclose(crudo / crudo.sum(), fitness)
+
+
+@pytest.mark.parametrize("semilla", SEMILLAS)
+def test_torneo_igual_al_legado(torneo_sin_elite, monkeypatch, semilla):
+    rng = np.random.default_rng(semilla)
+    # Fitness con empates, para verificar que gana el primero sorteado
+    fitness = rng.integers(0, 4, size=TAMANO) / 4
+    candidatos = rng.integers(0, TAMANO, size=(TAMANO, 4))
+
+    monkeypatch.setattr(torneo_sin_elite, "random", AzarGuionado(candidatos.ravel().tolist()))
+    seleccion = [0] * TAMANO
+    torneo_sin_elite.Torneo(seleccion, fitness.tolist())
+
+    generador = GeneradorGuionado(enteros=[candidatos])
+    assert seleccion_por_torneo(fitness, TAMANO, generador, 4).tolist() == seleccion
+    assert generador.agotado
+
+
+@pytest.mark.parametrize("semilla", SEMILLAS)
+def test_elite_igual_al_legado(torneo_con_elite, monkeypatch, semilla):
+    rng = np.random.default_rng(semilla)
+    fitness = rng.permutation(TAMANO) / TAMANO
+    poblacion = poblacion_aleatoria(semilla)
+
+    monkeypatch.setattr(torneo_con_elite, "random", AzarGuionado([0] * 4 * (TAMANO - 2)))
+    pob_siguiente = [[0] * TAMANO for _ in range(LONGITUD)]
+    torneo_con_elite.Torneo([0] * TAMANO, fitness.tolist(), a_listas(poblacion), pob_siguiente)
+
+    mejores = seleccionar_elite(fitness, 2)
+    assert np.array_equal(np.array(pob_siguiente)[:, :2], poblacion[:, mejores])
+
+
+def test_elite_se_conserva_entre_generaciones():
+    configuracion = ConfiguracionAG(elite=2, numero_ciclos=30, semilla=0)
+    maximos = [registro["maximo"] for registro in ejecutar_algoritmo_genetico(configuracion).historial]
+    assert maximos == sorted(maximos)
+
+
+@pytest.mark.parametrize("semilla", SEMILLAS)
+def test_ruleta_igual_al_legado_con_fitness_en_centesimos(ruleta_sin_elite, monkeypatch, semilla):
+    rng = np.random.default_rng(semilla)
+    # Porcentajes enteros que suman 100: la ruleta de 100 casillas no pierde precisión
+    porcentajes = np.bincount(rng.integers(0, TAMANO, size=100), minlength=TAMANO)
+    porcentajes[porcentajes == 0] = 1
+    porcentajes[np.argmax(porcentajes)] -= porcentajes.sum() - 100
+    fitness = porcentajes / 100
+    assert [int(valor * 100) for valor in fitness] == porcentajes.tolist()
+    casillas = rng.integers(0, 100, size=TAMANO)
+
+    monkeypatch.setattr(ruleta_sin_elite, "random", AzarGuionado(casillas.tolist()))
+    seleccion = [0] * TAMANO
+    ruleta_sin_elite.seleccion_por_ruleta(seleccion, fitness.tolist())
+
+    # El centro de cada casilla, como fracción de la ruleta
+    generador = GeneradorGuionado(reales=[(casillas + 0.5) / 100 / fitness.sum()])
+    assert seleccion_por_ruleta(fitness, TAMANO, generador).tolist() == seleccion
+
+
+def guion_crossover(rng):
+    """Sortea qué parejas se cruzan y dónde, como lo consumen el script y el paquete."""
+    parejas = TAMANO // 2
+    # Incluye los bordes de la comparación con la probabilidad (74 cruza, 75 no)
+    tiradas = rng.choice(np.r_[0, 74, 75, 100, rng.integers(0, 101, size=6)], size=parejas)
+    puntos = rng.integers(1, LONGITUD, size=parejas)
+    legado = []
+    for tirada, punto in zip(tiradas, puntos):
+        legado.append(int(tirada))
+        if tirada < 75:
+            legado.append(int(punto))
+    return legado, tiradas / 100, puntos
+
+
+@pytest.mark.parametrize("semilla", SEMILLAS)
+def test_crossover_igual_al_legado(torneo_sin_elite, monkeypatch, semilla):
+    rng = np.random.default_rng(semilla)
+    poblacion = poblacion_aleatoria(semilla)
+    seleccion = rng.integers(0, TAMANO, size=TAMANO)
+    legado, tiradas, puntos = guion_crossover(rng)
+
+    monkeypatch.setattr(torneo_sin_elite, "random", AzarGuionado(legado))
+    pob_legado = [[0] * TAMANO for _ in range(LONGITUD)]
+    torneo_sin_elite.CrossOver(a_listas(poblacion), pob_legado, seleccion.tolist())
+
+    pob_siguiente = np.empty_like(poblacion)
+    aplicar_crossover(poblacion, pob_siguiente, seleccion, 75, GeneradorGuionado([tiradas], [puntos]))
+    assert pob_siguiente.tolist() == pob_legado
+
+
+def guion_mutacion(rng, gen_minimo=0):
+    """Sortea qué individuos mutan y qué gen, como lo consumen el script y el paquete."""
+    tiradas = rng.choice(np.r_[0, 4, 5, 100, rng.integers(0, 101, size=6)], size=TAMANO)
+    genes = rng.integers(gen_minimo, LONGITUD, size=int((tiradas < 5).sum()))
+    legado = []
+    restantes = iter(genes.tolist())
+    for tirada in tiradas:
+        legado.append(int(tirada))
+        if tirada < 5:
+            legado.append(next(restantes))
+    return legado, tiradas / 100, genes
+
+
+@pytest.mark.parametrize("semilla", SEMILLAS)
+@pytest.mark.parametrize("script, gen_minimo", [("torneo_sin_elite", 0), ("ruleta_con_elite", 1)])
+def test_mutacion_igual_al_legado(monkeypatch, semilla, script, gen_minimo):
+    legado_modulo = cargar_script(script)
+    rng = np.random.default_rng(semilla)
+    poblacion = poblacion_aleatoria(semilla)
+    # ruleta_con_elite sortea el gen entre 1 y 29: se guionan genes válidos para ambos
+    legado, tiradas, genes = guion_mutacion(rng, gen_minimo)
+
+    monkeypatch.setattr(legado_modulo, "random", AzarGuionado(legado))
+    pob_legado = a_listas(poblacion)
+    legado_modulo.Mutacion(pob_legado)
+
+    aplicar_mutacion(poblacion, 5, GeneradorGuionado([tiradas], [genes]))
+    assert poblacion.tolist() == pob_legado
+
+
+@pytest.mark.parametrize("semilla", SEMILLAS)
+def test_generacion_completa_igual_al_legado(torneo_sin_elite, monkeypatch, semilla):
+    """Torneo, crossover y mutación encadenados, con la población intermedia de cada lado."""
+    rng = np.random.default_rng(semilla)
+    poblacion = poblacion_aleatoria(semilla)
+    _, objetivo, fitness, _, _ = evaluar_legado(torneo_sin_elite, poblacion)
+    candidatos = rng.integers(0, TAMANO, size=(TAMANO, 4))
+    legado_crossover, tiradas_crossover, puntos = guion_crossover(rng)
+    legado_mutacion, tiradas_mutacion, genes = guion_mutacion(rng)
+
+    monkeypatch.setattr(torneo_sin_elite, "random",
+                        AzarGuionado(candidatos.ravel().tolist() + legado_crossover + legado_mutacion))
+    seleccion = [0] * TAMANO
+    pob_legado = [[0] * TAMANO for _ in range(LONGITUD)]
+    torneo_sin_elite.Torneo(seleccion, fitness)
+    torneo_sin_elite.CrossOver(a_listas(poblacion), pob_legado, seleccion)
+    torneo_sin_elite.Mutacion(pob_legado)
+
+    generador = GeneradorGuionado(reales=[tiradas_crossover, tiradas_mutacion],
+                                  enteros=[candidatos, puntos, genes])
+    seleccion_nueva = seleccion_por_torneo(np.array(objetivo), TAMANO, generador, 4)
+    pob_siguiente = np.empty_like(poblacion)
+    aplicar_crossover(poblacion, pob_siguiente, seleccion_nueva, 75, generador)
+    aplicar_mutacion(pob_siguiente, 5, generador)
+    assert generador.agotado
+    assert pob_siguiente.tolist() == pob_legado
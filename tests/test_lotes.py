@@ -0,0 +1,72 @@
+"""Pruebas del índice de la referencia y del diseño por lotes."""
+import csv
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from sgrna_ags import lotes
+from sgrna_ags.configuracion import ConfiguracionAG
+from sgrna_ags.lotes import IndiceReferencia, ObjetivoLocus, complemento_inverso, disenar_lote
+from sgrna_ags.secuencias import CODIGO_INVALIDO, NUCLEOTIDOS, secuencia_a_codigos
+
+BASES = np.array(list(NUCLEOTIDOS))
+
+
+def aleatoria(rng, largo):
+    return "".join(rng.choice(BASES, size=largo))
+
+
+def test_secuencia_a_codigos():
+    assert secuencia_a_codigos("ACGTUacgtu").tolist() == [0, 1, 2, 3, 3, 0, 1, 2, 3, 3]
+    assert secuencia_a_codigos("AN-c", estricta=False).tolist() == [0, CODIGO_INVALIDO, CODIGO_INVALIDO, 1]
+    with pytest.raises(ValueError, match="distintos de ACGT"):
+        secuencia_a_codigos("ACNT")
+    with pytest.raises(ValueError):
+        secuencia_a_codigos("ACñ")
+
+
+def test_indice_igual_al_conteo_directo(monkeypatch):
+    # Con un umbral chico los k-meros se cuentan en varias tandas
+    monkeypatch.setattr(lotes, "KMEROS_POR_CONTEO", 50)
+    rng = np.random.default_rng(0)
+    secuencias = [aleatoria(rng, 40) + "NN" + aleatoria(rng, 30).lower() for _ in range(5)] + ["ACG", ""]
+    k = 4
+    esperado = Counter()
+    for secuencia in secuencias:
+        for hebra in (secuencia.upper(), complemento_inverso(secuencia)):
+            for tramo in hebra.split("N"):
+                esperado.update(tramo[i:i + k] for i in range(len(tramo) - k + 1))
+    indice = IndiceReferencia(secuencias, k)
+    for kmero, cantidad in esperado.items():
+        codigos = secuencia_a_codigos(kmero).astype(np.int64)
+        assert indice.ocurrencias(codigos[:, None])[0] == cantidad
+    assert indice.conteos.sum() == sum(esperado.values())
+
+
+def test_sitios_en_ambas_hebras():
+    # Un único sitio con PAM NGG en la hebra directa y su complemento inverso
+    sitio = "ACGTACGTACGTACGTACGTAGG"
+    objetivo = ObjetivoLocus("TTT" + sitio + "TTT", pam="NGG")
+    encontrados = {"".join(NUCLEOTIDOS[c] for c in fila) for fila in objetivo.sitios}
+    assert sitio in encontrados
+    assert all(s.endswith("GG") for s in encontrados)
+    with pytest.raises(ValueError, match="PAM"):
+        ObjetivoLocus("A" * 40, pam="NGG")
+
+
+@pytest.mark.parametrize("trabajadores", [1, 2])
+def test_un_locus_sin_pam_no_detiene_el_lote(tmp_path, trabajadores):
+    rng = np.random.default_rng(1)
+    objetivos = [("uno", aleatoria(rng, 120)), ("sin_pam", "A" * 80), ("dos", aleatoria(rng, 120))]
+    salida = tmp_path / "guias.csv"
+    configuracion = ConfiguracionAG(tamano_poblacion=10, numero_ciclos=3, elite=1, semilla=2)
+    procesados = disenar_lote(objetivos, str(salida), configuracion, guias=2, trabajadores=trabajadores)
+    assert procesados == 3
+    with open(salida, encoding="utf-8", newline="") as archivo:
+        filas = {fila["nombre"]: fila for fila in csv.DictReader(archivo, delimiter=";")}
+    assert filas["sin_pam"]["estado"] == "error"
+    assert "PAM" in filas["sin_pam"]["mensaje"] and filas["sin_pam"]["array"] == ""
+    for nombre in ("uno", "dos"):
+        assert filas[nombre]["estado"] == "ok"
+        assert len(filas[nombre]["guias"].split(",")) == 2
@@ -0,0 +1,56 @@
+"""Pruebas de la evaluación en procesos sobre memoria compartida."""
+from multiprocessing import shared_memory
+
+import numpy as np
+import pytest
+
+from sgrna_ags.algoritmo import ejecutar_algoritmo_genetico
+from sgrna_ags.configuracion import ConfiguracionAG
+from sgrna_ags.evaluacion import Evaluador, objetivo_cuadratico
+from sgrna_ags.memoria_compartida import EvaluadorCompartido
+
+
+def dos_objetivos(poblacion):
+    return np.stack([poblacion.sum(axis=0), poblacion[:5].sum(axis=0) * 2.0])
+
+
+@pytest.mark.parametrize("opciones, por_tarea", [
+    ({}, None),
+    ({"elite": 2}, 3),
+    ({"usar_cache": True, "probabilidad_mutacion": 1}, None),
+    ({"seleccion": "ruleta", "escalado_fitness": "ranking", "elite": 1}, 7),
+])
+def test_igual_a_la_evaluacion_serial(opciones, por_tarea):
+    configuracion = ConfiguracionAG(tamano_poblacion=20, longitud_cromosoma=30, numero_ciclos=6, trabajadores=2,
+                                    semilla=11, **opciones)
+    serial = ejecutar_algoritmo_genetico(configuracion)
+    with EvaluadorCompartido(objetivo_cuadratico, configuracion, individuos_por_tarea=por_tarea) as compartido:
+        paralelo = ejecutar_algoritmo_genetico(configuracion, compartido=compartido)
+    assert paralelo.historial == serial.historial
+    assert paralelo.evaluaciones == serial.evaluaciones
+    assert np.array_equal(paralelo.poblacion, serial.poblacion)
+    assert np.array_equal(paralelo.objetivo, serial.objetivo)
+
+
+def test_poblaciones_fuera_de_los_buffers_y_varios_objetivos():
+    configuracion = ConfiguracionAG(tamano_poblacion=9, longitud_cromosoma=12, trabajadores=2)
+    poblacion = np.random.default_rng(0).integers(0, 2, size=(12, 9), dtype=np.uint8)
+    with EvaluadorCompartido(dos_objetivos, configuracion, objetivos=2, individuos_por_tarea=2) as compartido:
+        assert np.array_equal(compartido.evaluar(poblacion), Evaluador(dos_objetivos).evaluar(poblacion))
+        assert np.array_equal(compartido.evaluar(poblacion[:, 3:7]), dos_objetivos(poblacion[:, 3:7]))
+        assert compartido.evaluaciones == 13
+        with pytest.raises(ValueError):
+            compartido.alojar(poblacion[:, :5])
+
+
+def test_cerrar_libera_los_bloques():
+    configuracion = ConfiguracionAG(tamano_poblacion=4, longitud_cromosoma=8, trabajadores=1)
+    compartido = EvaluadorCompartido(objetivo_cuadratico, configuracion)
+    nombres = [compartido._bloque_cromosomas.name, compartido._bloque_objetivo.name]
+    with compartido:
+        compartido.cerrar()
+    # Cerrar de nuevo (también al salir del with) no hace nada
+    compartido.cerrar()
+    for nombre in nombres:
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=nombre)
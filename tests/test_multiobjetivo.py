@@ -0,0 +1,63 @@
+"""Pruebas del ordenamiento no dominado y del hacinamiento de NSGA-II."""
+import numpy as np
+import pytest
+
+from sgrna_ags.configuracion import ConfiguracionAG
+from sgrna_ags.multiobjetivo import distancia_de_hacinamiento, ejecutar_nsga2, ordenamiento_no_dominado
+
+
+def domina(a, b):
+    return all(x <= y for x, y in zip(a, b)) and any(x < y for x, y in zip(a, b))
+
+
+def frentes_por_fuerza_bruta(valores):
+    """Pela frentes sucesivos: cada uno son los restantes que ningún otro restante domina."""
+    puntos = [tuple(columna) for columna in valores.T.tolist()]
+    restantes = set(range(len(puntos)))
+    rangos = [None] * len(puntos)
+    rango = 0
+    while restantes:
+        frente = {i for i in restantes if not any(domina(puntos[j], puntos[i]) for j in restantes)}
+        for i in frente:
+            rangos[i] = rango
+        restantes -= frente
+        rango += 1
+    return rangos
+
+
+def hacinamiento_por_fuerza_bruta(valores, rangos):
+    distancia = [0.0] * valores.shape[1]
+    for rango in set(rangos):
+        miembros = [i for i, r in enumerate(rangos) if r == rango]
+        if len(miembros) <= 2:
+            for i in miembros:
+                distancia[i] = np.inf
+            continue
+        for fila in valores:
+            ordenados = sorted(miembros, key=lambda i: fila[i])
+            amplitud = (fila[ordenados[-1]] - fila[ordenados[0]]) or 1.0
+            distancia[ordenados[0]] = distancia[ordenados[-1]] = np.inf
+            for anterior, actual, siguiente in zip(ordenados, ordenados[1:], ordenados[2:]):
+                distancia[actual] += (fila[siguiente] - fila[anterior]) / amplitud
+    return distancia
+
+
+@pytest.mark.parametrize("objetivos", [1, 2, 3, 4])
+@pytest.mark.parametrize("semilla", range(5))
+def test_frentes_y_hacinamiento_coinciden_con_la_fuerza_bruta(objetivos, semilla):
+    # Valores enteros chicos para forzar empates y puntos repetidos
+    valores = np.random.default_rng(semilla).integers(0, 6, size=(objetivos, 60)).astype(np.float64)
+    rangos = ordenamiento_no_dominado(valores)
+    assert rangos.tolist() == frentes_por_fuerza_bruta(valores)
+    assert np.allclose(distancia_de_hacinamiento(valores, rangos), hacinamiento_por_fuerza_bruta(valores, rangos))
+
+
+def test_nsga2_conserva_el_frente_de_pareto():
+    def objetivos(poblacion):
+        unos = poblacion.sum(axis=0).astype(np.float64)
+        return np.vstack([unos, poblacion.shape[0] - unos + poblacion[0]])
+
+    resultado = ejecutar_nsga2(ConfiguracionAG(tamano_poblacion=30, numero_ciclos=15, semilla=3), objetivos)
+    assert resultado.rangos.tolist() == frentes_por_fuerza_bruta(resultado.objetivos)
+    assert len(resultado.frente) == int((resultado.rangos == 0).sum())
+    assert len(resultado.historial) == 16
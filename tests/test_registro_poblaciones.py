@@ -0,0 +1,82 @@
+"""Pruebas del registro de poblaciones completas y su lectura con ``np.memmap``."""
+import json
+import zipfile
+
+import numpy as np
+import pytest
+
+from sgrna_ags.algoritmo import ejecutar_algoritmo_genetico
+from sgrna_ags.configuracion import ConfiguracionAG
+from sgrna_ags.registro_poblaciones import LectorPoblaciones, RegistroPoblaciones
+
+
+def generacion_aleatoria(rng, longitud=13, individuos=6, objetivos=1):
+    poblacion = rng.integers(0, 2, size=(longitud, individuos), dtype=np.uint8)
+    forma = (individuos,) if objetivos == 1 else (objetivos, individuos)
+    return poblacion, rng.normal(size=forma)
+
+
+@pytest.mark.parametrize("comprimir", [False, True])
+def test_escribir_y_leer(tmp_path, comprimir):
+    ruta = str(tmp_path / "poblaciones.zip")
+    rng = np.random.default_rng(0)
+    escritas = {}
+    with RegistroPoblaciones(ruta, cada=3, comprimir=comprimir) as registro:
+        for generacion in range(11):
+            poblacion, objetivo = generacion_aleatoria(rng)
+            if registro.registrar(generacion, poblacion, objetivo, forzar=generacion == 10):
+                escritas[generacion] = (poblacion, objetivo)
+    lector = LectorPoblaciones(ruta)
+    assert lector.generaciones == [0, 3, 6, 9, 10] == sorted(escritas)
+    assert lector.longitud == 13 and len(lector) == 5
+    for generacion, poblacion, objetivo in lector:
+        assert np.array_equal(poblacion, escritas[generacion][0])
+        assert np.array_equal(objetivo, escritas[generacion][1])
+        assert isinstance(objetivo, np.memmap) != comprimir
+    assert np.array_equal(lector.poblacion(6, individuos=[4, 1]), escritas[6][0][:, [4, 1]])
+    with pytest.raises(KeyError):
+        lector.objetivo(5)
+
+
+def test_agregar_generaciones(tmp_path):
+    ruta = str(tmp_path / "poblaciones.zip")
+    rng = np.random.default_rng(1)
+    escritas = [generacion_aleatoria(rng, objetivos=2) for _ in range(3)]
+    with RegistroPoblaciones(ruta) as registro:
+        for generacion in (0, 1):
+            registro.registrar(generacion, *escritas[generacion])
+    with RegistroPoblaciones(ruta, agregar=True) as registro:
+        assert registro.generaciones == [0, 1] and registro.longitud == 13
+        with pytest.raises(ValueError, match="ya está registrada"):
+            registro.registrar(1, *escritas[1])
+        with pytest.raises(ValueError, match="13 genes"):
+            registro.registrar(2, escritas[2][0][:8], escritas[2][1])
+        registro.registrar(2, *escritas[2])
+    lector = LectorPoblaciones(ruta)
+    assert lector.generaciones == [0, 1, 2]
+    for generacion, (poblacion, objetivo) in enumerate(escritas):
+        assert np.array_equal(lector.poblacion(generacion), poblacion)
+        assert np.array_equal(lector.objetivo(generacion), objetivo)
+
+
+def test_registrar_una_corrida(tmp_path):
+    ruta = str(tmp_path / "poblaciones.zip")
+    configuracion = ConfiguracionAG(tamano_poblacion=10, numero_ciclos=7, semilla=3)
+    with RegistroPoblaciones(ruta, cada=2) as registro:
+        resultado = ejecutar_algoritmo_genetico(configuracion, registro=registro)
+    lector = LectorPoblaciones(ruta)
+    assert lector.generaciones == [0, 2, 4, 6, 7]
+    assert np.array_equal(lector.poblacion(7), resultado.poblacion)
+    assert np.array_equal(lector.objetivo(7), resultado.objetivo)
+    maximos = [float(lector.objetivo(generacion).max()) for generacion in lector.generaciones]
+    assert maximos == [resultado.historial[generacion]["maximo"] for generacion in lector.generaciones]
+
+
+def test_rechaza_otros_archivos(tmp_path):
+    ruta = str(tmp_path / "otro.zip")
+    with zipfile.ZipFile(ruta, "w") as archivo:
+        archivo.writestr("metadatos.json", json.dumps({"formato": "otro"}))
+    with pytest.raises(ValueError):
+        LectorPoblaciones(ruta)
+    with pytest.raises(ValueError):
+        RegistroPoblaciones(str(tmp_path / "cero.zip"), cada=0)
@@ -0,0 +1,35 @@
+"""Resultados de referencia de corridas completas con semilla fija.
+
+Una optimización que no cambie el algoritmo debe consumir la secuencia
+aleatoria en el mismo orden y reproducir exactamente estos valores. Si un
+cambio altera a propósito el uso del generador (por ejemplo un operador
+nuevo), hay que validarlo con ``test_estadisticos.py`` y recién entonces
+actualizar la tabla.
+"""
+import pytest
+
+from sgrna_ags.algoritmo import ejecutar_algoritmo_genetico
+from sgrna_ags.configuracion import ConfiguracionAG
+from sgrna_ags.estado_estacionario import ejecutar_estado_estacionario
+
+# (opciones de ConfiguracionAG, mejor cromosoma final, máximo final, evaluaciones)
+REFERENCIAS = [
+    ({}, "111110011010101001001010010000", 0.9511, 210),
+    ({"elite": 2}, "111110010010101001001010010000", 0.9473, 170),
+    ({"seleccion": "ruleta"}, "111110010010101001001111000000", 0.9473, 210),
+    ({"seleccion": "ruleta", "elite": 2}, "111110010100101001101111000011", 0.9483, 170),
+]
+
+
+@pytest.mark.parametrize("opciones, cromosoma, maximo, evaluaciones", REFERENCIAS)
+def test_corrida_generacional_reproducible(opciones, cromosoma, maximo, evaluaciones):
+    resultado = ejecutar_algoritmo_genetico(ConfiguracionAG(numero_ciclos=20, semilla=7, **opciones))
+    final = resultado.historial[-1]
+    assert (final["cromosoma"], final["maximo"], resultado.evaluaciones) == (cromosoma, maximo, evaluaciones)
+
+
+def test_corrida_estacionaria_reproducible():
+    resultado = ejecutar_estado_estacionario(ConfiguracionAG(numero_ciclos=20, semilla=7))
+    final = resultado.historial[-1]
+    assert (final["cromosoma"], final["maximo"], resultado.evaluaciones) == (
+        "111110010110111010011001101001", 0.9493, 210)
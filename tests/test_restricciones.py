@@ -0,0 +1,70 @@
+"""Pruebas del filtro de restricciones duras."""
+import numpy as np
+import pytest
+
+from sgrna_ags.algoritmo import ejecutar_algoritmo_genetico
+from sgrna_ags.configuracion import ConfiguracionAG
+from sgrna_ags.restricciones import Restricciones, generar_poblacion_valida
+from sgrna_ags.secuencias import codificar_nucleotidos, cromosoma_a_secuencia, secuencia_a_codigos
+
+# Espaciadores de 20 nt con 50% de GC y sin corridas de T
+BUENO = "ACGTACGTACGTACGTACGT"
+OTRO = "TGCATGCATGCATGCATGCA"
+
+
+def poblacion_de(*arrays):
+    """Arma la matriz de bits de una población a partir de las secuencias de cada individuo."""
+    return codificar_nucleotidos(np.stack([secuencia_a_codigos(array) for array in arrays], axis=1))
+
+
+def test_cada_motivo_de_rechazo():
+    restricciones = Restricciones()
+    poblacion = poblacion_de(
+        BUENO + "AGG" + OTRO + "CGG",           # válido
+        "GCGCGCGCGCGCGCGCGCGC" + "AGG" + OTRO + "CGG",  # GC 100%
+        "ACGTTTTTACGTACGCACGC" + "AGG" + OTRO + "CGG",  # TTTTT
+        BUENO + "AGC" + OTRO + "CGG",           # PAM inválida
+        BUENO + "AGG" + BUENO + "TGG",          # espaciadores repetidos
+    )
+    assert restricciones.validar(poblacion).tolist() == [True, False, False, False, False]
+    assert restricciones.rechazos == {"gc": 1, "poli_t": 1, "pam": 1, "repetidos": 1}
+
+
+def test_reparar_corrige_pam_y_corridas_de_t():
+    restricciones = Restricciones(reparar=True)
+    poblacion = poblacion_de(BUENO + "ATC" + "ACGTTTTTACGCACGCACGA" + "CGA")
+    assert restricciones.filtrar(poblacion).tolist() == [True]
+    secuencia = cromosoma_a_secuencia(poblacion, 0)
+    assert secuencia[20:23] == "AGG" and secuencia[43:46] == "CGG"
+    assert "TTTT" not in secuencia
+
+
+def test_segmento_que_no_divide_al_cromosoma():
+    with pytest.raises(ValueError, match="múltiplo"):
+        Restricciones().validar(np.zeros((2 * 30, 1), dtype=np.uint8))
+
+
+def test_poblacion_inicial_valida_sin_reparar_a_los_hijos():
+    restricciones = Restricciones()
+    poblacion = np.random.default_rng(0).integers(0, 2, size=(2 * 3 * 23, 200), dtype=np.uint8)
+    assert generar_poblacion_valida(restricciones, poblacion, np.random.default_rng(1)).all()
+    assert Restricciones().validar(poblacion).all()
+    assert restricciones.rechazos == dict.fromkeys(restricciones.rechazos, 0)
+
+
+def test_restricciones_imposibles_fallan():
+    restricciones = Restricciones(gc_minimo=0.9, max_poli_t=0)
+    poblacion = np.zeros((2 * 2 * 23, 10), dtype=np.uint8)
+    with pytest.raises(ValueError, match="población inicial válida"):
+        generar_poblacion_valida(restricciones, poblacion, np.random.default_rng(0), intentos=5)
+
+
+def test_la_corrida_avanza_y_se_mantiene_valida():
+    restricciones = Restricciones()
+    configuracion = ConfiguracionAG(tamano_poblacion=30, longitud_cromosoma=2 * 3 * 23, numero_ciclos=60,
+                                    probabilidad_mutacion=30, semilla=1)
+    resultado = ejecutar_algoritmo_genetico(configuracion, lambda p: p.sum(axis=0).astype(float),
+                                            restricciones=restricciones)
+    assert Restricciones().validar(resultado.poblacion).all()
+    assert restricciones.rechazos["pam"] < 30 * 60
+    assert resultado.historial[-1]["maximo"] > resultado.historial[0]["maximo"]
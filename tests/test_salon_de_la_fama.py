@@ -0,0 +1,57 @@
+"""Pruebas del archivo de los mejores cromosomas distintos."""
+import numpy as np
+import pytest
+
+from sgrna_ags.algoritmo import ejecutar_algoritmo_genetico
+from sgrna_ags.configuracion import ConfiguracionAG
+from sgrna_ags.salon_de_la_fama import SalonDeLaFama
+
+
+def mejores_por_fuerza_bruta(lotes, capacidad, minimizar):
+    vistos = {}
+    for poblacion, objetivo in lotes:
+        for columna, valor in zip(poblacion.T, objetivo):
+            vistos[columna.tobytes()] = valor
+    valores = sorted(vistos.values(), reverse=not minimizar)
+    return valores[:capacidad]
+
+
+@pytest.mark.parametrize("minimizar", [False, True])
+def test_igual_a_la_fuerza_bruta(minimizar):
+    rng = np.random.default_rng(8)
+    salon = SalonDeLaFama(capacidad=7, minimizar=minimizar)
+    lotes = []
+    for _ in range(6):
+        # Cromosomas cortos, para que haya repetidos dentro de cada lote y entre lotes
+        poblacion = rng.integers(0, 2, size=(5, 20), dtype=np.uint8)
+        objetivo = (poblacion * (1 << np.arange(5))[:, None]).sum(axis=0).astype(float)
+        lotes.append((poblacion, objetivo))
+        salon.actualizar(poblacion, objetivo)
+    cromosomas, valores = salon.mejores()
+    assert valores.tolist() == mejores_por_fuerza_bruta(lotes, 7, minimizar)
+    assert len({columna.tobytes() for columna in cromosomas.T}) == len(salon) == 7
+    assert np.array_equal((cromosomas * (1 << np.arange(5))[:, None]).sum(axis=0), valores)
+
+
+def test_los_cromosomas_archivados_son_copias():
+    salon = SalonDeLaFama(capacidad=2)
+    poblacion = np.array([[1, 0], [1, 1]], dtype=np.uint8)
+    salon.actualizar(poblacion, np.array([2.0, 1.0]))
+    poblacion[:] = 0
+    assert salon.mejores()[0].tolist() == [[1, 0], [1, 1]]
+
+
+def test_vacio_y_capacidad_invalida():
+    cromosomas, valores = SalonDeLaFama().mejores()
+    assert cromosomas.shape == (0, 0) and valores.shape == (0,)
+    with pytest.raises(ValueError):
+        SalonDeLaFama(capacidad=0)
+
+
+def test_conserva_el_mejor_de_toda_la_corrida_sin_elite():
+    salon = SalonDeLaFama(capacidad=5)
+    configuracion = ConfiguracionAG(tamano_poblacion=10, numero_ciclos=30, probabilidad_mutacion=40, semilla=2)
+    resultado = ejecutar_algoritmo_genetico(configuracion, salon_de_la_fama=salon)
+    _, valores = salon.mejores()
+    assert valores[0] == max(registro["maximo"] for registro in resultado.historial)
+    assert np.all(np.diff(valores) <= 0)
@@ -0,0 +1,147 @@
+"""Pruebas del servicio HTTP de diseño, sobre un puerto efímero y sobre un socket Unix."""
+import http.client
+import json
+import socket
+import threading
+
+import numpy as np
+import pytest
+
+from sgrna_ags.secuencias import NUCLEOTIDOS
+from sgrna_ags.servicio import ServicioDiseno, crear_servidor
+
+LOCUS = "".join(np.random.default_rng(5).choice(list(NUCLEOTIDOS), size=150))
+CONFIGURACION = {"tamano_poblacion": 10, "numero_ciclos": 4, "elite": 1, "semilla": 3}
+
+
+class ConexionUnix(http.client.HTTPConnection):
+    def __init__(self, ruta):
+        super().__init__("localhost", timeout=30)
+        self.ruta = ruta
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.ruta)
+
+
+def iniciar(servicio, **opciones):
+    servidor = crear_servidor(servicio, puerto=0, **opciones)
+    hilo = threading.Thread(target=servidor.serve_forever, daemon=True)
+    hilo.start()
+    return servidor
+
+
+def detener(servidor, servicio):
+    servidor.shutdown()
+    servidor.server_close()
+    servicio.cerrar()
+
+
+@pytest.fixture
+def http_local():
+    servicio = ServicioDiseno(trabajadores=2, max_cola=8)
+    servidor = iniciar(servicio)
+    host, puerto = servidor.server_address[:2]
+
+    def pedir(metodo, ruta, cuerpo=None):
+        conexion = http.client.HTTPConnection(host, puerto, timeout=30)
+        try:
+            datos = None if cuerpo is None else json.dumps(cuerpo)
+            conexion.request(metodo, ruta, body=datos)
+            respuesta = conexion.getresponse()
+            return respuesta.status, json.loads(respuesta.read())
+        finally:
+            conexion.close()
+
+    yield pedir
+    detener(servidor, servicio)
+
+
+def test_enviar_y_consultar(http_local):
+    solicitud = {"nombre": "locus1", "secuencia": LOCUS, "guias": 2, "configuracion": CONFIGURACION}
+    codigo, trabajo = http_local("POST", "/trabajos", dict(solicitud, esperar=True))
+    assert codigo == 200 and trabajo["estado"] == "terminado"
+    resultado = trabajo["resultado"]
+    assert resultado["nombre"] == "locus1" and len(resultado["guias"]) == 2
+    assert resultado["evaluaciones"] > 0
+    assert http_local("GET", f"/trabajos/{trabajo['id']}") == (200, trabajo)
+
+    # El segundo trabajo del mismo locus encuentra todo en la caché: no evalúa nada
+    codigo, repetido = http_local("POST", "/trabajos?esperar=1", solicitud)
+    assert codigo == 200 and repetido["resultado"]["evaluaciones"] == 0
+    assert repetido["resultado"]["array"] == resultado["array"]
+
+    codigo, metricas = http_local("GET", "/metricas")
+    assert codigo == 200
+    assert metricas["completados"] == 2 and metricas["fallidos"] == 0 and metricas["en_cola"] == 0
+    assert metricas["loci_en_cache"] == 1 and metricas["aciertos_cache"] > 0
+    assert metricas["espera_p95"] >= 0 and metricas["ejecucion_media"] > 0
+
+
+def test_sin_esperar_responde_202(http_local):
+    codigo, trabajo = http_local("POST", "/trabajos", {"secuencia": LOCUS, "configuracion": CONFIGURACION})
+    assert codigo == 202 and trabajo["estado"] in ("en_cola", "ejecutando", "terminado")
+
+
+def test_locus_sin_pam_termina_con_error(http_local):
+    codigo, trabajo = http_local("POST", "/trabajos", {"secuencia": "A" * 80, "esperar": True})
+    assert codigo == 200 and trabajo["estado"] == "error"
+    assert "PAM" in trabajo["error"] and trabajo["resultado"] is None
+    assert http_local("GET", "/metricas")[1]["fallidos"] == 1
+
+
+def test_solicitudes_invalidas(http_local):
+    assert http_local("POST", "/trabajos", {"nombre": "sin secuencia"})[0] == 400
+    assert http_local("POST", "/trabajos", {"secuencia": LOCUS, "configuracion": {"desconocido": 1}})[0] == 400
+    assert http_local("GET", "/trabajos/999")[0] == 404
+    assert http_local("GET", "/otra")[0] == 404
+
+
+def test_cola_llena_responde_503(tmp_path):
+    servicio = ServicioDiseno(trabajadores=1, max_cola=0)
+    ruta = str(tmp_path / "sgrna.sock")
+    servidor = iniciar(servicio, socket_unix=ruta)
+    try:
+        conexion = ConexionUnix(ruta)
+        conexion.request("GET", "/salud")
+        respuesta = conexion.getresponse()
+        assert (respuesta.status, json.loads(respuesta.read())) == (200, {"estado": "ok"})
+        conexion.request("POST", "/trabajos", body=json.dumps({"secuencia": LOCUS}))
+        respuesta = conexion.getresponse()
+        assert respuesta.status == 503 and "llena" in json.loads(respuesta.read())["error"]
+        conexion.close()
+    finally:
+        detener(servidor, servicio)
+    assert servicio.metricas()["rechazados"] == 1
+
+
+def test_la_cache_de_cada_locus_esta_acotada():
+    servicio = ServicioDiseno(trabajadores=1, max_cromosomas_por_locus=5)
+    try:
+        for semilla in (3, 4):
+            configuracion = dict(CONFIGURACION, semilla=semilla)
+            identificador = servicio.enviar({"secuencia": LOCUS, "configuracion": configuracion})
+            assert servicio.esperar(identificador, 30)["estado"] == "terminado"
+            assert servicio.metricas()["cromosomas_en_cache"] == 5
+    finally:
+        servicio.cerrar()
+
+
+def test_socket_unix_no_borra_otros_archivos(tmp_path):
+    ruta = tmp_path / "datos.txt"
+    ruta.write_text("no borrar", encoding="utf-8")
+    with pytest.raises(ValueError, match="no es un socket"):
+        crear_servidor(ServicioDiseno(), socket_unix=str(ruta))
+    assert ruta.read_text(encoding="utf-8") == "no borrar"
+
+
+def test_socket_unix_reemplaza_un_socket_viejo(tmp_path):
+    ruta = str(tmp_path / "sgrna.sock")
+    viejo = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    viejo.bind(ruta)
+    viejo.close()
+    servicio = ServicioDiseno()
+    servidor = crear_servidor(servicio, socket_unix=ruta)
+    servidor.server_close()
+    servicio.cerrar()
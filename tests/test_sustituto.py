@@ -0,0 +1,57 @@
+"""Pruebas de la preselección con modelo sustituto."""
+import numpy as np
+
+from sgrna_ags.algoritmo import iterar_algoritmo_genetico
+from sgrna_ags.configuracion import ConfiguracionAG
+from sgrna_ags.evaluacion import objetivo_cuadratico
+from sgrna_ags.salon_de_la_fama import SalonDeLaFama
+from sgrna_ags.sustituto import ModeloSustituto, PreseleccionSustituta
+
+
+class SustitutoOptimista(PreseleccionSustituta):
+    """Evalúa sólo la mitad de los hijos y predice para el resto un valor imposible de alcanzar."""
+
+    def elegir(self, hijos, rng, minimizar=False):
+        elegidos = np.zeros(hijos.shape[1], dtype=bool)
+        elegidos[::2] = True
+        return elegidos, np.full(hijos.shape[1], 10.0)
+
+
+def test_el_modelo_aprende_un_objetivo_lineal():
+    rng = np.random.default_rng(0)
+    pesos = rng.normal(size=24)
+    modelo = ModeloSustituto(k=2, regularizacion=1e-3)
+    poblacion = rng.integers(0, 2, size=(24, 400), dtype=np.uint8)
+    modelo.actualizar(poblacion, pesos @ poblacion)
+    nuevos = rng.integers(0, 2, size=(24, 50), dtype=np.uint8)
+    assert np.allclose(modelo.predecir(nuevos), pesos @ nuevos, atol=1e-2)
+
+
+def test_las_predicciones_no_llegan_a_la_elite_ni_a_las_estadisticas():
+    sustituto = SustitutoOptimista()
+    salon = SalonDeLaFama(5)
+    configuracion = ConfiguracionAG(tamano_poblacion=20, numero_ciclos=30, elite=2, semilla=3)
+    for estado in iterar_algoritmo_genetico(configuracion, sustituto=sustituto, salon_de_la_fama=salon,
+                                            incluir_poblacion=True):
+        reales = ~estado.predichos
+        valores = objetivo_cuadratico(np.array(estado.poblacion))
+        assert np.array_equal(estado.objetivo[reales], valores[reales])
+        assert estado.mejor_objetivo <= 1.0
+        assert estado.estadisticas.maximo == valores[reales].max()
+        assert estado.estadisticas.minimo == valores[reales].min()
+        # Los individuos de élite de la generación siguiente salen de los mejores, que tienen valor real
+        mejores = np.argsort(-estado.objetivo, kind="stable")[:2]
+        assert reales[mejores].all()
+    assert sustituto.confirmados > 0
+    assert sustituto.evaluaciones_ahorradas == 30 * 9 - sustituto.confirmados
+    assert (salon.mejores()[1] <= 1.0).all()
+
+
+def test_preseleccion_evalua_la_fraccion_pedida():
+    sustituto = PreseleccionSustituta(fraccion=0.2, exploracion=0.1, minimo_entrenamiento=10)
+    rng = np.random.default_rng(1)
+    poblacion = rng.integers(0, 2, size=(30, 40), dtype=np.uint8)
+    sustituto.registrar(poblacion, objetivo_cuadratico(poblacion))
+    elegidos, predichos = sustituto.elegir(rng.integers(0, 2, size=(30, 50), dtype=np.uint8), rng)
+    assert elegidos.sum() == 10 + 5
+    assert predichos.shape == (50,)